@@ -0,0 +1,166 @@
+"""
+Throughput benchmark for the posting classifiers (experience level,
+remote type, skills).
+
+Compares, on the same corpus:
+  legacy     - the original per-function keyword loops (kept here as the reference)
+  regex      - one combined overlapping-match regex over all keywords
+  classifier - job_classifier.JobTextClassifier (what ingestion uses)
+
+and checks that every variant produces identical labels.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.classifier_benchmark --jobs 20000
+"""
+from typing import Dict, Iterator, List, Tuple
+import argparse
+import re
+import time
+
+from backend.job_classifier import (
+    HYBRID_KEYWORDS, JUNIOR_KEYWORDS, REMOTE_KEYWORDS, SENIOR_KEYWORDS, TECH_SKILLS, JobTextClassifier,
+)
+
+Labels = Tuple[str, str, List[str]]
+
+
+def legacy_experience_level(title: str, description: str = "") -> str:
+    text = (title + " " + description).lower()
+    for keyword in SENIOR_KEYWORDS:
+        if keyword in text:
+            return 'Senior'
+    for keyword in JUNIOR_KEYWORDS:
+        if keyword in text:
+            return 'Junior'
+    return 'Mid'
+
+
+def legacy_remote_type(description: str) -> str:
+    description_lower = description.lower()
+    if any(word in description_lower for word in REMOTE_KEYWORDS):
+        return "remote"
+    elif any(word in description_lower for word in HYBRID_KEYWORDS):
+        return "hybrid"
+    else:
+        return "onsite"
+
+
+def legacy_skills(description: str) -> List[str]:
+    description_lower = description.lower()
+    return [skill for skill in TECH_SKILLS if skill in description_lower]
+
+
+def legacy_classify(title: str, description: str) -> Labels:
+    """Labels exactly as the code before job_classifier computed them"""
+    return (
+        legacy_experience_level(title, description),
+        legacy_remote_type(description),
+        legacy_skills(description),
+    )
+
+
+class RegexClassifier:
+    """Single overlapping scan with one alternation of every keyword (longest first)"""
+
+    def __init__(self):
+        groups = {
+            "senior": SENIOR_KEYWORDS, "junior": JUNIOR_KEYWORDS,
+            "remote": REMOTE_KEYWORDS, "hybrid": HYBRID_KEYWORDS, "skill": TECH_SKILLS,
+        }
+        keywords = sorted({k for words in groups.values() for k in words}, key=len, reverse=True)
+        self.pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+        self.groups = {name: set(words) for name, words in groups.items()}
+        # A match also implies every keyword it contains
+        self.implied = {k: {other for other in keywords if other in k} for k in keywords}
+
+    def classify(self, title: str, description: str) -> Labels:
+        title = title.lower()
+        text = title + " " + description.lower()
+        boundary = len(title) + 1
+        everywhere, in_description = set(), set()
+        for match in self.pattern.finditer(text):
+            keyword = match.group(1)
+            everywhere |= self.implied[keyword]
+            if match.start() >= boundary:
+                in_description |= self.implied[keyword]
+        # Keywords implied by a match lie inside it, so they never start before it
+        level = 'Senior' if everywhere & self.groups["senior"] else 'Junior' if everywhere & self.groups["junior"] else 'Mid'
+        remote = ("remote" if in_description & self.groups["remote"]
+                  else "hybrid" if in_description & self.groups["hybrid"] else "onsite")
+        return level, remote, [skill for skill in TECH_SKILLS if skill in in_description]
+
+
+EDGE_CASES = [
+    ("Senior Java Developer", "JavaScript and PostgreSQL, remote work possible"),
+    ("Graduate Analyst", "Hybrid working. MySQL, Excel."),
+    ("Developer", "We offer work from home and flexible working"),
+    ("Lead", ""),
+    ("Data Analyst", "1-2 years experience with SQL"),
+    ("Internal Tools Engineer", "Digital team, git, ci/cd, REST API design"),
+    ("Engineer Sr.", "Node.js, Vue, GraphQL; 100% remote"),
+    ("Staffing Coordinator", "entry level, no tech"),
+    ("Engineer", "Remote option available for the right person"),
+    ("Jr.", "5- years; fastapi and flask"),
+    ("", "nothing relevant here"),
+]
+
+
+def regression_corpus(jobs: int = 2000) -> Iterator[Tuple[str, str]]:
+    """Edge cases plus synthetic and fake-board postings"""
+    from backend.benchmarks.fake_job_boards import FakeJobBoard
+    from backend.benchmarks.synthetic import synthetic_jobs
+
+    yield from EDGE_CASES
+    for job in synthetic_jobs(jobs):
+        yield job["title"], job["description"]
+    board = FakeJobBoard(pages=2)
+    for query in ["software developer", "data analyst", "devops engineer"]:
+        for page in (1, 2):
+            for posting in board.feed("adzuna", query, page):
+                yield posting["title"], posting["description"]
+
+
+def run(corpus: List[Tuple[str, str]]) -> List[Dict]:
+    classifier = JobTextClassifier()
+    variants = {
+        "legacy": legacy_classify,
+        "regex": RegexClassifier().classify,
+        "classifier": lambda title, description: tuple(classifier.classify(title, description)),
+    }
+
+    reference = [legacy_classify(title, description) for title, description in corpus]
+    results = []
+    for name, classify in variants.items():
+        started = time.perf_counter()
+        labels = [classify(title, description) for title, description in corpus]
+        elapsed = time.perf_counter() - started
+        mismatches = sum(1 for got, expected in zip(labels, reference) if tuple(got) != tuple(expected))
+        results.append({
+            "variant": name,
+            "jobs": len(corpus),
+            "jobs_per_sec": round(len(corpus) / elapsed),
+            "us_per_job": round(elapsed / len(corpus) * 1e6, 2),
+            "mismatches": mismatches,
+        })
+    return results
+
+
+def main():
+    from backend.benchmarks.common import print_table
+
+    parser = argparse.ArgumentParser(description="Benchmark job posting classifiers")
+    parser.add_argument("--jobs", type=int, default=20000, help="Synthetic postings in the corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of this many runs")
+    args = parser.parse_args()
+
+    corpus = list(regression_corpus(args.jobs))
+    best = {}
+    for _ in range(args.repeat):
+        for result in run(corpus):
+            if result["variant"] not in best or result["jobs_per_sec"] > best[result["variant"]]["jobs_per_sec"]:
+                best[result["variant"]] = result
+    print_table(list(best.values()), ["variant", "jobs", "jobs_per_sec", "us_per_job", "mismatches"])
+
+
+if __name__ == "__main__":
+    main()
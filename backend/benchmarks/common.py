@@ -0,0 +1,34 @@
+from typing import Dict, List, Sequence
+import math
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_latencies(latencies: List[float], wall_time: float) -> Dict[str, float]:
+    """Throughput and latency percentiles (in ms) for one benchmark case"""
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / wall_time, 1) if wall_time else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def print_table(rows: List[Dict], columns: List[str]):
+    """Print benchmark results as a plain aligned table"""
+    widths = {
+        column: max(len(column), *(len(str(row.get(column, ""))) for row in rows)) if rows else len(column)
+        for column in columns
+    }
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    print("  ".join("-" * widths[column] for column in columns))
+    for row in rows:
+        print("  ".join(str(row.get(column, "")).ljust(widths[column]) for column in columns))
@@ -0,0 +1,147 @@
+"""
+Benchmark for text extraction from uploaded documents.
+
+Renders synthetic resumes to PDF and DOCX at a few lengths and compares,
+per document:
+
+PDF
+  legacy     page texts concatenated with += (kept here as the reference)
+  serial     extract_text_from_pdf: one join over the page texts
+  parallel   extract_text_from_pdf(processes=N): chunks of pages extracted
+             in N processes (only used from PARALLEL_PDF_MIN_PAGES pages)
+  streaming  parse_resume_stream: first_result_ms is when the first partial
+             result (contact info and skills of page one) is available
+
+DOCX
+  legacy     python-docx Document().paragraphs (the reference)
+  streaming  extract_text_from_docx: incremental parse of the XML parts
+
+For plain documents every variant must extract the reference text. The
+"template" DOCX puts the contact lines in the page header and the rest in
+a table; python-docx paragraphs miss all of it, so there the chars column
+shows how much text each variant found instead.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.document_extraction_benchmark --processes 4
+"""
+from typing import Dict, List
+import argparse
+import io
+import time
+
+import PyPDF2
+
+from backend.enhanced_resume_parser import EnhancedResumeParser
+
+
+def legacy_extract_text_from_pdf(data: bytes) -> str:
+    """PDF text exactly as extract_text_from_pdf built it before the single join"""
+    text = ""
+    for page in PyPDF2.PdfReader(io.BytesIO(data)).pages:
+        text += page.extract_text() + "\n"
+    return text
+
+
+def legacy_extract_text_from_docx(data: bytes) -> str:
+    """DOCX text exactly as extract_text_from_docx read it through python-docx"""
+    import docx
+
+    text = ""
+    for paragraph in docx.Document(io.BytesIO(data)).paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+
+def resume_texts(sizes: List[int]) -> Dict[str, str]:
+    """`size` synthetic resumes back to back for each size"""
+    from backend.benchmarks.synthetic_resumes import synthetic_resumes
+
+    return {f"{size}_resumes": "\n".join(synthetic_resumes(size)) for size in sizes}
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def row(document: str, variant: str, text: str, reference: str, seconds: float,
+        first: float = None, compare: bool = True) -> Dict:
+    return {
+        "document": document,
+        "variant": variant,
+        "chars": len(text),
+        "ms": round(seconds * 1000, 1),
+        "first_result_ms": round(first * 1000, 1) if first is not None else "",
+        "mismatch": text != reference if compare else "",
+    }
+
+
+def run_pdf(texts: Dict[str, str], processes: int) -> List[Dict]:
+    from backend.benchmarks.synthetic_resumes import render_pdf
+
+    parser = EnhancedResumeParser()
+    results = []
+    for name, resume in texts.items():
+        data = render_pdf(resume)
+        document = f"pdf_{name}"
+        reference, legacy_seconds = timed(legacy_extract_text_from_pdf, data)
+        serial, serial_seconds = timed(parser.extract_text_from_pdf, data)
+        parallel, parallel_seconds = timed(parser.extract_text_from_pdf, data, processes)
+
+        started = time.perf_counter()
+        stream = parser.parse_resume_stream(data, "pdf")
+        next(stream)
+        first_result = time.perf_counter() - started
+        final = list(stream)[-1]
+        streaming_seconds = time.perf_counter() - started
+
+        results.extend([
+            row(document, "legacy", reference, reference, legacy_seconds),
+            row(document, "serial", serial, reference, serial_seconds),
+            row(document, f"parallel_{processes}", parallel, reference, parallel_seconds),
+            row(document, "streaming", final["raw_text"], reference, streaming_seconds, first_result),
+        ])
+    return results
+
+
+def run_docx(texts: Dict[str, str]) -> List[Dict]:
+    from backend.benchmarks.synthetic_resumes import render_docx
+
+    parser = EnhancedResumeParser()
+    results = []
+    for name, resume in texts.items():
+        for layout, data in (("plain", render_docx(resume)),
+                             ("template", render_docx(resume, header_lines=3, table_columns=2))):
+            document = f"docx_{layout}_{name}"
+            reference, legacy_seconds = timed(legacy_extract_text_from_docx, data)
+            streamed, streaming_seconds = timed(parser.extract_text_from_docx, data)
+            compare = layout == "plain"
+            results.extend([
+                row(document, "legacy", reference, reference, legacy_seconds, compare=compare),
+                row(document, "streaming", streamed, reference, streaming_seconds, compare=compare),
+            ])
+    return results
+
+
+def main():
+    from backend.benchmarks.common import print_table
+
+    parser = argparse.ArgumentParser(description="Benchmark document text extraction")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 20, 200],
+                        help="Synthetic resumes per benchmarked document")
+    parser.add_argument("--processes", type=int, default=4, help="Processes for the parallel PDF variant")
+    parser.add_argument("--format", choices=["pdf", "docx", "all"], default="all")
+    args = parser.parse_args()
+
+    texts = resume_texts(args.sizes)
+    results = []
+    if args.format in ("pdf", "all"):
+        results.extend(run_pdf(texts, args.processes))
+    if args.format in ("docx", "all"):
+        results.extend(run_docx(texts))
+    print_table(results, ["document", "variant", "chars", "ms", "first_result_ms", "mismatch"])
+
+
+if __name__ == "__main__":
+    main()
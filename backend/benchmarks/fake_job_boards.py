@@ -0,0 +1,263 @@
+"""
+Local stand-ins for the Adzuna and JSearch search APIs.
+
+One small ASGI app serves both boards with realistic, deterministic
+postings (newest first, honouring Adzuna max_days_old and JSearch
+date_posted), plus configurable latency and error rates, so multi-source
+fetching can be exercised offline without spending quota.
+
+    /adzuna/{country}/search/{page}   ->  Adzuna response shape
+    /jsearch/search                   ->  JSearch response shape
+
+Run it as a server and point the backend at it:
+    python -m backend.benchmarks.fake_job_boards --port 8765 --latency-ms 150 --error-rate 0.05
+    ADZUNA_BASE_URL=http://127.0.0.1:8765/adzuna JSEARCH_BASE_URL=http://127.0.0.1:8765/jsearch ...
+
+or in-process (no sockets) through httpx:
+    board = FakeJobBoard(pages=5)
+    JobIngestionPipeline(api_service, transport=board.transport())
+"""
+from typing import Dict, List, Optional
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import random
+import threading
+import time
+import zlib
+
+from backend.benchmarks.synthetic import (
+    COMPANIES, EXPERIENCE_PHRASES, FILLER, LOCATIONS, ROLES, SENIORITY, SKILLS, WORK_PATTERNS,
+)
+
+RESULTS_PER_PAGE = 20
+
+# JSearch date_posted windows in days
+JSEARCH_WINDOWS = {"today": 1, "3days": 3, "week": 7, "month": 31}
+
+
+class FakeJobBoard:
+    """
+    Deterministic fake job boards.
+
+    Every query has a feed of `pages * RESULTS_PER_PAGE` postings, one
+    every `spacing` going back from `now`. `latency_ms` (+ up to
+    `jitter_ms`) is added to every response; `error_rate` of responses
+    are HTTP 500 and `rate_limit_rate` are HTTP 429.
+    """
+
+    def __init__(
+        self,
+        pages: int = 5,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        spacing: timedelta = timedelta(hours=1),
+        now: Optional[datetime] = None,
+        seed: int = 42
+    ):
+        self.pages = pages
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.spacing = spacing
+        self.now = now or datetime.utcnow().replace(microsecond=0)
+        self.seed = seed
+        self._faults = random.Random(seed)
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.app = self._build_app()
+
+    # Postings
+
+    def _posting(self, source: str, query: str, index: int) -> Dict:
+        rng = random.Random(zlib.crc32(f"{self.seed}:{source}:{query}:{index}".encode()))
+        title = f"{rng.choice(SENIORITY)}{query.title() if query else rng.choice(ROLES)}"
+        skills = rng.sample(SKILLS, rng.randint(2, 7))
+        salary_min = rng.randrange(25000, 90000, 1000)
+        description = " ".join([
+            f"We are hiring a {title} with experience in {', '.join(skills)}.",
+            rng.choice(WORK_PATTERNS),
+            rng.choice(EXPERIENCE_PHRASES),
+            FILLER,
+        ])
+        return {
+            "id": f"{source}-{zlib.crc32(query.encode())}-{index}",
+            "title": title,
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "description": description,
+            "salary_min": salary_min,
+            "salary_max": salary_min + rng.randrange(0, 30000, 1000),
+            "posted": self.now - self.spacing * index,
+            "contract_type": rng.choice(["permanent", "contract"]),
+            "remote": "remote" in description.lower(),
+            "skills": skills,
+        }
+
+    def feed(self, source: str, query: str, page: int, max_days_old: Optional[float] = None) -> List[Dict]:
+        """One page of a query's feed, newest first"""
+        postings = (self._posting(source, query, i) for i in range(self.pages * RESULTS_PER_PAGE))
+        if max_days_old:
+            cutoff = self.now - timedelta(days=max_days_old)
+            postings = (p for p in postings if p["posted"] >= cutoff)
+        return list(postings)[(page - 1) * RESULTS_PER_PAGE:page * RESULTS_PER_PAGE]
+
+    @staticmethod
+    def adzuna_item(posting: Dict) -> Dict:
+        return {
+            "id": posting["id"],
+            "title": posting["title"],
+            "company": {"display_name": posting["company"]},
+            "location": {"display_name": f"{posting['location']}, UK"},
+            "description": posting["description"],
+            "salary_min": posting["salary_min"],
+            "salary_max": posting["salary_max"],
+            "created": posting["posted"].strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "redirect_url": f"https://example.com/adzuna/{posting['id']}",
+            "contract_type": posting["contract_type"],
+        }
+
+    @staticmethod
+    def jsearch_item(posting: Dict) -> Dict:
+        return {
+            "job_id": posting["id"],
+            "job_title": posting["title"],
+            "employer_name": posting["company"],
+            "employer_logo": None,
+            "job_city": posting["location"],
+            "job_country": "GB",
+            "job_description": posting["description"],
+            "job_highlights": {"Qualifications": [f"Experience with {skill}" for skill in posting["skills"]]},
+            "job_min_salary": posting["salary_min"],
+            "job_max_salary": posting["salary_max"],
+            "job_salary_currency": "GBP",
+            "job_salary_period": "YEAR",
+            "job_apply_link": f"https://example.com/jsearch/{posting['id']}",
+            "job_posted_at_timestamp": int((posting["posted"] - datetime(1970, 1, 1)).total_seconds()),
+            "job_is_remote": posting["remote"],
+            "job_employment_type": "FULLTIME" if posting["contract_type"] == "permanent" else "CONTRACTOR",
+        }
+
+    # HTTP
+
+    def _count(self, source: str, outcome: str):
+        counters = self.stats.setdefault(source, {"requests": 0, "errors": 0, "rate_limited": 0})
+        counters["requests"] += 1
+        if outcome != "ok":
+            counters[outcome] += 1
+
+    async def _respond(self, source: str, build):
+        from starlette.responses import JSONResponse
+
+        delay = self.latency_ms + self._faults.random() * self.jitter_ms
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+        roll = self._faults.random()
+        if roll < self.error_rate:
+            self._count(source, "errors")
+            return JSONResponse({"error": "injected failure"}, status_code=500)
+        if roll < self.error_rate + self.rate_limit_rate:
+            self._count(source, "rate_limited")
+            return JSONResponse({"error": "rate limited"}, status_code=429, headers={"Retry-After": "1"})
+
+        self._count(source, "ok")
+        return JSONResponse(build())
+
+    def _build_app(self):
+        from starlette.applications import Starlette
+        from starlette.routing import Route
+
+        async def adzuna(request):
+            query = request.query_params.get("what", "")
+            page = int(request.path_params["page"])
+            max_days_old = request.query_params.get("max_days_old")
+            return await self._respond("adzuna", lambda: {
+                "count": self.pages * RESULTS_PER_PAGE,
+                "results": [
+                    self.adzuna_item(p)
+                    for p in self.feed("adzuna", query, page, float(max_days_old) if max_days_old else None)
+                ],
+            })
+
+        async def jsearch(request):
+            query = request.query_params.get("query", "").split(" in ")[0]
+            page = int(request.query_params.get("page", "1"))
+            window = JSEARCH_WINDOWS.get(request.query_params.get("date_posted", "all"))
+            return await self._respond("jsearch", lambda: {
+                "status": "OK",
+                "data": [self.jsearch_item(p) for p in self.feed("jsearch", query, page, window)],
+            })
+
+        return Starlette(routes=[
+            Route("/adzuna/{country}/search/{page:int}", adzuna),
+            Route("/jsearch/search", jsearch),
+        ])
+
+    def transport(self):
+        """In-process httpx transport; use with the base URLs from base_urls()"""
+        import httpx
+        return httpx.ASGITransport(app=self.app)
+
+    @staticmethod
+    def base_urls(root: str = "http://fake-job-board") -> Dict[str, str]:
+        return {"adzuna": f"{root}/adzuna", "jsearch": f"{root}/jsearch"}
+
+    @contextmanager
+    def serve(self, host: str = "127.0.0.1", port: int = 8765):
+        """Run the boards on a real socket in a background thread; yields the base URLs"""
+        import uvicorn
+
+        server = uvicorn.Server(uvicorn.Config(self.app, host=host, port=port, log_level="warning"))
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.01)
+        try:
+            yield self.base_urls(f"http://{host}:{port}")
+        finally:
+            server.should_exit = True
+            thread.join()
+
+
+def use_base_urls(base_urls: Dict[str, str]):
+    """Re-register the built-in sources against other base URLs (e.g. a FakeJobBoard)"""
+    from backend.job_sources import AdzunaSource, JSearchSource, register_source
+
+    for source_class in (AdzunaSource, JSearchSource):
+        if source_class.name in base_urls:
+            register_source(source_class(base_url=base_urls[source_class.name]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fake Adzuna and JSearch APIs locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", type=int, default=5, help="Pages of results per query")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of HTTP 429 responses")
+    args = parser.parse_args()
+
+    board = FakeJobBoard(
+        pages=args.pages, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate
+    )
+    with board.serve(args.host, args.port) as base_urls:
+        print(f"ADZUNA_BASE_URL={base_urls['adzuna']}")
+        print(f"JSEARCH_BASE_URL={base_urls['jsearch']}")
+        print("Serving fake job boards, Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    print(board.stats)
+
+
+if __name__ == "__main__":
+    main()
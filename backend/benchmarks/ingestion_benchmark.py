@@ -0,0 +1,244 @@
+"""
+End-to-end ingestion benchmark against the local fake job boards.
+
+Serves FakeJobBoard (Adzuna + JSearch shapes) on a local socket, points
+the app at it and drives the real ingestion entry points:
+
+  populate   POST /api/admin/populate-jobs (background run, polled until done)
+  fetch      POST /api/jobs/fetch for one query
+  scheduled  the scheduler's fetch_jobs_task (retention + ingestion)
+  alerts     the scheduler's fetch_jobs_and_send_alerts
+
+Each entry point runs --runs times against the same database, so the
+first run shows a cold catalog and later runs show incremental fetching
+and skipped writes. Reported per run: jobs/sec, wall time per pipeline
+stage, HTTP calls and database round trips (total, per job and per
+stage).
+
+SQLite is used by default (a fresh file per invocation). A local Postgres
+can be passed with --database-url; add --reset to drop and recreate its
+tables first. Never point it at a database you care about.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.ingestion_benchmark --pages 5
+    python -m backend.benchmarks.ingestion_benchmark --latency-ms 150 --jitter-ms 100 --error-rate 0.05
+    python -m backend.benchmarks.ingestion_benchmark --database-url postgresql://localhost/bench --reset
+"""
+from typing import Dict, List
+from collections import Counter
+import argparse
+import asyncio
+import functools
+import json
+import os
+import time
+
+ENTRY_POINTS = ["populate", "fetch", "scheduled", "alerts"]
+FETCH_QUERY = "python developer"
+
+# Pipeline methods whose database round trips are reported separately
+STAGES = ["fetch", "diff", "upsert", "link_duplicates"]
+
+
+def prepare_environment(database_url: str, base_urls: Dict[str, str]):
+    """Point the app at the benchmark database and the fake boards before the backend is imported"""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["ADZUNA_BASE_URL"] = base_urls["adzuna"]
+    os.environ["JSEARCH_BASE_URL"] = base_urls["jsearch"]
+    os.environ["ADZUNA_APP_ID"] = "benchmark"
+    os.environ["ADZUNA_API_KEY"] = "benchmark"
+    os.environ["JSEARCH_API_KEY"] = "benchmark"
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    # Only the benchmark should trigger ingestion
+    os.environ["RUN_SCHEDULER"] = "false"
+    # The quota planner should not be what limits the benchmark
+    os.environ.setdefault("ADZUNA_MONTHLY_QUOTA", "100000")
+    os.environ.setdefault("JSEARCH_MONTHLY_QUOTA", "100000")
+
+
+class IngestionProbe:
+    """
+    Counts database round trips (cursor executions) per pipeline stage and
+    keeps the report of the last pipeline run.
+    """
+
+    def __init__(self, engine, pipeline):
+        from sqlalchemy import event
+
+        self.stage = "other"
+        self.round_trips: Counter = Counter()
+        self.last_report: Dict = {}
+        event.listen(engine, "before_cursor_execute", self._count)
+        self._instrument(pipeline)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.round_trips[self.stage] += 1
+
+    def _instrument(self, pipeline):
+        for name in STAGES:
+            method = getattr(pipeline, name)
+            if asyncio.iscoroutinefunction(method):
+                setattr(pipeline, name, self._async_stage(name, method))
+            else:
+                setattr(pipeline, name, self._stage(name, method))
+
+        report = pipeline._report
+
+        @functools.wraps(report)
+        def capture(*args, **kwargs):
+            self.last_report = report(*args, **kwargs)
+            return self.last_report
+        pipeline._report = capture
+
+    def _stage(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            previous, self.stage = self.stage, name
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.stage = previous
+        return wrapper
+
+    def _async_stage(self, name, method):
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            previous, self.stage = self.stage, name
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self.stage = previous
+        return wrapper
+
+    def reset(self):
+        self.round_trips.clear()
+        self.last_report = {}
+
+
+async def run_entry_point(name: str, client, main_module):
+    if name == "populate":
+        response = await client.post("/api/admin/populate-jobs")
+        response.raise_for_status()
+        status_url = response.json()["status_url"]
+        while (await client.get(status_url)).json()["status"] == "running":
+            await asyncio.sleep(0.02)
+    elif name == "fetch":
+        from backend.auth import create_access_token
+
+        token = create_access_token({"user_id": 1})
+        response = await client.post(
+            "/api/jobs/fetch", params={"query": FETCH_QUERY, "max_jobs": 50},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        response.raise_for_status()
+    elif name == "scheduled":
+        await asyncio.to_thread(main_module.fetch_jobs_task)
+    elif name == "alerts":
+        await asyncio.to_thread(main_module.fetch_jobs_and_send_alerts)
+    else:
+        raise ValueError(f"Unknown entry point: {name}")
+
+
+async def run_benchmark(entry_points: List[str], runs: int) -> List[Dict]:
+    import httpx
+    import backend.main as main_module
+    from backend.database import engine
+
+    probe = IngestionProbe(engine, main_module.ingestion_pipeline)
+
+    results = []
+    transport = httpx.ASGITransport(app=main_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for name in entry_points:
+            for run in range(1, runs + 1):
+                probe.reset()
+                started = time.perf_counter()
+                await run_entry_point(name, client, main_module)
+                wall = time.perf_counter() - started
+
+                report = probe.last_report
+                fetched = report.get("jobs_fetched", 0)
+                trips = sum(probe.round_trips.values())
+                timings = report.get("timings", {})
+                result = {
+                    "entry_point": name,
+                    "run": run,
+                    "status": report.get("status"),
+                    "jobs_fetched": fetched,
+                    "jobs_added": report.get("jobs_added", 0),
+                    "jobs_unchanged": report.get("jobs_unchanged", 0),
+                    "http_calls": report.get("http_calls", 0),
+                    "wall_s": round(wall, 3),
+                    "jobs_per_sec": round(fetched / wall, 1) if wall else 0.0,
+                    "round_trips": trips,
+                    "round_trips_per_job": round(trips / fetched, 2) if fetched else None,
+                    **{f"{stage}_s": round(seconds, 3) for stage, seconds in timings.items()},
+                    **{f"rt_{stage}": count for stage, count in probe.round_trips.items()},
+                }
+                results.append(result)
+                print(
+                    f"  {name:>9} run {run}: {fetched} jobs in {wall:.2f}s "
+                    f"({result['jobs_per_sec']} jobs/s, {trips} round trips)"
+                )
+    return results
+
+
+def main():
+    from backend.benchmarks.fake_job_boards import FakeJobBoard
+
+    parser = argparse.ArgumentParser(description="Benchmark the ingestion entry points against fake job boards")
+    parser.add_argument("--pages", type=int, default=5, help="Pages of results per query on the fake boards")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Fake board response latency")
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of HTTP 429 responses")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the fake boards")
+    parser.add_argument("--entry-points", default="populate,fetch,scheduled",
+                        help=f"Comma separated, from {', '.join(ENTRY_POINTS)}")
+    parser.add_argument("--runs", type=int, default=2, help="Runs per entry point (first is cold)")
+    parser.add_argument("--db", default="ingestion_benchmark.db", help="SQLite file (recreated every time)")
+    parser.add_argument("--database-url", help="Use this database instead of SQLite, e.g. a local Postgres")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate the tables of --database-url")
+    parser.add_argument("--json", help="Write results to this file as JSON")
+    args = parser.parse_args()
+    entry_points = [name.strip() for name in args.entry_points.split(",") if name.strip()]
+
+    if args.database_url:
+        database_url = args.database_url
+    else:
+        if os.path.exists(args.db):
+            os.remove(args.db)
+        database_url = f"sqlite:///{os.path.abspath(args.db)}"
+
+    board = FakeJobBoard(
+        pages=args.pages, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate
+    )
+    with board.serve(port=args.port) as base_urls:
+        prepare_environment(database_url, base_urls)
+        from backend.database import Base, engine
+        from backend.benchmarks.common import print_table
+
+        if args.database_url and args.reset:
+            Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+
+        results = asyncio.run(run_benchmark(entry_points, args.runs))
+
+    columns = ["entry_point", "run", "status", "jobs_fetched", "jobs_added", "jobs_unchanged", "http_calls",
+               "wall_s", "jobs_per_sec", "round_trips", "round_trips_per_job"]
+    extra = sorted({key for result in results for key in result if key.endswith("_s") or key.startswith("rt_")}
+                   - set(columns))
+    print()
+    print_table(results, columns + extra)
+    print(f"\nFake board requests: {board.stats}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
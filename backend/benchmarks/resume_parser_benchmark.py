@@ -0,0 +1,221 @@
+"""
+Benchmark for the text extractors of EnhancedResumeParser.
+
+Compares, on the same corpus of synthetic resume texts, the original
+implementations (kept here as the reference) with the current ones:
+  skills    per-skill loop of up to three re.search calls
+            vs. extract_skills (one precompiled scan)
+  sections  extract_education and extract_experience each re-splitting
+            and re-walking the text vs. one segment() pass feeding both
+
+and checks that both return identical results (apart from the last job
+the legacy experience walk listed twice, see without_repeated_last_job).
+
+Usage (from the repository root):
+    python -m backend.benchmarks.resume_parser_benchmark --resumes 2000
+"""
+from typing import Callable, Dict, Iterator, List, Tuple
+import argparse
+import re
+import time
+
+from backend.enhanced_resume_parser import EnhancedResumeParser
+
+
+def legacy_extract_skills(tech_skills: Dict[str, List[str]], text: str) -> Dict[str, List[str]]:
+    """Skills exactly as extract_skills found them before the lexicon was precompiled"""
+    text_lower = text.lower()
+    found_skills = {}
+
+    for category, skills in tech_skills.items():
+        found_skills[category] = []
+        for skill in skills:
+            skill_patterns = [
+                rf'\b{re.escape(skill)}\b',
+                rf'{re.escape(skill)}\.js\b',
+                rf'{re.escape(skill)} certified\b'
+            ]
+            for pattern in skill_patterns:
+                if re.search(pattern, text_lower):
+                    skill_name = skill.replace('_', ' ').title()
+                    if skill_name not in found_skills[category]:
+                        found_skills[category].append(skill_name)
+                    break
+
+    return found_skills
+
+
+def legacy_extract_education(text: str) -> List[Dict[str, str]]:
+    """Education exactly as extract_education found it before the section segmenter"""
+    education_list = []
+    lines = text.split('\n')
+
+    education_section_found = False
+    for i, line in enumerate(lines):
+        line_lower = line.lower().strip()
+
+        # Check if we're in education section
+        if any(keyword in line_lower for keyword in ['education', 'academic']):
+            education_section_found = True
+            continue
+
+        # Stop if we hit another major section
+        if education_section_found and any(keyword in line_lower for keyword in ['experience', 'skills', 'projects']):
+            break
+
+        # Look for degree patterns
+        degree_patterns = [
+            r'(bachelor|master|phd|doctorate|b\.s\.|b\.a\.|m\.s\.|m\.a\.|ph\.d\.)',
+            r'(computer science|software engineering|information technology|engineering)'
+        ]
+
+        for pattern in degree_patterns:
+            if re.search(pattern, line_lower):
+                # Extract year if present
+                year_pattern = r'(19|20)\d{2}'
+                years = re.findall(year_pattern, line)
+
+                education_entry = {
+                    'degree': line.strip(),
+                    'year': years[-1] if years else '',
+                    'institution': ''
+                }
+
+                # Look for institution in nearby lines
+                for j in range(max(0, i-2), min(len(lines), i+3)):
+                    if 'university' in lines[j].lower() or 'college' in lines[j].lower():
+                        education_entry['institution'] = lines[j].strip()
+                        break
+
+                education_list.append(education_entry)
+                break
+
+    return education_list
+
+
+def legacy_extract_experience(experience_keywords: List[str], text: str) -> List[Dict[str, str]]:
+    """Experience exactly as extract_experience found it before the section segmenter"""
+    experience_list = []
+    lines = text.split('\n')
+
+    experience_section_found = False
+    current_job = {}
+
+    for i, line in enumerate(lines):
+        line_lower = line.lower().strip()
+
+        # Check if we're in experience section
+        if any(keyword in line_lower for keyword in experience_keywords):
+            experience_section_found = True
+            continue
+
+        # Stop if we hit another major section
+        if experience_section_found and any(keyword in line_lower for keyword in ['education', 'skills', 'projects', 'certifications']):
+            if current_job:
+                experience_list.append(current_job)
+            break
+
+        if experience_section_found and line.strip():
+            # Look for job titles and companies
+            # Common patterns: "Software Engineer at Google", "Google - Software Engineer"
+            if ' at ' in line or ' - ' in line or re.search(r'\d{4}.*\d{4}', line):
+                if current_job:
+                    experience_list.append(current_job)
+
+                # Extract dates
+                date_pattern = r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|\d{1,2}/|\d{4})'
+                dates = re.findall(date_pattern, line)
+
+                current_job = {
+                    'title': line.strip(),
+                    'company': '',
+                    'dates': ' '.join(dates) if dates else '',
+                    'description': ''
+                }
+            elif current_job and line.startswith(('•', '-', '*')):
+                # Add bullet points to description
+                current_job['description'] += line.strip() + '\n'
+
+    if current_job:
+        experience_list.append(current_job)
+
+    return experience_list
+
+
+def without_repeated_last_job(experience: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    legacy_extract_experience appends the last job a second time (the same
+    dict) when the next section's heading closes the experience section;
+    extract_experience lists it once.
+    """
+    if len(experience) > 1 and experience[-1] is experience[-2]:
+        return experience[:-1]
+    return experience
+
+
+def regression_corpus(resumes: int = 500) -> Iterator[str]:
+    """Edge cases plus synthetic resumes"""
+    from backend.benchmarks.synthetic_resumes import EDGE_CASES, synthetic_resumes
+
+    yield from EDGE_CASES
+    yield from synthetic_resumes(resumes)
+
+
+def extractors(parser: EnhancedResumeParser) -> Dict[str, Tuple[Callable, Callable]]:
+    """(legacy, current) implementation of each benchmarked extractor"""
+    def sections(text):
+        layout = parser.segment(text)
+        return parser.extract_education(text, layout), parser.extract_experience(text, layout)
+
+    return {
+        "skills": (lambda text: legacy_extract_skills(parser.tech_skills, text), parser.extract_skills),
+        "sections": (
+            lambda text: (
+                legacy_extract_education(text),
+                without_repeated_last_job(legacy_extract_experience(parser.experience_keywords, text)),
+            ),
+            sections,
+        ),
+    }
+
+
+def run(corpus: List[str]) -> List[Dict]:
+    results = []
+    for extractor, (legacy, current) in extractors(EnhancedResumeParser()).items():
+        reference = [legacy(text) for text in corpus]
+        for variant, extract in (("legacy", legacy), ("current", current)):
+            started = time.perf_counter()
+            extracted = [extract(text) for text in corpus]
+            elapsed = time.perf_counter() - started
+            results.append({
+                "extractor": extractor,
+                "variant": variant,
+                "resumes": len(corpus),
+                "resumes_per_sec": round(len(corpus) / elapsed),
+                "us_per_resume": round(elapsed / len(corpus) * 1e6, 1),
+                "mismatches": sum(1 for got, expected in zip(extracted, reference) if got != expected),
+            })
+    return results
+
+
+def main():
+    from backend.benchmarks.common import print_table
+
+    parser = argparse.ArgumentParser(description="Benchmark resume field extraction")
+    parser.add_argument("--resumes", type=int, default=2000, help="Synthetic resumes in the corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Report the best of this many runs")
+    args = parser.parse_args()
+
+    corpus = list(regression_corpus(args.resumes))
+    best = {}
+    for _ in range(args.repeat):
+        for result in run(corpus):
+            key = (result["extractor"], result["variant"])
+            if key not in best or result["resumes_per_sec"] > best[key]["resumes_per_sec"]:
+                best[key] = result
+    print_table(list(best.values()),
+                ["extractor", "variant", "resumes", "resumes_per_sec", "us_per_resume", "mismatches"])
+
+
+if __name__ == "__main__":
+    main()
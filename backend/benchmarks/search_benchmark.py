@@ -0,0 +1,219 @@
+"""
+Latency benchmark for /api/jobs/search.
+
+Loads a synthetic catalog into a local SQLite file and drives the real
+FastAPI app through ASGI (no network, no uvicorn) across filter
+combinations, page depths and query lengths. The text search backends
+registered in job_search.SEARCH_BACKENDS (only "ilike" so far) can be run
+side by side. The app is built without its job scheduler.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.search_benchmark --jobs 50000
+    python -m backend.benchmarks.search_benchmark --jobs 500000 --backends ilike --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from itertools import product
+
+FILTERS = {
+    "none": {},
+    "location": {"location": "London"},
+    "remote": {"remote_type": "remote"},
+    "salary": {"min_salary": 60000},
+    "experience": {"experience_level": "Senior"},
+    "combined": {"location": "Manchester", "remote_type": "hybrid", "min_salary": 40000, "experience_level": "Mid"},
+}
+
+QUERIES = {
+    "no_query": None,
+    "1_word": "python",
+    "2_words": "data analyst",
+    "4_words": "senior python backend developer",
+}
+
+PAGE_DEPTHS = [0, 100, 1000]
+PAGE_SIZE = 20
+
+
+def prepare_environment(db_path: str):
+    """Point the app at the benchmark database before backend.database is imported"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(db_path)}"
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ["RUN_SCHEDULER"] = "false"
+
+
+def load_catalog(engine, count: int, reload: bool = False, batch_size: int = 5000) -> int:
+    """Fill job_postings with `count` synthetic jobs (reused when already loaded)"""
+    from sqlalchemy import delete, func, insert, select
+    from backend.database import Base, JobPosting
+    from backend.benchmarks.synthetic import synthetic_jobs
+
+    Base.metadata.create_all(bind=engine)
+    table = JobPosting.__table__
+
+    with engine.begin() as conn:
+        existing = conn.execute(select(func.count()).select_from(table)).scalar()
+        if existing == count and not reload:
+            return existing
+        conn.execute(delete(table))
+
+    started = time.perf_counter()
+    batch = []
+    with engine.begin() as conn:
+        for job in synthetic_jobs(count):
+            batch.append(job)
+            if len(batch) >= batch_size:
+                conn.execute(insert(table), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(table), batch)
+    print(f"Loaded {count} synthetic jobs in {time.perf_counter() - started:.1f}s")
+    return count
+
+
+class StatementRecorder:
+    """Captures the SQL the endpoint runs so its query plan can be inspected"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.engine = engine
+        self.recording = False
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.recording and "job_postings" in statement and not statement.startswith("EXPLAIN"):
+            self.statements.append((statement, parameters))
+
+    def rows_scanned(self, table_rows: int, matched_rows: int) -> (int, str):
+        """
+        Estimate rows scanned from the SQLite query plan: a full SCAN of
+        job_postings reads every row, an index SEARCH reads roughly the rows
+        it matches.
+        """
+        details = []
+        scanned = 0
+        with self.engine.connect() as conn:
+            for statement, parameters in self.statements:
+                plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                steps = [row[-1] for row in plan]
+                details.extend(steps)
+                if any(step.startswith(("SCAN job_postings", "SCAN TABLE job_postings")) for step in steps):
+                    scanned += table_rows
+                else:
+                    scanned += matched_rows
+        return scanned, "; ".join(sorted(set(details)))
+
+
+async def run_case(client, params: dict, requests: int, concurrency: int):
+    latencies = []
+    total = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal total
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get("/api/jobs/search", params=params)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+            total = response.json()["total"]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies, time.perf_counter() - started, total
+
+
+async def run_benchmark(args) -> list:
+    import httpx
+    from backend import job_search
+    from backend.database import engine
+    from backend.main import app
+    from backend.benchmarks.common import summarize_latencies
+
+    table_rows = load_catalog(engine, args.jobs, reload=args.reload)
+    recorder = StatementRecorder(engine)
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for backend in args.backends:
+            job_search.DEFAULT_SEARCH_BACKEND = backend
+
+            for (filter_name, filters), (query_name, query), skip in product(
+                FILTERS.items(), QUERIES.items(), PAGE_DEPTHS
+            ):
+                params = dict(filters, skip=skip, limit=PAGE_SIZE)
+                if query:
+                    params["query"] = query
+
+                # Warm-up request also records the statements for the plan
+                recorder.statements = []
+                recorder.recording = True
+                await client.get("/api/jobs/search", params=params)
+                recorder.recording = False
+
+                latencies, wall_time, total = await run_case(client, params, args.requests, args.concurrency)
+                rows_scanned, plan = recorder.rows_scanned(table_rows, total)
+
+                result = {
+                    "backend": backend,
+                    "filters": filter_name,
+                    "query": query_name,
+                    "skip": skip,
+                    "matched": total,
+                    "rows_scanned": rows_scanned,
+                    **summarize_latencies(latencies, wall_time),
+                }
+                if args.show_plans:
+                    result["plan"] = plan
+                results.append(result)
+                print(
+                    f"  {backend:>8} {filter_name:>10} {query_name:>8} skip={skip:<5} "
+                    f"p50={result['p50_ms']}ms p99={result['p99_ms']}ms"
+                )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/jobs/search against a synthetic catalog")
+    parser.add_argument("--jobs", type=int, default=50000, help="Catalog size (50k-500k is typical)")
+    parser.add_argument("--db", default="search_benchmark.db", help="SQLite file for the catalog")
+    parser.add_argument("--requests", type=int, default=20, help="Timed requests per case")
+    parser.add_argument("--concurrency", type=int, default=1, help="In-flight requests per case")
+    parser.add_argument("--backends", default="ilike", help="Comma separated job_search backends to compare")
+    parser.add_argument("--reload", action="store_true", help="Rebuild the catalog even if it is already loaded")
+    parser.add_argument("--show-plans", action="store_true", help="Include SQLite query plans in the output")
+    parser.add_argument("--json", help="Write results to this file as JSON")
+    args = parser.parse_args()
+    args.backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+
+    prepare_environment(args.db)
+    from backend.benchmarks.common import print_table
+    from backend.job_search import SEARCH_BACKENDS
+
+    unknown = [name for name in args.backends if name not in SEARCH_BACKENDS]
+    if unknown:
+        parser.error(f"Unknown backends {', '.join(unknown)}; available: {', '.join(SEARCH_BACKENDS)}")
+
+    results = asyncio.run(run_benchmark(args))
+
+    columns = ["backend", "filters", "query", "skip", "matched", "rows_scanned",
+               "throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+    if args.show_plans:
+        columns.append("plan")
+    print()
+    print_table(results, columns)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Synthetic job catalog used by the benchmarks.
+Values follow the shape of real Adzuna postings closely enough for the
+search filters, skill extraction and classifiers to behave realistically.
+"""
+from typing import Dict, Iterator
+from datetime import datetime, timedelta
+import random
+
+ROLES = [
+    "Software Developer", "Frontend Developer", "Backend Developer", "Full Stack Developer",
+    "Python Developer", "Data Analyst", "Business Analyst", "Data Scientist",
+    "Machine Learning Engineer", "AI Engineer", "Data Engineer", "DevOps Engineer",
+    "QA Engineer", "Java Developer", "Cloud Architect", "Product Manager",
+]
+
+SENIORITY = ["", "", "Junior ", "Senior ", "Lead ", "Graduate ", "Principal "]
+
+COMPANIES = [
+    "Damia Group Ltd", "RP International", "McNally Recruitment Ltd", "Bright Purple Resourcing",
+    "Hays", "Reed", "Harnham", "Opus Recruitment Solutions", "Tech Nation", "BBC", "Monzo",
+    "Revolut", "Ocado Technology", "Sky", "BT Group", "Deliveroo", "Wise", "Sainsbury's Tech",
+]
+
+LOCATIONS = [
+    "London", "Manchester", "Leeds", "Birmingham", "Bristol", "Edinburgh", "Glasgow",
+    "Cambridge", "Oxford", "Reading", "Newcastle upon Tyne", "Sheffield", "Cardiff", "Belfast",
+]
+
+SKILLS = [
+    "python", "java", "javascript", "typescript", "react", "angular", "vue", "node.js",
+    "django", "flask", "fastapi", "spring", "sql", "mongodb", "postgresql", "mysql", "aws",
+    "azure", "gcp", "docker", "kubernetes", "git", "ci/cd", "agile", "scrum", "rest api", "graphql",
+]
+
+WORK_PATTERNS = [
+    "This is a fully remote role.", "Hybrid working, two days a week in the office.",
+    "Flexible working available.", "Office based.", "Remote option for the right candidate.",
+    "", "",
+]
+
+EXPERIENCE_PHRASES = [
+    "You will have 5+ years of commercial experience.", "Ideal for an early career engineer.",
+    "1-2 years experience preferred.", "Experienced engineers encouraged to apply.", "", "",
+]
+
+FILLER = (
+    "You will join a collaborative team building products used by thousands of customers. "
+    "We value ownership, clear communication and a pragmatic approach to delivery. "
+    "The role involves working closely with stakeholders, reviewing code and improving our "
+    "platform's reliability. We offer a competitive salary, pension and learning budget."
+)
+
+
+def synthetic_job(rng: random.Random, index: int, now: datetime = None) -> Dict:
+    """Build one job posting dict in the normalized shape used by JobPosting"""
+    now = now or datetime.utcnow()
+    role = rng.choice(ROLES)
+    title = f"{rng.choice(SENIORITY)}{role}"
+    skills = rng.sample(SKILLS, rng.randint(2, 7))
+    salary_min = rng.randrange(25000, 90000, 1000)
+
+    description = " ".join([
+        f"We are hiring a {title} with experience in {', '.join(skills)}.",
+        rng.choice(WORK_PATTERNS),
+        rng.choice(EXPERIENCE_PHRASES),
+        FILLER,
+    ])
+
+    return {
+        "title": title,
+        "company_name": rng.choice(COMPANIES),
+        "location": f"{rng.choice(LOCATIONS)}, UK",
+        "remote_type": rng.choice(["remote", "hybrid", "onsite", "onsite"]),
+        "description": description,
+        "salary_min": salary_min,
+        "salary_max": salary_min + rng.randrange(0, 30000, 1000),
+        "salary_currency": "GBP",
+        "experience_level": rng.choice(["Junior", "Mid", "Mid", "Senior"]),
+        "employment_type": rng.choice(["permanent", "contract", "full-time"]),
+        "required_skills": skills,
+        "external_id": f"synthetic-{index}",
+        "source": "synthetic",
+        "apply_url": f"https://example.com/jobs/{index}",
+        "posted_date": now - timedelta(minutes=rng.randrange(0, 60 * 24 * 120)),
+        "is_active": rng.random() > 0.05,
+    }
+
+
+def synthetic_jobs(count: int, seed: int = 42) -> Iterator[Dict]:
+    """Deterministic stream of `count` synthetic jobs"""
+    rng = random.Random(seed)
+    now = datetime(2025, 11, 12, 21, 0, 0)
+    for index in range(count):
+        yield synthetic_job(rng, index, now)
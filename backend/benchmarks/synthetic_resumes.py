@@ -0,0 +1,252 @@
+"""
+Synthetic resumes used by the resume parser benchmarks and regression
+tests. Texts follow the layouts real uploads come in (section headings in
+different spellings, "Title at Company" and "Company - Title" lines,
+bullets, date ranges, skill lists with ".js" and "certified" forms), so
+every branch of EnhancedResumeParser gets exercised. render_pdf() and
+render_docx() turn a text into an upload-shaped document, render_docx()
+optionally with the text in the page header and a table the way many
+resume templates lay it out.
+"""
+from typing import Iterator, List
+import random
+
+FIRST_NAMES = ["Amara", "Ben", "Chloe", "Dev", "Ewa", "Farah", "George", "Hana", "Idris", "Jade", "Kofi", "Lena"]
+LAST_NAMES = ["Okafor", "Smith", "Nguyen", "Patel", "Kowalski", "Haddad", "Evans", "Sato", "Mensah", "Clarke"]
+
+JOB_TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Backend Developer", "Frontend Developer",
+    "Full Stack Developer", "Data Engineer", "DevOps Engineer", "Data Analyst", "QA Engineer",
+    "Machine Learning Engineer", "Graduate Developer", "Lead Engineer",
+]
+
+EMPLOYERS = [
+    "Monzo", "Ocado Technology", "BBC", "Sky", "Deliveroo", "Wise", "BT Group", "Revolut",
+    "Acme Software Ltd", "Northwind Analytics", "Globex Corporation", "Initech",
+]
+
+# Spelled the way people write them, including forms that only match through
+# the ".js" and " certified" variants of the skill lexicon
+SKILL_MENTIONS = [
+    "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "PHP", "Ruby", "Go", "Rust", "Swift",
+    "Kotlin", "Scala", "R", "MATLAB", "HTML", "CSS", "SQL", "Bash", "PowerShell", "React", "React.js",
+    "Angular", "Vue.js", "Svelte", "Django", "Flask", "FastAPI", "Express.js", "NestJS", "Spring Boot",
+    "Laravel", "Ruby on Rails", "ASP.NET", "jQuery", "Bootstrap", "Tailwind", "Node.js", "NodeJS",
+    "Next.js", "NextJS", "Nuxt.js", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Elasticsearch",
+    "SQLite", "Oracle", "Cassandra", "DynamoDB", "Firebase", "AWS", "Azure", "GCP", "Docker",
+    "Kubernetes", "Terraform", "Ansible", "Jenkins", "GitHub Actions", "GitLab CI", "CircleCI",
+    "Nginx", "Apache Kafka", "Linux", "Ubuntu", "CentOS", "Git", "GitHub", "GitLab", "Bitbucket",
+    "Jira", "Confluence", "Slack", "Figma", "Sketch", "Photoshop", "Postman", "Insomnia", "VSCode",
+    "IntelliJ", "Eclipse", "Vim", "Excel", "Tableau", "Power BI", "GraphQL", "REST APIs",
+]
+
+CERTIFICATIONS = [
+    "AWS Certified Solutions Architect", "Azure Certified Developer", "Certified Kubernetes Administrator",
+    "Docker Certified Associate", "Scrum Master (PSM I)", "PMP", "CompTIA Security+",
+    "Google Cloud Professional Data Engineer", "Oracle Certified Professional", "TensorFlow Certified Developer",
+]
+
+DEGREES = [
+    "BSc (Hons) Computer Science", "Bachelor of Engineering in Software Engineering",
+    "MSc Data Science", "Master of Science in Information Technology", "PhD in Machine Learning",
+    "B.S. Mathematics", "BA Economics", "M.S. Computer Science",
+]
+
+INSTITUTIONS = [
+    "University of Manchester", "University College London", "King's College London",
+    "Imperial College London", "University of Leeds", "Edinburgh Napier University", "City College",
+]
+
+EXPERIENCE_HEADINGS = ["EXPERIENCE", "Professional Experience", "Work History", "Employment", "WORK EXPERIENCE"]
+EDUCATION_HEADINGS = ["EDUCATION", "Education", "Academic Background"]
+SKILLS_HEADINGS = ["SKILLS", "Technical Skills", "Skills & Tools"]
+PROJECTS_HEADINGS = ["PROJECTS", "Selected Projects"]
+CERTIFICATION_HEADINGS = ["CERTIFICATIONS", "Certifications"]
+
+BULLETS = ["•", "-", "*"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+ACHIEVEMENTS = [
+    "Built and maintained {skills} services handling millions of requests a day",
+    "Migrated a legacy monolith to {skills}, cutting deployment time by 60%",
+    "Led a team of four engineers delivering {skills} features end to end",
+    "Automated reporting with {skills}, saving the analytics team 10 hours a week",
+    "Improved test coverage from 40% to 85% using {skills}",
+    "Designed data pipelines in {skills} feeding the company dashboards",
+    "Mentored junior developers and ran code reviews for the {skills} codebase",
+]
+
+# Texts that exercise the corners of the skill patterns: prefixes of longer
+# words, ".js" and " certified" forms, symbols and multi-word skills
+EDGE_CASES = [
+    "",
+    "JavaScript but not Java; Golang, go-to person, Google Cloud",
+    "c++ c# c+++ c++11 objective-c .net asp.net ASP.NET Core",
+    "Experience with react.js, vue.js, express.js, node.js and preact.js",
+    "docker certified, r certified, go certified, sql certified",
+    "mysql.js postgresql.js vector.js scala.js",
+    "github actions, gitlab ci, github, gitlab, git",
+    "R, R&D, r-programming, rstudio, ruby on rails",
+    "sqlite3 nosql mysql-server postgresql",
+    "Apache Spark; nginx/apache; linux-based; ubuntu 22.04",
+    "swift\nkotlin\r\nscala\tsvelte",
+    "I use vim, VSCODE and IntelliJ IDEA. Eclipse occasionally.",
+    "bash/powershell/html5/css3",
+]
+
+
+def _dates(rng: random.Random, start_year: int, end_year: int) -> str:
+    style = rng.randrange(4)
+    end = "Present" if end_year >= 2025 else None
+    if style == 0:
+        return f"{rng.choice(MONTHS)} {start_year} - {end or rng.choice(MONTHS) + ' ' + str(end_year)}"
+    if style == 1:
+        return f"{start_year} - {end or end_year}"
+    if style == 2:
+        return f"{rng.randint(1, 12):02d}/{start_year} - {rng.randint(1, 12):02d}/{end_year}"
+    return f"{start_year}–{end_year}"
+
+
+def _job_heading(rng: random.Random, title: str, employer: str, dates: str) -> List[str]:
+    style = rng.randrange(4)
+    if style == 0:
+        return [f"{title} at {employer} | {dates}"]
+    if style == 1:
+        return [f"{employer} - {title}", dates]
+    if style == 2:
+        return [f"{title}, {employer}", dates]
+    return [f"{dates}  {title}", employer]
+
+
+def synthetic_resume(rng: random.Random, index: int = 0) -> str:
+    """Build one plain-text resume, as text extraction would return it"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first}{last}{index}".lower()
+    skills = rng.sample(SKILL_MENTIONS, rng.randint(6, 24))
+    years = rng.randint(1, 15)
+    lines = [
+        f"{first} {last}",
+        f"{handle}@example.com | +44 7{rng.randint(100, 999)} {rng.randint(100000, 999999)} | London, UK",
+        f"linkedin.com/in/{handle} | github.com/{handle}" + (f" | https://{handle}.dev" if rng.random() < 0.4 else ""),
+        "",
+        rng.choice(["SUMMARY", "Profile", "About Me"]),
+        f"{rng.choice(JOB_TITLES)} with {years}+ years of experience building software with "
+        f"{', '.join(skills[:3])}.",
+        "",
+        rng.choice(EXPERIENCE_HEADINGS),
+    ]
+
+    end_year = 2025
+    for _ in range(rng.randint(1, 5)):
+        start_year = end_year - rng.randint(1, 4)
+        lines.extend(_job_heading(rng, rng.choice(JOB_TITLES), rng.choice(EMPLOYERS),
+                                  _dates(rng, start_year, end_year)))
+        bullet = rng.choice(BULLETS)
+        for _ in range(rng.randint(2, 6)):
+            used = ", ".join(rng.sample(skills, min(len(skills), rng.randint(1, 3))))
+            lines.append(f"{bullet} {rng.choice(ACHIEVEMENTS).format(skills=used)}")
+        lines.append("")
+        end_year = start_year
+
+    if rng.random() < 0.7:
+        lines.append(rng.choice(PROJECTS_HEADINGS))
+        for _ in range(rng.randint(1, 3)):
+            lines.append(f"{rng.choice(BULLETS)} Side project using {', '.join(rng.sample(skills, 2))}")
+        lines.append("")
+
+    lines.append(rng.choice(EDUCATION_HEADINGS))
+    for _ in range(rng.randint(1, 2)):
+        graduated = end_year - rng.randint(0, 3)
+        if rng.random() < 0.5:
+            lines.extend([rng.choice(DEGREES), f"{rng.choice(INSTITUTIONS)}, {graduated}"])
+        else:
+            lines.append(f"{rng.choice(DEGREES)} - {rng.choice(INSTITUTIONS)} ({graduated - 3} - {graduated})")
+    lines.append("")
+
+    lines.append(rng.choice(SKILLS_HEADINGS))
+    lines.append(", ".join(skills))
+    lines.append("")
+
+    if rng.random() < 0.5:
+        lines.append(rng.choice(CERTIFICATION_HEADINGS))
+        lines.extend(rng.sample(CERTIFICATIONS, rng.randint(1, 3)))
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_resumes(count: int, seed: int = 42) -> Iterator[str]:
+    """Deterministic stream of `count` synthetic resume texts"""
+    rng = random.Random(seed)
+    for index in range(count):
+        yield synthetic_resume(rng, index)
+
+
+def render_pdf(text: str, lines_per_page: int = 55) -> bytes:
+    """Minimal text-only PDF (Helvetica, WinAnsi) with one line of text per text line"""
+    lines = text.split("\n")
+    pages = [lines[start:start + lines_per_page] for start in range(0, max(len(lines), 1), lines_per_page)]
+
+    def escape(line: str) -> bytes:
+        raw = line.encode("cp1252", errors="replace")
+        return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for page in pages:
+        content = b"BT /F1 10 Tf 12 TL 50 800 Td " + b" ".join(b"(" + escape(line) + b") Tj T*" for line in page) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def render_docx(text: str, header_lines: int = 0, table_columns: int = 0) -> bytes:
+    """
+    DOCX of a text, written by python-docx: the first `header_lines` lines
+    in the page header, the rest one paragraph per line, or with
+    `table_columns` filled row by row into the cells of a table
+    """
+    import io
+    import docx
+
+    document = docx.Document()
+    lines = text.split("\n")
+    if header_lines:
+        header = document.sections[0].header
+        header.paragraphs[0].text = lines[0]
+        for line in lines[1:header_lines]:
+            header.add_paragraph(line)
+        lines = lines[header_lines:]
+    if table_columns:
+        from docx.table import _Cell
+
+        table = document.add_table(rows=-(-len(lines) // table_columns), cols=table_columns)
+        # table.cell() and row.cells rebuild the whole cell grid on every call
+        cells = (_Cell(tc, table) for tr in table._tbl.tr_lst for tc in tr.tc_lst)
+        for cell, line in zip(cells, lines):
+            cell.text = line
+    else:
+        for line in lines:
+            document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
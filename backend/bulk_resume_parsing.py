@@ -0,0 +1,215 @@
+"""
+Batch parsing of many resumes at once, for recruiters screening a folder
+or zip of applications instead of uploading them one by one.
+
+parse_batch() fans the documents out over a ResumeParserPool, keeping at
+most `concurrency` of them in flight (by default one less than the pool's
+workers, so a batch sharing the API's pool leaves a worker for single
+uploads), and yields a record for each one as
+soon as it finishes (completion order, not input order), so callers can
+stream the results as NDJSON. Files with the same content are parsed
+once; later copies are reported as duplicates of the first. Given a
+ResumeParseCache, documents parsed before (through /api/upload-resume or
+an earlier batch) are answered from it and new parses are stored.
+
+Usage (from the repository root):
+    python -m backend.bulk_resume_parsing applications.zip > results.ndjson
+    python -m backend.bulk_resume_parsing ./applications --workers 4 --no-cache
+"""
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, wait
+from pathlib import Path
+from sqlalchemy.orm import Session
+from .resume_cache import ResumeParseCache, content_hash
+from .resume_parsing import DEFAULT_WORKERS, MAX_UPLOAD_BYTES, ParserBusy, ResumeParseError, ResumeParserPool
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+
+SUPPORTED_TYPES = (".pdf", ".docx")
+MAX_BATCH_DOCUMENTS = int(os.getenv("RESUME_BATCH_MAX_DOCUMENTS", "1000"))
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("RESUME_BATCH_MAX_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+
+# (filename, content); content is None for a file over the per-document size limit
+Document = Tuple[str, Optional[bytes]]
+
+
+def _is_resume(name: str) -> bool:
+    base = name.rsplit("/", 1)[-1]
+    return name.lower().endswith(SUPPORTED_TYPES) and not base.startswith(".") and not name.startswith("__MACOSX/")
+
+
+def zip_documents(package: zipfile.ZipFile, max_bytes: int = MAX_UPLOAD_BYTES) -> Iterator[Document]:
+    """PDF and DOCX members of a zip, read one at a time"""
+    for info in package.infolist():
+        if info.is_dir() or not _is_resume(info.filename):
+            continue
+        if info.file_size > max_bytes:
+            yield info.filename, None
+            continue
+        # The declared size can lie; never inflate more than the limit
+        with package.open(info) as member:
+            content = member.read(max_bytes + 1)
+        yield info.filename, content if len(content) <= max_bytes else None
+
+
+def folder_documents(folder: str, max_bytes: int = MAX_UPLOAD_BYTES) -> Iterator[Document]:
+    """PDF and DOCX files under a folder, in path order"""
+    root = Path(folder)
+    for path in sorted(root.rglob("*")):
+        name = path.relative_to(root).as_posix()
+        if not path.is_file() or not _is_resume(name):
+            continue
+        yield name, path.read_bytes() if path.stat().st_size <= max_bytes else None
+
+
+def _record(filename: str, digest: Optional[str], status: str, **fields) -> Dict:
+    return dict({"filename": filename, "content_hash": digest, "status": status}, **fields)
+
+
+def parse_batch(
+    pool: ResumeParserPool,
+    documents: Iterable[Document],
+    cache: Optional[ResumeParseCache] = None,
+    db: Optional[Session] = None,
+    user_id: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    max_documents: int = MAX_BATCH_DOCUMENTS
+) -> Iterator[Dict]:
+    """
+    One record per document as it finishes, then {"summary": {...}}.
+
+    Records carry filename, content_hash and a status: "parsed" or
+    "cached" (with data, the parse_resume() result), "duplicate" (with
+    duplicate_of) or "failed" (with error and the status_code the upload
+    endpoint would have answered with).
+    """
+    concurrency = concurrency or max(1, pool.workers - 1)
+    summary = {"documents": 0, "parsed": 0, "cached": 0, "duplicates": 0, "failed": 0, "truncated": False}
+    first_seen: Dict[str, str] = {}
+    pending = {}
+    started = time.perf_counter()
+
+    def failed(filename: str, digest: Optional[str], error: str, status_code: int) -> Dict:
+        summary["failed"] += 1
+        return _record(filename, digest, "failed", error=error, status_code=status_code)
+
+    def finished(done) -> Iterator[Dict]:
+        for future in done:
+            filename, digest = pending.pop(future)
+            try:
+                parsed = future.result()
+            except ResumeParseError as e:
+                yield failed(filename, digest, str(e), e.status_code)
+                continue
+            except Exception as e:
+                yield failed(filename, digest, f"Error processing resume: {e}", 500)
+                continue
+            if "error" in parsed:
+                yield failed(filename, digest, parsed["error"], 422)
+                continue
+            if cache is not None:
+                cache.put(db, digest, filename, parsed, user_id=user_id)
+            summary["parsed"] += 1
+            yield _record(filename, digest, "parsed", data=parsed)
+
+    def submit(filename: str, digest: str, content: bytes) -> Iterator[Dict]:
+        file_type = filename.rsplit(".", 1)[-1].lower()
+        while True:
+            try:
+                # Admitted like any upload, so the batch never takes the pool's whole queue
+                pending[pool.submit(content, file_type)] = (filename, digest)
+                return
+            except ParserBusy as e:
+                if not pending:
+                    yield failed(filename, digest, str(e), e.status_code)
+                    return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from finished(done)
+
+    try:
+        for filename, content in documents:
+            if summary["documents"] >= max_documents:
+                summary["truncated"] = True
+                break
+            summary["documents"] += 1
+            if content is None:
+                yield failed(filename, None, "File is too large", 413)
+                continue
+
+            digest = content_hash(content)
+            if digest in first_seen:
+                summary["duplicates"] += 1
+                yield _record(filename, digest, "duplicate", duplicate_of=first_seen[digest])
+                continue
+            first_seen[digest] = filename
+
+            parsed = cache.get(db, digest) if cache is not None else None
+            if parsed is not None:
+                summary["cached"] += 1
+                yield _record(filename, digest, "cached", data=parsed)
+                continue
+
+            if len(pending) >= concurrency:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from finished(done)
+            yield from submit(filename, digest, content)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from finished(done)
+    finally:
+        # A client that drops the stream should not leave queued documents behind
+        for future in pending:
+            future.cancel()
+
+    summary["seconds"] = round(time.perf_counter() - started, 2)
+    yield {"summary": summary}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a folder or zip of resumes into NDJSON records")
+    parser.add_argument("path", help="Folder or .zip of PDF/DOCX resumes")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Parser processes")
+    parser.add_argument("--output", help="Write the records to this file instead of stdout")
+    parser.add_argument("--max-documents", type=int, default=MAX_BATCH_DOCUMENTS, help="Stop after this many documents")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every document; skip resume_analyses")
+    args = parser.parse_args()
+
+    cache = db = None
+    if not args.no_cache:
+        from backend.database import SessionLocal, create_tables
+        from backend.enhanced_resume_parser import EnhancedResumeParser
+
+        create_tables()
+        db = SessionLocal()
+        cache = ResumeParseCache(EnhancedResumeParser())
+
+    pool = ResumeParserPool(workers=args.workers)
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    package = zipfile.ZipFile(args.path) if args.path.lower().endswith(".zip") else None
+    try:
+        documents = zip_documents(package) if package else folder_documents(args.path)
+        # The pool is the batch's own here, so every worker may be used
+        records = parse_batch(pool, documents, cache=cache, db=db, concurrency=args.workers,
+                              max_documents=args.max_documents)
+        for record in records:
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+            if "summary" in record:
+                print(f"✅ {json.dumps(record['summary'])}", file=sys.stderr)
+    finally:
+        pool.close()
+        if package:
+            package.close()
+        if output is not sys.stdout:
+            output.close()
+        if db is not None:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,12 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, JSON
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, JSON, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, deferred
 from datetime import datetime
 import os
 
 #Database Setup
 # Load environment variable
-DATABASE_URL = (
+DATABASE_URL = os.getenv("DATABASE_URL") or (
     "postgresql://postgres.ophvscnepuoluydaondw:c3K1Nnsut7SAVU4G"
     "@aws-1-eu-west-1.pooler.supabase.com:6543/postgres"
     "?sslmode=require"
@@ -141,10 +141,17 @@ class ChatMessage(Base):
 
 class ResumeAnalysis(Base):
     __tablename__ = "resume_analyses"
+    # One stored parse per file and parser version
+    __table_args__ = (UniqueConstraint("content_hash", "parser_version"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # nullable for backward compatibility
     filename = Column(String)
+
+    # Parse cache key: SHA-256 of the uploaded file and the parser version that read it
+    content_hash = Column(String(64), index=True)
+    parser_version = Column(Integer)
+    raw_text = Column(Text)
     
     # Contact Information
     email = Column(String)
@@ -208,7 +215,8 @@ class JobPosting(Base):
     requirements = Column(Text)
     salary_min = Column(Integer)
     salary_max = Column(Integer)
-    salary_currency = Column(String, default="USD")
+    salary_currency = Column(String, default="GBP")
+    salary_period = Column(String)  # year, month, week, day, hour (None: not stated)
     experience_level = Column(String)  # junior, mid, senior, lead, executive
     employment_type = Column(String)  # full-time, part-time, contract, internship
 
@@ -219,12 +227,23 @@ class JobPosting(Base):
     industry = Column(String)
     company_size = Column(String)  # startup, small, medium, large, enterprise
 
+    # Normalized at ingestion (see job_normalization.py)
+    salary_annual_min = Column(Integer)  # yearly, in job_normalization.BASE_CURRENCY
+    salary_annual_max = Column(Integer, index=True)
+    salary_band = Column(String, index=True)  # e.g. 35k_50k
+    company_key = Column(String, index=True)  # lowercase company name without legal suffixes
+
     # External data
     external_id = Column(String, unique=True, index=True)  # ID from job board API
     source = Column(String)  # adzuna, indeed, linkedin, etc.
     apply_url = Column(String)
-    posted_date = Column(DateTime)
+    posted_date = Column(DateTime, index=True)
     expires_date = Column(DateTime)
+    content_hash = Column(String(64))  # sha256 of the normalized source fields
+
+    # Near-duplicate detection
+    minhash = deferred(Column(JSON))  # MinHash signature of title + company + description (not loaded by default)
+    duplicate_of_id = Column(Integer, ForeignKey("job_postings.id"), nullable=True, index=True)  # canonical posting
 
     # Internal tracking
     is_active = Column(Boolean, default=True)
@@ -242,6 +261,28 @@ class JobPosting(Base):
     job_matches = relationship("JobMatch", back_populates="job")
 
 
+class JobDedupBucket(Base):
+    """LSH band buckets of job MinHash signatures"""
+    __tablename__ = "job_dedup_buckets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    bucket = Column(String, index=True)  # "<band>:<hash of band rows>"
+    job_id = Column(Integer, ForeignKey("job_postings.id"), index=True)
+
+
+class ArchivedJobPosting(Base):
+    """Expired job postings moved out of job_postings by the retention job"""
+    __tablename__ = "job_postings_archive"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, index=True)  # id the posting had in job_postings
+    external_id = Column(String, index=True)
+    source = Column(String)
+    posted_date = Column(DateTime)
+    data = Column(JSON)  # every other job_postings column
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
 class UserJobPreferences(Base):
     __tablename__ = "user_job_preferences"
     
@@ -400,6 +441,61 @@ class JobAlert(Base):
     
     user = relationship("User")
 
+class JobAlertCandidate(Base):
+    __tablename__ = "job_alert_candidates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    alert_id = Column(Integer, ForeignKey("job_alerts.id"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    job_id = Column(Integer, ForeignKey("job_postings.id"))
+
+    match_score = Column(Float)
+    frequency = Column(String, index=True)  # instant, daily, weekly (copied from preferences at match time)
+    sent_at = Column(DateTime, nullable=True, index=True)  # NULL until delivered in an alert/digest
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    alert = relationship("JobAlert")
+    job = relationship("JobPosting")
+
+class ApiQuotaUsage(Base):
+    __tablename__ = "api_quota_usage"
+    __table_args__ = (UniqueConstraint("source", "period"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, index=True)  # adzuna, jsearch
+    period = Column(String)  # billing month, YYYY-MM
+    calls_used = Column(Integer, default=0)
+    calls_failed = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class QueryYieldStat(Base):
+    __tablename__ = "query_yield_stats"
+    __table_args__ = (UniqueConstraint("source", "query", "page"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, index=True)
+    query = Column(String)
+    page = Column(Integer, default=1)
+
+    # Yield of previously unseen external_ids
+    runs = Column(Integer, default=0)
+    total_results = Column(Integer, default=0)
+    new_results = Column(Integer, default=0)
+    avg_new_results = Column(Float, default=0.0)  # exponentially smoothed per run
+    last_new_results = Column(Integer, default=0)
+    duplicate_streak = Column(Integer, default=0)  # consecutive runs that returned only known jobs
+    last_run_at = Column(DateTime)
+
+class FetchWatermark(Base):
+    __tablename__ = "fetch_watermarks"
+    __table_args__ = (UniqueConstraint("source", "query"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String, index=True)
+    query = Column(String)
+    newest_posted_date = Column(DateTime)  # newest posting seen for this source and query
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class Resume(Base):
     __tablename__ = "resumes"
     
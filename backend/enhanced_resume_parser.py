@@ -1,9 +1,158 @@
 import PyPDF2
-import docx
+import io
+import multiprocessing
 import re
-from typing import Dict, List, Optional
+import xml.etree.ElementTree as ElementTree
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
 from datetime import datetime
 
+# Bump whenever a change to the extractors changes parse results; cached
+# parses of older versions are then ignored (see resume_cache.py)
+PARSER_VERSION = 3
+
+# A document to parse: a file path, its bytes, or an open binary file
+Source = Union[str, bytes, bytearray, memoryview, BinaryIO]
+
+
+def as_binary_file(source: Source) -> Union[str, BinaryIO]:
+    """Paths and file objects as they are, in-memory bytes wrapped in a BytesIO"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+# WordprocessingML elements read by docx_paragraphs()
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_P, W_R, W_T, W_BR = W + "p", W + "r", W + "t", W + "br"
+W_RUN_CHARACTERS = {W + "tab": "\t", W + "ptab": "\t", W + "cr": "\n", W + "noBreakHyphen": "-"}
+# Older copy of a text box kept for other readers; its text is already in the modern one
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+DOCX_TEXT_PARTS = re.compile(r'word/(header|document|footer)(\d*)\.xml')
+DOCX_PART_ORDER = {"header": 0, "document": 1, "footer": 2}
+
+
+def _part_paragraphs(part) -> Iterator[str]:
+    """Paragraph texts of one WordprocessingML part, read incrementally"""
+    open_tags = []
+    paragraphs = []  # text pieces of each open paragraph; text box paragraphs nest
+    fallback = 0
+    for event, element in ElementTree.iterparse(part, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            open_tags.append(tag)
+            if tag == W_P:
+                paragraphs.append([])
+            elif tag == MC_FALLBACK:
+                fallback += 1
+            continue
+
+        open_tags.pop()
+        if tag == W_P:
+            text = "".join(paragraphs.pop())
+            if not fallback:
+                yield text
+            if not paragraphs:
+                element.clear()
+        elif tag == MC_FALLBACK:
+            fallback -= 1
+        elif open_tags and open_tags[-1] == W_R and paragraphs:
+            # Same run content python-docx maps to text: tabs, line breaks, hyphens
+            if tag == W_T:
+                paragraphs[-1].append(element.text or "")
+            elif tag == W_BR:
+                if element.get(W + "type", "textWrapping") == "textWrapping":
+                    paragraphs[-1].append("\n")
+            elif tag in W_RUN_CHARACTERS:
+                paragraphs[-1].append(W_RUN_CHARACTERS[tag])
+
+
+def docx_paragraphs(source: Source) -> Iterator[str]:
+    """
+    Text of every paragraph of a DOCX as the XML is read: headers, then the
+    body with table cells and text boxes in document order, then footers
+    """
+    with zipfile.ZipFile(as_binary_file(source)) as package:
+        parts = sorted(
+            (DOCX_PART_ORDER[match.group(1)], int(match.group(2) or 0), name)
+            for name in package.namelist()
+            for match in [DOCX_TEXT_PARTS.fullmatch(name)] if match
+        )
+        for _, _, name in parts:
+            with package.open(name) as part:
+                yield from _part_paragraphs(part)
+
+
+# PDFs with at least this many pages are split into chunks of
+# PDF_PAGES_PER_CHUNK pages when extract_text_from_pdf gets processes > 1;
+# below that, starting the processes costs more than it saves
+PARALLEL_PDF_MIN_PAGES = 64
+PDF_PAGES_PER_CHUNK = 16
+
+_worker_pdf: Optional[PyPDF2.PdfReader] = None
+
+
+def _open_worker_pdf(source: Union[str, bytes]):
+    """Process pool initializer: read the PDF once per worker process"""
+    global _worker_pdf
+    _worker_pdf = PyPDF2.PdfReader(as_binary_file(source))
+
+
+def _worker_pdf_pages(start: int, stop: int) -> List[str]:
+    return [page.extract_text() for page in _worker_pdf.pages[start:stop]]
+
+
+def pdf_page_texts(source: Source, processes: int = 1) -> List[str]:
+    """Text of every page of a PDF, in page order"""
+    if processes > 1 and not isinstance(source, str):
+        # Worker processes get the document itself, not a file object
+        source = as_binary_file(source).read()
+    reader = PyPDF2.PdfReader(as_binary_file(source))
+    pages = len(reader.pages)
+    if processes <= 1 or pages < PARALLEL_PDF_MIN_PAGES:
+        return [page.extract_text() for page in reader.pages]
+
+    starts = range(0, pages, PDF_PAGES_PER_CHUNK)
+    with ProcessPoolExecutor(
+        max_workers=min(processes, len(starts)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_open_worker_pdf,
+        initargs=(source,)
+    ) as executor:
+        chunks = executor.map(_worker_pdf_pages, starts, [start + PDF_PAGES_PER_CHUNK for start in starts])
+        return [text for chunk in chunks for text in chunk]
+
+
+# Line patterns, compiled once for every parse
+DEGREE_PATTERN = re.compile(
+    r'bachelor|master|phd|doctorate|b\.s\.|b\.a\.|m\.s\.|m\.a\.|ph\.d\.'
+    r'|computer science|software engineering|information technology|engineering'
+)
+YEAR_PATTERN = re.compile(r'(19|20)\d{2}')
+DATED_LINE_PATTERN = re.compile(r'\d{4}.*\d{4}')
+DATE_PATTERN = re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|\d{1,2}/|\d{4})')
+BULLET_PREFIXES = ('•', '-', '*')
+
+# Words that open the education section, and the ones that close each section
+EDUCATION_KEYWORDS = ('education', 'academic')
+EDUCATION_END_KEYWORDS = ('experience', 'skills', 'projects')
+EXPERIENCE_END_KEYWORDS = ('education', 'skills', 'projects', 'certifications')
+
+
+class ResumeSection(NamedTuple):
+    lines: List[int]  # indices of the lines the field extractor reads
+
+
+class ResumeLayout(NamedTuple):
+    """Lines of a resume, classified once and split into the sections the extractors read"""
+    lines: List[str]
+    lowered: List[str]
+    kinds: List[str]  # 'blank', 'dated', 'bullet', 'heading' or 'other'
+    education: ResumeSection
+    experience: ResumeSection
+
+
 class EnhancedResumeParser:
     def __init__(self):
         self.tech_skills = {
@@ -54,37 +203,65 @@ class EnhancedResumeParser:
             'experience', 'work history', 'employment', 'professional experience',
             'career history', 'work experience', 'job history'
         ]
-    def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
+
+        self._compile_skill_lexicon()
+        section_words = {*EDUCATION_KEYWORDS, *self.experience_keywords, *EDUCATION_END_KEYWORDS,
+                         *EXPERIENCE_END_KEYWORDS}
+        self._section_words = re.compile('|'.join(map(re.escape, sorted(section_words))))
+
+    def _compile_skill_lexicon(self):
+        """
+        Compile tech_skills once into a single scanner. A skill is found when
+        it occurs as a whole word, or followed by ".js" or " certified" (the
+        three patterns extract_skills used to search for one skill at a time).
+        """
+        skills = sorted({skill for skills in self.tech_skills.values() for skill in skills}, key=len, reverse=True)
+        # Both branches are zero-width so overlapping mentions are all seen. The first
+        # gives the longest skill starting at a word boundary and ending on one, the
+        # second a ".js" / " certified" suffix; the skill then ends right before it
+        self._skill_scanner = re.compile(
+            r'\b(?=(' + '|'.join(map(re.escape, skills)) + r')\b)|(?=(\.js| certified)\b)'
+        )
+        # Shorter skills that can match at the same position ("gitlab ci" -> "gitlab")
+        self._shorter_skills = {
+            skill: [(other, re.compile(rf'\b{re.escape(other)}\b')) for other in skills
+                    if other != skill and skill.startswith(other)]
+            for skill in skills
+        }
+        self._skills_by_last_char: Dict[str, List[str]] = {}
+        for skill in skills:
+            self._skills_by_last_char.setdefault(skill[-1], []).append(skill)
+
+    def extract_text_from_pdf(self, source: Source, processes: int = 1) -> str:
+        """Extract text from PDF file; long PDFs are split across `processes` processes"""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            return "".join(f"{text}\n" for text in pdf_page_texts(source, processes))
         except Exception as e:
             print(f"Error reading PDF: {e}")
             return ""
+
+    def iter_pdf_pages(self, source: Source) -> Iterator[str]:
+        """Text of each page of a PDF as soon as it is extracted"""
+        try:
+            for page in PyPDF2.PdfReader(as_binary_file(source)).pages:
+                yield page.extract_text()
+        except Exception as e:
+            print(f"Error reading PDF: {e}")
     
-    def extract_text_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
+    def extract_text_from_docx(self, source: Source) -> str:
+        """Extract text from DOCX file, including tables, text boxes, headers and footers"""
         try:
-            doc = docx.Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return "".join(f"{text}\n" for text in docx_paragraphs(source))
         except Exception as e:
             print(f"Error reading DOCX: {e}")
             return ""
     
-    def extract_text(self, file_path: str, file_type: str) -> str:
+    def extract_text(self, source: Source, file_type: str, processes: int = 1) -> str:
         """Extract text based on file type"""
         if file_type.lower() == 'pdf':
-            return self.extract_text_from_pdf(file_path)
+            return self.extract_text_from_pdf(source, processes)
         elif file_type.lower() == 'docx':
-            return self.extract_text_from_docx(file_path)
+            return self.extract_text_from_docx(source)
         else:
             return ""
     
@@ -129,120 +306,149 @@ class EnhancedResumeParser:
     def extract_skills(self, text: str) -> Dict[str, List[str]]:
         """Extract technical skills with improved categorization"""
         text_lower = text.lower()
+        mentioned = set()
+
+        for match in self._skill_scanner.finditer(text_lower):
+            skill, suffix = match.groups()
+            position = match.start()
+            if skill:
+                mentioned.add(skill)
+                for other, pattern in self._shorter_skills[skill]:
+                    if other not in mentioned and pattern.match(text_lower, position):
+                        mentioned.add(other)
+            elif position:
+                for other in self._skills_by_last_char.get(text_lower[position - 1], ()):
+                    if text_lower.endswith(other, 0, position):
+                        mentioned.add(other)
+
         found_skills = {}
-        
         for category, skills in self.tech_skills.items():
             found_skills[category] = []
             for skill in skills:
-                # More flexible matching
-                skill_patterns = [
-                    rf'\b{re.escape(skill)}\b',
-                    rf'{re.escape(skill)}\.js\b',  # For JavaScript frameworks
-                    rf'{re.escape(skill)} certified\b'  # For certifications
-                ]
-                
-                for pattern in skill_patterns:
-                    if re.search(pattern, text_lower):
-                        skill_name = skill.replace('_', ' ').title()
-                        if skill_name not in found_skills[category]:
-                            found_skills[category].append(skill_name)
-                        break
-        
+                if skill in mentioned:
+                    skill_name = skill.replace('_', ' ').title()
+                    if skill_name not in found_skills[category]:
+                        found_skills[category].append(skill_name)
+
         return found_skills
     
-    def extract_education(self, text: str) -> List[Dict[str, str]]:
-        """Extract education information"""
-        education_list = []
+    def segment(self, text: str) -> ResumeLayout:
+        """
+        Classify every line once and find the education and experience
+        sections. A section opens at the first line mentioning one of its
+        keywords and closes at the next line that mentions another
+        section's keyword; lines mentioning its own keywords are skipped.
+        The education extractor also reads everything above its heading.
+        """
         lines = text.split('\n')
-        
-        education_section_found = False
+        lowered, kinds = [], []
+        education, experience = [], []
+        in_education = in_experience = education_closed = experience_closed = False
+
         for i, line in enumerate(lines):
             line_lower = line.lower().strip()
-            
-            # Check if we're in education section
-            if any(keyword in line_lower for keyword in ['education', 'academic']):
-                education_section_found = True
+            lowered.append(line_lower)
+
+            # Most lines mention no section at all; one search rules them out
+            mentions_section = bool(self._section_words.search(line_lower))
+            education_heading = experience_heading = ends_education = ends_experience = False
+            if mentions_section:
+                education_heading = any(keyword in line_lower for keyword in EDUCATION_KEYWORDS)
+                experience_heading = any(keyword in line_lower for keyword in self.experience_keywords)
+                ends_education = any(keyword in line_lower for keyword in EDUCATION_END_KEYWORDS)
+                ends_experience = any(keyword in line_lower for keyword in EXPERIENCE_END_KEYWORDS)
+
+            if not line_lower:
+                kinds.append('blank')
+            elif DATED_LINE_PATTERN.search(line):
+                kinds.append('dated')
+            elif line.startswith(BULLET_PREFIXES):
+                kinds.append('bullet')
+            elif mentions_section:
+                kinds.append('heading')
+            else:
+                kinds.append('other')
+
+            if not education_closed:
+                if education_heading:
+                    in_education = True
+                elif in_education and ends_education:
+                    education_closed = True
+                else:
+                    education.append(i)
+
+            if not experience_closed:
+                if experience_heading:
+                    in_experience = True
+                elif in_experience and ends_experience:
+                    experience_closed = True
+                elif in_experience and line_lower:
+                    experience.append(i)
+
+        return ResumeLayout(
+            lines=lines,
+            lowered=lowered,
+            kinds=kinds,
+            education=ResumeSection(education),
+            experience=ResumeSection(experience),
+        )
+
+    def extract_education(self, text: str, layout: Optional[ResumeLayout] = None) -> List[Dict[str, str]]:
+        """Extract education information"""
+        layout = layout or self.segment(text)
+        lines, lowered = layout.lines, layout.lowered
+        education_list = []
+
+        for i in layout.education.lines:
+            if not DEGREE_PATTERN.search(lowered[i]):
                 continue
-            
-            # Stop if we hit another major section
-            if education_section_found and any(keyword in line_lower for keyword in ['experience', 'skills', 'projects']):
-                break
-            
-            # Look for degree patterns
-            degree_patterns = [
-                r'(bachelor|master|phd|doctorate|b\.s\.|b\.a\.|m\.s\.|m\.a\.|ph\.d\.)',
-                r'(computer science|software engineering|information technology|engineering)'
-            ]
-            
-            for pattern in degree_patterns:
-                if re.search(pattern, line_lower):
-                    # Extract year if present
-                    year_pattern = r'(19|20)\d{2}'
-                    years = re.findall(year_pattern, line)
-                    
-                    education_entry = {
-                        'degree': line.strip(),
-                        'year': years[-1] if years else '',
-                        'institution': ''
-                    }
-                    
-                    # Look for institution in nearby lines
-                    for j in range(max(0, i-2), min(len(lines), i+3)):
-                        if 'university' in lines[j].lower() or 'college' in lines[j].lower():
-                            education_entry['institution'] = lines[j].strip()
-                            break
-                    
-                    education_list.append(education_entry)
+            # Extract year if present
+            years = YEAR_PATTERN.findall(lines[i])
+            education_entry = {
+                'degree': lines[i].strip(),
+                'year': years[-1] if years else '',
+                'institution': ''
+            }
+
+            # Look for institution in nearby lines
+            for j in range(max(0, i-2), min(len(lines), i+3)):
+                if 'university' in lowered[j] or 'college' in lowered[j]:
+                    education_entry['institution'] = lines[j].strip()
                     break
-        
+
+            education_list.append(education_entry)
+
         return education_list
-    
-    def extract_experience(self, text: str) -> List[Dict[str, str]]:
+
+    def extract_experience(self, text: str, layout: Optional[ResumeLayout] = None) -> List[Dict[str, str]]:
         """Extract work experience"""
+        layout = layout or self.segment(text)
         experience_list = []
-        lines = text.split('\n')
-        
-        experience_section_found = False
         current_job = {}
-        
-        for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            
-            # Check if we're in experience section
-            if any(keyword in line_lower for keyword in self.experience_keywords):
-                experience_section_found = True
-                continue
-            
-            # Stop if we hit another major section
-            if experience_section_found and any(keyword in line_lower for keyword in ['education', 'skills', 'projects', 'certifications']):
+
+        for i in layout.experience.lines:
+            line, kind = layout.lines[i], layout.kinds[i]
+            # Look for job titles and companies
+            # Common patterns: "Software Engineer at Google", "Google - Software Engineer"
+            if kind == 'dated' or ' at ' in line or ' - ' in line:
                 if current_job:
                     experience_list.append(current_job)
-                break
-            
-            if experience_section_found and line.strip():
-                # Look for job titles and companies
-                # Common patterns: "Software Engineer at Google", "Google - Software Engineer"
-                if ' at ' in line or ' - ' in line or re.search(r'\d{4}.*\d{4}', line):
-                    if current_job:
-                        experience_list.append(current_job)
-                    
-                    # Extract dates
-                    date_pattern = r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|\d{1,2}/|\d{4})'
-                    dates = re.findall(date_pattern, line)
-                    
-                    current_job = {
-                        'title': line.strip(),
-                        'company': '',
-                        'dates': ' '.join(dates) if dates else '',
-                        'description': ''
-                    }
-                elif current_job and line.startswith(('•', '-', '*')):
-                    # Add bullet points to description
-                    current_job['description'] += line.strip() + '\n'
-        
+
+                # Extract dates
+                dates = DATE_PATTERN.findall(line)
+                current_job = {
+                    'title': line.strip(),
+                    'company': '',
+                    'dates': ' '.join(dates) if dates else '',
+                    'description': ''
+                }
+            elif current_job and kind == 'bullet':
+                # Add bullet points to description
+                current_job['description'] += line.strip() + '\n'
+
         if current_job:
             experience_list.append(current_job)
-        
+
         return experience_list
     
     def extract_certifications(self, text: str) -> List[str]:
@@ -318,18 +524,63 @@ class EnhancedResumeParser:
             'ats_compatible': score >= 70
         }
     
-    def parse_resume(self, file_path: str, file_type: str) -> Dict:
+    def parse_resume(self, source: Source, file_type: str) -> Dict:
         """Enhanced resume parsing with comprehensive data extraction"""
-        text = self.extract_text(file_path, file_type)
+        text = self.extract_text(source, file_type)
         
         if not text:
             return {"error": "Could not extract text from file"}
-        
+
+        return self.parse_text(text)
+
+    def parse_resume_stream(self, source: Source, file_type: str) -> Iterator[Dict]:
+        """parse_resume() that reports contact info and skills page by page (see parse_pages)"""
+        if file_type.lower() == 'pdf':
+            yield from self.parse_pages(self.iter_pdf_pages(source))
+        else:
+            yield self.parse_resume(source, file_type)
+
+    def parse_pages(self, pages: Iterable[str]) -> Iterator[Dict]:
+        """
+        Partial results while page texts arrive, then the full parse.
+
+        After each page a {"partial": True, "pages": n, "contact_info", "skills"}
+        preview with everything found so far; contact fields keep the first
+        page they were found on, so the final parse (which searches the whole
+        text) can differ from the preview. The last item is the parse_text()
+        result of all pages, or the usual error when there was no text.
+        """
+        texts = []
+        contact_info = {}
+        skills = {category: [] for category in self.tech_skills}
+        for page in pages:
+            texts.append(f"{page}\n")
+            for field, value in self.extract_contact_info(page).items():
+                if not contact_info.get(field):
+                    contact_info[field] = value
+            for category, found in self.extract_skills(page).items():
+                skills[category].extend(skill for skill in found if skill not in skills[category])
+            yield {
+                "partial": True,
+                "pages": len(texts),
+                "contact_info": dict(contact_info),
+                "skills": {category: list(found) for category, found in skills.items()},
+            }
+
+        text = "".join(texts)
+        if not text:
+            yield {"error": "Could not extract text from file"}
+            return
+        yield self.parse_text(text)
+
+    def parse_text(self, text: str) -> Dict:
+        """Extract every field from the text of a resume"""
         # Extract all components
+        layout = self.segment(text)
         contact_info = self.extract_contact_info(text)
         skills = self.extract_skills(text)
-        education = self.extract_education(text)
-        experience = self.extract_experience(text)
+        education = self.extract_education(text, layout)
+        experience = self.extract_experience(text, layout)
         certifications = self.extract_certifications(text)
         
         # Calculate experience years (improved)
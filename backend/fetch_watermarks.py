@@ -0,0 +1,78 @@
+from typing import Dict, List, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from .database import FetchWatermark
+import math
+
+# Re-fetch this much before the watermark so postings indexed late by the
+# source are not missed
+WATERMARK_OVERLAP = timedelta(days=1)
+
+
+def as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value and value.tzinfo:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def max_days_old(watermark: Optional[datetime], now: Optional[datetime] = None) -> Optional[int]:
+    """Freshness window (whole days) that still covers everything after the watermark"""
+    if watermark is None:
+        return None
+    now = now or datetime.utcnow()
+    return max(1, math.ceil((now - watermark + WATERMARK_OVERLAP) / timedelta(days=1)))
+
+
+def is_seen(job: Dict, watermark: Optional[datetime]) -> bool:
+    """
+    True if the job is older than the overlap before the watermark. Jobs
+    inside the overlap are kept: the source may have indexed them after the
+    previous run, and the content hash diff skips the ones already stored.
+    """
+    posted_date = as_naive_utc(job.get("posted_date"))
+    return bool(watermark and posted_date and posted_date < watermark - WATERMARK_OVERLAP)
+
+
+class WatermarkStore:
+    """Newest posted_date seen per (source, query), so runs only transfer new postings"""
+
+    def load(self, db: Session, sources: List[str], queries: List[str]) -> Dict[Tuple[str, str], datetime]:
+        return {
+            (mark.source, mark.query): mark.newest_posted_date
+            for mark in db.query(FetchWatermark).filter(
+                FetchWatermark.source.in_(sources),
+                FetchWatermark.query.in_(queries)
+            )
+            if mark.newest_posted_date
+        }
+
+    def update(self, db: Session, page_results: List[Tuple[object, Union[List[Dict], Exception]]]) -> int:
+        """Advance watermarks from successfully fetched pages; returns how many moved"""
+        now = datetime.utcnow()
+        newest: Dict[Tuple[str, str], datetime] = {}
+        for request, result in page_results:
+            if isinstance(result, Exception):
+                continue
+            key = (request.source, request.query)
+            for job in result:
+                posted_date = as_naive_utc(job.get("posted_date"))
+                if posted_date and posted_date > now:
+                    # A bad source date must not push the watermark into the future
+                    posted_date = now
+                if posted_date and (key not in newest or posted_date > newest[key]):
+                    newest[key] = posted_date
+
+        advanced = 0
+        for (source, query), posted_date in newest.items():
+            mark = db.query(FetchWatermark).filter(
+                FetchWatermark.source == source,
+                FetchWatermark.query == query
+            ).first()
+            if not mark:
+                mark = FetchWatermark(source=source, query=query)
+                db.add(mark)
+            if not mark.newest_posted_date or posted_date > mark.newest_posted_date:
+                mark.newest_posted_date = posted_date
+                advanced += 1
+        db.commit()
+        return advanced
@@ -1,5 +1,7 @@
-from database import SessionLocal, JobPosting
-from job_api_service import JobAPIService
+# Run from the repository root: python -m backend.fix_jobs
+from backend.database import SessionLocal, JobPosting
+from backend.job_api_service import JobAPIService
+from backend.job_retention import apply_retention, RETENTION_DAYS
 from datetime import datetime, timedelta
 
 print("=" * 70)
@@ -17,14 +19,10 @@ try:
     print(f"   Total jobs: {total_jobs}")
     print(f"   Active jobs: {active_jobs}")
     
-    # Step 2: Deactivate old jobs (older than 30 days)
+    # Step 2: Archive old jobs (same retention policy as the scheduler)
     print("\n🧹 Step 2: Cleaning up old jobs...")
-    cutoff_date = datetime.now() - timedelta(days=30)
-    old_jobs = db.query(JobPosting).filter(
-        JobPosting.posted_date < cutoff_date
-    ).update({"is_active": False})
-    db.commit()
-    print(f"   ✅ Deactivated {old_jobs} old jobs (>30 days)")
+    report = apply_retention(db)
+    print(f"   ✅ Archived {report['archived']} and deactivated {report['deactivated']} old jobs (>{RETENTION_DAYS} days)")
     
     # Step 3: Fetch fresh jobs from Adzuna
     print("\n📥 Step 3: Fetching fresh jobs from Adzuna...")
@@ -44,9 +42,9 @@ try:
     total_fetched = 0
     for query in search_queries:
         print(f"   Searching: {query}...")
-        jobs = service.fetch_and_store_jobs(query, "UK", results_per_page=50)
-        total_fetched += len(jobs)
-        print(f"   ✅ Found {len(jobs)} jobs")
+        report = service.fetch_and_store_jobs(db, query, "United Kingdom", max_jobs=50)
+        total_fetched += report["jobs_fetched"]
+        print(f"   ✅ Found {report['jobs_fetched']} jobs, {report['jobs_added']} new")
     
     print(f"\n   Total jobs fetched: {total_fetched}")
     
@@ -0,0 +1,286 @@
+"""
+Bulk import of job postings from JSONL or CSV files, for seeding new
+environments and loading partner feeds.
+
+The file is streamed in chunks. Worker processes parse, normalize and
+enrich each chunk (skills, experience level, content hash, MinHash
+signature) while the main process writes the previous chunk with the
+pipeline's batched INSERT ... ON CONFLICT upserts. Progress is
+checkpointed after every committed chunk, so an interrupted import picks
+up where it stopped when run again with the same arguments.
+
+Records are either in our job dict shape (external_id, title,
+company_name, location, description, salary_min, salary_max,
+posted_date, apply_url, ...) or raw items of a registered job source
+(--parser adzuna / jsearch).
+
+Usage (from the repository root):
+    python -m backend.import_jobs partner_feed.jsonl --source partner
+    python -m backend.import_jobs adzuna_dump.jsonl --parser adzuna --workers 8
+    python -m backend.import_jobs jobs.csv --restart
+"""
+from typing import Dict, Iterator, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+import argparse
+import csv
+import json
+import os
+import time
+
+DEFAULT_CHUNK_SIZE = 2000
+
+_worker_pipeline = None
+_worker_options: Dict = {}
+
+
+def detect_format(path: str, file_format: Optional[str] = None) -> str:
+    return file_format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+
+
+def read_records(path: str, file_format: Optional[str] = None) -> Iterator[Dict]:
+    """Stream records from a JSONL or CSV file"""
+    if detect_format(path, file_format) == "jsonl":
+        for record, _ in read_jsonl(path):
+            yield record
+        return
+    with open(path, newline="", encoding="utf-8") as f:
+        for record in csv.DictReader(f):
+            yield {key: value for key, value in record.items() if value not in ("", None)}
+
+
+def read_jsonl(path: str, offset: int = 0) -> Iterator[Tuple[Dict, int]]:
+    """JSONL records starting at a byte offset, each with the offset just past its line"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            offset += len(line)
+            if line.strip():
+                yield json.loads(line), offset
+
+
+def chunked(records: Iterator, size: int) -> Iterator[List]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _coerce(record: Dict, default_source: Optional[str]) -> Dict:
+    """Text values from files -> the types the pipeline expects"""
+    record = dict(record)
+    if isinstance(record.get("posted_date"), str):
+        try:
+            record["posted_date"] = datetime.fromisoformat(record["posted_date"].replace("Z", "+00:00"))
+        except ValueError:
+            record["posted_date"] = None
+    for column in ("salary_min", "salary_max"):
+        if isinstance(record.get(column), str):
+            try:
+                record[column] = float(record[column])
+            except ValueError:
+                record[column] = None
+    if isinstance(record.get("requirements"), str) and record["requirements"].startswith("["):
+        try:
+            record["requirements"] = json.loads(record["requirements"])
+        except ValueError:
+            pass
+    if default_source and not record.get("source"):
+        record["source"] = default_source
+    return record
+
+
+def _init_worker(parser: Optional[str], default_source: Optional[str], signatures: bool):
+    global _worker_pipeline, _worker_options
+    from backend.job_api_service import JobAPIService
+    from backend.job_ingestion import JobIngestionPipeline
+
+    _worker_pipeline = JobIngestionPipeline(JobAPIService())
+    _worker_options = {"parser": parser, "default_source": default_source, "signatures": signatures}
+
+
+def prepare_chunk(records: List[Dict]) -> Tuple[List[Dict], Dict[str, List[int]], int]:
+    """
+    Worker side: parse -> normalize -> enrich -> MinHash. Returns the rows,
+    their signatures by external_id and how many records were unusable.
+    """
+    from backend.job_dedup import minhash, shingles
+    from backend.job_sources import get_source
+
+    pipeline = _worker_pipeline
+    parser = _worker_options.get("parser")
+    if parser:
+        source = get_source(parser)
+        jobs = [source.parse_item(pipeline.api_service, record) for record in records]
+    else:
+        jobs = [_coerce(record, _worker_options.get("default_source")) for record in records]
+
+    rows = pipeline.enrich(pipeline.normalize(jobs))
+    signatures = {}
+    if _worker_options.get("signatures"):
+        # The most CPU heavy step of an import, so it is done here rather than by the writer
+        signatures = {
+            row["external_id"]: minhash(shingles(row["title"], row["company_name"], row["description"]))
+            for row in rows
+        }
+    return rows, signatures, len(records) - len(rows)
+
+
+class ImportCheckpoint:
+    """
+    Records committed so far, stored next to the input file. For JSONL the
+    byte offset after the last committed record is kept too, so a resumed
+    import seeks straight to it; CSV is re-read and the committed records
+    are skipped.
+    """
+
+    def __init__(self, input_path: str, path: Optional[str] = None):
+        self.input_path = os.path.abspath(input_path)
+        self.path = path or f"{input_path}.import-state.json"
+        stat = os.stat(input_path)
+        self.fingerprint = {"input": self.input_path, "size": stat.st_size, "mtime": stat.st_mtime}
+
+    def load(self) -> Tuple[Dict, Optional[int]]:
+        """Totals and byte offset of the interrupted run, or ({}, None) to start from the beginning"""
+        if not os.path.exists(self.path):
+            return {}, None
+        with open(self.path) as f:
+            state = json.load(f)
+        if {key: state.get(key) for key in self.fingerprint} != self.fingerprint:
+            print(f"⚠️  {self.path} belongs to a different version of the input, starting over")
+            return {}, None
+        return state.get("totals", {}), state.get("offset")
+
+    def save(self, totals: Dict, offset: Optional[int] = None):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(dict(self.fingerprint, totals=totals, offset=offset), f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def import_file(
+    db,
+    path: str,
+    file_format: Optional[str] = None,
+    parser: Optional[str] = None,
+    default_source: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    restart: bool = False,
+    dedupe: bool = True
+) -> Dict:
+    from backend.job_api_service import JobAPIService
+    from backend.job_ingestion import JobIngestionPipeline
+
+    pipeline = JobIngestionPipeline(JobAPIService(), batch_size=chunk_size)
+    checkpoint = ImportCheckpoint(path)
+    if restart:
+        checkpoint.clear()
+    totals = {"records": 0, "added": 0, "updated": 0, "unchanged": 0, "skipped": 0, "duplicates": 0}
+    saved, offset = checkpoint.load()
+    totals.update(saved)
+    skip = totals["records"]
+    if skip:
+        print(f"↪️  Resuming after {skip} records already imported")
+
+    # (record, byte offset after it); offsets are only known for JSONL
+    if detect_format(path, file_format) == "jsonl":
+        if skip and offset is None:
+            records = islice(read_jsonl(path), skip, None)
+        else:
+            records = read_jsonl(path, offset or 0)
+    else:
+        records = ((record, None) for record in islice(read_records(path, file_format), skip, None))
+
+    started = time.perf_counter()
+    processed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(parser, default_source, dedupe)) as pool:
+        # Results come back in input order, so the checkpoint always marks a prefix of the file
+        chunks = (
+            ([record for record, _ in chunk], chunk[-1][1])
+            for chunk in chunked(records, chunk_size)
+        )
+        for (rows, signatures, unusable), size, offset in _ordered(pool, chunks):
+            to_write, counts = pipeline.diff(db, rows)
+            pipeline.upsert(db, to_write)
+            if dedupe:
+                totals["duplicates"] += pipeline.link_duplicates(
+                    db, [row["external_id"] for row in to_write], signatures
+                )
+
+            processed += size
+            totals["records"] += size
+            totals["skipped"] += unusable
+            for key in ("added", "updated", "unchanged"):
+                totals[key] += counts[key]
+            checkpoint.save(totals, offset)
+
+            elapsed = time.perf_counter() - started
+            print(
+                f"  {totals['records']} records, +{totals['added']} ~{totals['updated']} "
+                f"={totals['unchanged']} | {processed / elapsed:.0f} rows/sec"
+            )
+
+    elapsed = time.perf_counter() - started
+    checkpoint.clear()
+    return dict(totals, seconds=round(elapsed, 2), rows_per_sec=round(processed / elapsed) if elapsed else 0)
+
+
+def _ordered(pool: ProcessPoolExecutor, chunks: Iterator[Tuple[List[Dict], object]], ahead: int = 4):
+    """
+    Submit (records, tag) chunks to the pool while earlier results are
+    being written, keeping at most `ahead` chunks in flight so memory stays
+    bounded. Yields (result, chunk size, tag) in input order.
+    """
+    pending = deque()
+    for records, tag in chunks:
+        if len(pending) >= ahead:
+            future, size, done_tag = pending.popleft()
+            yield future.result(), size, done_tag
+        pending.append((pool.submit(prepare_chunk, records), len(records), tag))
+    while pending:
+        future, size, tag = pending.popleft()
+        yield future.result(), size, tag
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import job postings from JSONL or CSV")
+    parser.add_argument("path", help="Input .jsonl or .csv file")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from extension)")
+    parser.add_argument("--parser", help="Parse records as raw items of this job source (adzuna, jsearch)")
+    parser.add_argument("--source", help="Source name for records that do not set one")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Records per chunk and write batch")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and import from the start")
+    parser.add_argument("--no-dedupe", action="store_true", help="Skip near-duplicate linking")
+    args = parser.parse_args()
+
+    from backend.database import SessionLocal, create_tables
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        report = import_file(
+            db, args.path,
+            file_format=args.format, parser=args.parser, default_source=args.source,
+            workers=args.workers, chunk_size=args.chunk_size,
+            restart=args.restart, dedupe=not args.no_dedupe
+        )
+        print(json.dumps(report, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Background ingestion runs with per-query progress, polled or followed as
+server-sent events. Runs live in process memory, one active run per name.
+"""
+from typing import AsyncIterator, Callable, Dict, List, Optional
+from collections import OrderedDict
+from datetime import datetime
+import asyncio
+import json
+import threading
+import time
+import traceback
+import uuid
+
+# Finished runs kept for status lookups
+KEEP_FINISHED_RUNS = 20
+# SSE comment sent when nothing changed for this long, so proxies keep the stream open
+HEARTBEAT_SECONDS = 15.0
+
+
+class RunInProgress(Exception):
+    def __init__(self, run: "IngestionRun"):
+        super().__init__(f"{run.name} run {run.id} is already in progress")
+        self.run = run
+
+
+class IngestionRun:
+    """State of one run, updated from the worker thread and read by requests"""
+
+    def __init__(self, name: str, queries: List[str], trigger: str = "manual"):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.trigger = trigger  # manual or scheduled
+        self.status = "running"  # running, succeeded, failed
+        self.stage = "starting"
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.pages_planned = 0
+        self.pages_done = 0
+        self.queries = OrderedDict(
+            (query, {"pages_planned": 0, "pages_done": 0, "jobs": 0, "errors": 0, "seconds": 0.0})
+            for query in queries
+        )
+        self.report: Optional[Dict] = None
+        self.error: Optional[str] = None
+        # Bumped on every change so followers only send new snapshots
+        self.version = 0
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status != "running"
+
+    def _query(self, query: str) -> Dict:
+        return self.queries.setdefault(
+            query, {"pages_planned": 0, "pages_done": 0, "jobs": 0, "errors": 0, "seconds": 0.0}
+        )
+
+    def update(self, event: str, data: Dict):
+        """Progress callback for JobIngestionPipeline.run()"""
+        with self._lock:
+            if event == "plan":
+                for request in data["requests"]:
+                    self._query(request["query"])["pages_planned"] += 1
+                self.pages_planned = len(data["requests"])
+            elif event == "page":
+                progress = self._query(data["query"])
+                progress["pages_done"] += 1
+                progress["jobs"] += data["jobs"]
+                progress["errors"] += 1 if data["error"] else 0
+                progress["seconds"] = round(time.perf_counter() - self._started, 2)
+                self.pages_done += 1
+            elif event == "stage":
+                self.stage = data["stage"]
+            self.version += 1
+
+    def finish(self, report: Optional[Dict] = None, error: Optional[str] = None):
+        with self._lock:
+            self.status = "failed" if error else "succeeded"
+            self.stage = "done"
+            self.report = report
+            self.error = error
+            self.finished_at = datetime.utcnow()
+            self.version += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "run_id": self.id,
+                "name": self.name,
+                "trigger": self.trigger,
+                "status": self.status,
+                "stage": self.stage,
+                "started_at": self.started_at.isoformat(),
+                "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+                "elapsed_seconds": round(
+                    ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds(), 2
+                ),
+                "pages_planned": self.pages_planned,
+                "pages_done": self.pages_done,
+                "queries": [dict(progress, query=query) for query, progress in self.queries.items()],
+                "report": self.report,
+                "error": self.error,
+            }
+
+
+class IngestionRunRegistry:
+    """Active and recently finished runs of this process"""
+
+    def __init__(self, keep_finished: int = KEEP_FINISHED_RUNS):
+        self.keep_finished = keep_finished
+        self._runs: "OrderedDict[str, IngestionRun]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, run_id: str) -> Optional[IngestionRun]:
+        return self._runs.get(run_id)
+
+    def active(self, name: str) -> Optional[IngestionRun]:
+        return next((run for run in self._runs.values() if run.name == name and not run.finished), None)
+
+    def recent(self) -> List[IngestionRun]:
+        return list(reversed(self._runs.values()))
+
+    def _register(self, name: str, queries: List[str], trigger: str) -> IngestionRun:
+        with self._lock:
+            running = self.active(name)
+            if running:
+                raise RunInProgress(running)
+            run = IngestionRun(name, queries, trigger)
+            self._runs[run.id] = run
+            self._prune()
+        return run
+
+    def start(self, name: str, queries: List[str], target: Callable[[IngestionRun], Dict],
+              trigger: str = "manual") -> IngestionRun:
+        """
+        Start target(run) in a background thread and return the run at once.
+        Raises RunInProgress if a run with the same name is still active.
+        """
+        run = self._register(name, queries, trigger)
+        threading.Thread(target=self._execute, args=(run, target), name=f"ingestion-{run.id}", daemon=True).start()
+        return run
+
+    def run(self, name: str, queries: List[str], target: Callable[[IngestionRun], Dict],
+            trigger: str = "scheduled") -> IngestionRun:
+        """start() in the calling thread, for callers that are already in the background (the scheduler)"""
+        run = self._register(name, queries, trigger)
+        self._execute(run, target)
+        return run
+
+    def _execute(self, run: IngestionRun, target: Callable[[IngestionRun], Dict]):
+        try:
+            run.finish(report=target(run))
+        except Exception as e:
+            traceback.print_exc()
+            run.finish(error=f"{type(e).__name__}: {e}")
+        print(f"Ingestion run {run.id} ({run.name}) {run.status}")
+
+    def _prune(self):
+        finished = [run_id for run_id, run in self._runs.items() if run.finished]
+        for run_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._runs[run_id]
+
+    async def events(self, run_id: str, interval: float = 0.5) -> AsyncIterator[str]:
+        """Server-sent events: a "progress" snapshot per change, then one "done" event"""
+        run = self._runs[run_id]
+        sent_version = -1
+        quiet_since = time.monotonic()
+        while True:
+            version = run.version
+            if version != sent_version:
+                snapshot = run.snapshot()
+                sent_version = version
+                quiet_since = time.monotonic()
+                if run.finished:
+                    yield f"event: done\ndata: {json.dumps(snapshot)}\n\n"
+                    return
+                yield f"event: progress\ndata: {json.dumps(snapshot)}\n\n"
+            elif time.monotonic() - quiet_since > HEARTBEAT_SECONDS:
+                quiet_since = time.monotonic()
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(interval)
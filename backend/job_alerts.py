@@ -0,0 +1,246 @@
+from typing import List, Dict, Tuple, Set, Iterable
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import desc
+from sqlalchemy.orm import Session
+from .database import User, UserProfile, UserJobPreferences, JobAlert, JobAlertCandidate, JobPosting
+from .job_matching import JobMatchingEngine
+from .email_service import send_job_alert_email
+import json
+import re
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#.]+")
+
+# How long a user has to wait between digests for each frequency
+DIGEST_INTERVALS = {
+    "daily": timedelta(hours=20),
+    "weekly": timedelta(days=7),
+}
+
+
+def _as_list(value) -> List[str]:
+    """Preference columns hold either a JSON list or a JSON-encoded string of one"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = value.split(",")
+    if isinstance(value, str):
+        value = [value]
+    return [str(item).strip().lower() for item in value if str(item).strip()]
+
+
+def _tokens(text: str) -> Set[str]:
+    return set(TOKEN_PATTERN.findall((text or "").lower()))
+
+
+class AlertCriteria:
+    """Compiled criteria of one active job alert"""
+
+    def __init__(self, alert: JobAlert, preferences: UserJobPreferences = None):
+        self.alert_id = alert.id
+        self.user_id = alert.user_id
+        self.min_score = alert.min_match_score or 0
+        self.frequency = (preferences.notification_frequency if preferences else None) or "daily"
+        self.skills = set(_as_list(preferences.must_have_skills)) if preferences else set()
+        self.titles = _as_list(preferences.preferred_titles) if preferences else []
+        self.locations = _as_list(preferences.preferred_locations) if preferences else []
+
+    @property
+    def fields(self) -> Set[str]:
+        fields = set()
+        if self.skills:
+            fields.add("skills")
+        if self.titles:
+            fields.add("titles")
+        if self.locations:
+            fields.add("locations")
+        return fields
+
+
+class AlertPercolator:
+    """
+    Reverse index of stored alert criteria.
+
+    Instead of scoring every job against every user, each criterion is indexed
+    under the terms it cares about. A new job is looked up by its own terms and
+    only criteria whose every non-empty field (skills, titles, locations) was
+    hit become candidates. Criteria with no fields match every job and are
+    left to the min score check.
+    """
+
+    def __init__(self):
+        self.criteria: Dict[int, AlertCriteria] = {}
+        self._skill_index: Dict[str, Set[int]] = defaultdict(set)
+        # token -> [(alert_id, phrase)] so a token hit can be verified as a phrase match
+        self._title_index: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+        self._location_index: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+        self._match_all: Set[int] = set()
+
+    @classmethod
+    def from_db(cls, db: Session) -> "AlertPercolator":
+        """Compile all active alerts into a percolator"""
+        percolator = cls()
+        rows = db.query(JobAlert, UserJobPreferences).outerjoin(
+            UserJobPreferences, UserJobPreferences.user_id == JobAlert.user_id
+        ).filter(JobAlert.is_active == True).all()
+
+        for alert, preferences in rows:
+            percolator.add(AlertCriteria(alert, preferences))
+        return percolator
+
+    def add(self, criteria: AlertCriteria):
+        self.criteria[criteria.alert_id] = criteria
+
+        if not criteria.fields:
+            self._match_all.add(criteria.alert_id)
+            return
+
+        for skill in criteria.skills:
+            self._skill_index[skill].add(criteria.alert_id)
+        for phrase in criteria.titles:
+            for token in _tokens(phrase):
+                self._title_index[token].append((criteria.alert_id, phrase))
+        for phrase in criteria.locations:
+            for token in _tokens(phrase):
+                self._location_index[token].append((criteria.alert_id, phrase))
+
+    def __len__(self):
+        return len(self.criteria)
+
+    def _phrase_hits(self, index: Dict[str, List[Tuple[int, str]]], text: str) -> Set[int]:
+        text_lower = (text or "").lower()
+        hits = set()
+        for token in _tokens(text_lower):
+            for alert_id, phrase in index.get(token, ()):
+                if alert_id not in hits and phrase in text_lower:
+                    hits.add(alert_id)
+        return hits
+
+    def match(self, job: JobPosting) -> List[AlertCriteria]:
+        """Return the criteria a single job satisfies"""
+        field_hits: Dict[int, Set[str]] = defaultdict(set)
+
+        for skill in job.required_skills or []:
+            for alert_id in self._skill_index.get(str(skill).lower(), ()):
+                field_hits[alert_id].add("skills")
+        for alert_id in self._phrase_hits(self._title_index, job.title):
+            field_hits[alert_id].add("titles")
+        for alert_id in self._phrase_hits(self._location_index, job.location):
+            field_hits[alert_id].add("locations")
+
+        matched = [
+            self.criteria[alert_id]
+            for alert_id, hit in field_hits.items()
+            if hit >= self.criteria[alert_id].fields
+        ]
+        matched.extend(self.criteria[alert_id] for alert_id in self._match_all)
+        return matched
+
+    def percolate(self, jobs: Iterable[JobPosting]) -> Dict[int, List[Tuple[AlertCriteria, JobPosting]]]:
+        """Match a batch of jobs in one pass, grouped by user id"""
+        candidates = defaultdict(list)
+        for job in jobs:
+            for criteria in self.match(job):
+                candidates[criteria.user_id].append((criteria, job))
+        return candidates
+
+
+def queue_alert_candidates(
+    db: Session,
+    jobs: List[JobPosting],
+    matching_engine: JobMatchingEngine,
+    percolator: AlertPercolator = None
+) -> int:
+    """
+    Percolate newly ingested jobs against stored alerts and queue the ones
+    that clear each alert's min score. Only users with a criteria hit are
+    loaded and scored.
+    Returns the number of queued candidates.
+    """
+    if not jobs:
+        return 0
+
+    percolator = percolator or AlertPercolator.from_db(db)
+    if not len(percolator):
+        return 0
+
+    queued = 0
+    for user_id, matches in percolator.percolate(jobs).items():
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            continue
+        user_profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+        user_preferences = db.query(UserJobPreferences).filter(UserJobPreferences.user_id == user_id).first()
+
+        for criteria, job in matches:
+            overall_score, _ = matching_engine.calculate_match_score(
+                user, job, user_profile, user_preferences
+            )
+            if overall_score < criteria.min_score:
+                continue
+
+            db.add(JobAlertCandidate(
+                alert_id=criteria.alert_id,
+                user_id=user_id,
+                job_id=job.id,
+                match_score=overall_score,
+                frequency=criteria.frequency
+            ))
+            queued += 1
+
+    db.commit()
+    return queued
+
+
+async def send_pending_alerts(db: Session, frequency: str) -> int:
+    """
+    Deliver queued candidates for every alert with the given frequency.
+    Instant alerts go out straight away; daily and weekly ones are sent as a
+    digest once the alert's interval has passed since it was last sent.
+    Returns the number of emails sent.
+    """
+    now = datetime.utcnow()
+    pending = db.query(JobAlertCandidate).filter(
+        JobAlertCandidate.frequency == frequency,
+        JobAlertCandidate.sent_at == None
+    ).order_by(desc(JobAlertCandidate.match_score)).all()
+
+    by_alert = defaultdict(list)
+    for candidate in pending:
+        by_alert[candidate.alert_id].append(candidate)
+
+    sent = 0
+    for alert_id, candidates in by_alert.items():
+        alert = db.query(JobAlert).filter(JobAlert.id == alert_id).first()
+        if not alert or not alert.is_active:
+            continue
+
+        interval = DIGEST_INTERVALS.get(frequency)
+        if interval and alert.last_sent and now - alert.last_sent < interval:
+            continue
+
+        jobs_to_send = [
+            {
+                'title': candidate.job.title,
+                'company': candidate.job.company_name,
+                'location': candidate.job.location,
+                'match_score': round(candidate.match_score),
+                'apply_url': candidate.job.apply_url or '#'
+            }
+            for candidate in candidates
+            if candidate.job and candidate.job.is_active
+        ]
+
+        if jobs_to_send:
+            await send_job_alert_email(alert.email, jobs_to_send)
+            alert.last_sent = now
+            sent += 1
+
+        for candidate in candidates:
+            candidate.sent_at = now
+        db.commit()
+
+    return sent
@@ -3,6 +3,7 @@ import os
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 import json
+from .job_classifier import default_classifier
 
 class JobAPIService:
     """Service to fetch jobs from multiple APIs"""
@@ -13,6 +14,9 @@ class JobAPIService:
         self.adzuna_api_key = os.getenv("ADZUNA_API_KEY")
         self.jsearch_api_key = os.getenv("JSEARCH_API_KEY")
 
+        # Keep-alive connections are reused across calls instead of a new TLS handshake each time
+        self.session = requests.Session()
+
     
     def fetch_adzuna_jobs(
         self, 
@@ -45,7 +49,7 @@ class JobAPIService:
             print(f"Calling Adzuna: {url}")
             print(f"Params: {params}")
             
-            response = requests.get(url, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30)
             
             print(f"Status: {response.status_code}")
             print(f"Response: {response.text[:200]}")  # First 200 chars
@@ -53,37 +57,7 @@ class JobAPIService:
             response.raise_for_status()
             
             data = response.json()
-            jobs = []
-            
-            for job in data.get("results", []):
-                # Parse job created date properly
-                posted_date = None
-                if job.get("created"):
-                    try:
-                        posted_date = datetime.strptime(job.get("created"), "%Y-%m-%dT%H:%M:%SZ")
-                    except:
-                        try:
-                            # Try alternative format
-                            posted_date = datetime.fromisoformat(job.get("created").replace("Z", "+00:00"))
-                        except:
-                            posted_date = datetime.utcnow()
-                
-                parsed_job = {
-                    "title": job.get("title"),
-                    "company_name": job.get("company", {}).get("display_name", "Unknown") if isinstance(job.get("company"), dict) else str(job.get("company", "Unknown")),
-                    "location": job.get("location", {}).get("display_name", "") if isinstance(job.get("location"), dict) else str(job.get("location", "")),
-                    "description": job.get("description", ""),
-                    "salary_min": job.get("salary_min"),
-                    "salary_max": job.get("salary_max"),
-                    "external_id": str(job.get("id", "")),
-                    "source": "adzuna",
-                    "apply_url": job.get("redirect_url"),
-                    "posted_date": posted_date,
-                    "remote_type": self._detect_remote_type(job.get("description", "")),
-                    "employment_type": str(job.get("contract_type", "full-time")).lower(),
-                    "is_active": True
-                }
-                jobs.append(parsed_job)
+            jobs = [self.parse_adzuna_job(job) for job in data.get("results", [])]
             
             print(f"Successfully fetched {len(jobs)} jobs from Adzuna")
             return jobs
@@ -126,85 +100,95 @@ class JobAPIService:
                 "num_pages": str(num_pages)
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = self.session.get(url, headers=headers, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
-            jobs = []
-            
-            for job in data.get("data", []):
-                parsed_job = {
-                    "title": job.get("job_title"),
-                    "company_name": job.get("employer_name", "Unknown"),
-                    "company_logo_url": job.get("employer_logo"),
-                    "location": job.get("job_city") or job.get("job_country", ""),
-                    "description": job.get("job_description", ""),
-                    "requirements": job.get("job_highlights", {}).get("Qualifications", []),
-                    "salary_min": job.get("job_min_salary"),
-                    "salary_max": job.get("job_max_salary"),
-                    "external_id": job.get("job_id"),
-                    "source": "jsearch",
-                    "apply_url": job.get("job_apply_link"),
-                    "posted_date": datetime.fromtimestamp(job.get("job_posted_at_timestamp")) if job.get("job_posted_at_timestamp") else None,
-                    "remote_type": job.get("job_is_remote") and "remote" or "onsite",
-                    "employment_type": job.get("job_employment_type", "FULLTIME").lower(),
-                    "is_active": True
-                }
-                jobs.append(parsed_job)
-            
-            return jobs
+            return [self.parse_jsearch_job(job) for job in data.get("data", [])]
             
         except Exception as e:
             print(f"Error fetching JSearch jobs: {e}")
             return []
         
 
+    def parse_adzuna_job(self, job: Dict) -> Dict:
+        """Map one Adzuna result onto our job dict"""
+        # Parse job created date properly
+        posted_date = None
+        if job.get("created"):
+            try:
+                posted_date = datetime.strptime(job.get("created"), "%Y-%m-%dT%H:%M:%SZ")
+            except:
+                try:
+                    # Try alternative format
+                    posted_date = datetime.fromisoformat(job.get("created").replace("Z", "+00:00"))
+                except:
+                    posted_date = datetime.utcnow()
+        
+        return {
+            "title": job.get("title"),
+            "company_name": job.get("company", {}).get("display_name", "Unknown") if isinstance(job.get("company"), dict) else str(job.get("company", "Unknown")),
+            "location": job.get("location", {}).get("display_name", "") if isinstance(job.get("location"), dict) else str(job.get("location", "")),
+            "description": job.get("description", ""),
+            "salary_min": job.get("salary_min"),
+            "salary_max": job.get("salary_max"),
+            "salary_currency": "GBP",
+            "salary_period": "year",
+            "external_id": str(job.get("id", "")),
+            "source": "adzuna",
+            "apply_url": job.get("redirect_url"),
+            "posted_date": posted_date,
+            "remote_type": self._detect_remote_type(job.get("description", "")),
+            "employment_type": str(job.get("contract_type", "full-time")).lower(),
+            "is_active": True
+        }
+    
+    def parse_jsearch_job(self, job: Dict) -> Dict:
+        """Map one JSearch result onto our job dict"""
+        return {
+            "title": job.get("job_title"),
+            "company_name": job.get("employer_name", "Unknown"),
+            "company_logo_url": job.get("employer_logo"),
+            "location": job.get("job_city") or job.get("job_country", ""),
+            "description": job.get("job_description", ""),
+            "requirements": (job.get("job_highlights") or {}).get("Qualifications", []),
+            "salary_min": job.get("job_min_salary"),
+            "salary_max": job.get("job_max_salary"),
+            "salary_currency": job.get("job_salary_currency"),
+            "salary_period": job.get("job_salary_period"),
+            "external_id": job.get("job_id"),
+            "source": "jsearch",
+            "apply_url": job.get("job_apply_link"),
+            "posted_date": datetime.fromtimestamp(job.get("job_posted_at_timestamp")) if job.get("job_posted_at_timestamp") else None,
+            "remote_type": job.get("job_is_remote") and "remote" or "onsite",
+            "employment_type": (job.get("job_employment_type") or "FULLTIME").lower(),
+            "is_active": True
+        }
+
     def _detect_remote_type(self, description: str) -> str:
         """Detect if job is remote, hybrid, or onsite from description"""
-        description_lower = description.lower()
-        
-        if any(word in description_lower for word in ["fully remote", "100% remote", "remote work", "work from home"]):
-            return "remote"
-        elif any(word in description_lower for word in ["hybrid", "flexible working", "remote option"]):
-            return "hybrid"
-        else:
-            return "onsite"
+        return default_classifier.remote_type(description.lower())
     
     def extract_skills_from_description(self, description: str) -> List[str]:
         """Extract technical skills from job description"""
-        # Common tech skills to look for
-        tech_skills = [
-            'python', 'java', 'javascript', 'typescript', 'react', 'angular', 
-            'vue', 'node.js', 'django', 'flask', 'fastapi', 'spring', 'sql',
-            'mongodb', 'postgresql', 'mysql', 'aws', 'azure', 'gcp', 'docker',
-            'kubernetes', 'git', 'ci/cd', 'agile', 'scrum', 'rest api', 'graphql'
-        ]
-        
-        description_lower = description.lower()
-        found_skills = []
-        
-        for skill in tech_skills:
-            if skill in description_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        return default_classifier.skills(description.lower())
     
     def fetch_and_store_jobs(
         self,
+        db,
         query: str,
         location: str = "United Kingdom",
         max_jobs: int = 50
-    ) -> List[Dict]:
-        """Fetch jobs from all available sources"""
-        all_jobs = []
-        
-        # Fetch from Adzuna
-        adzuna_jobs = self.fetch_adzuna_jobs(query, location="gb", results_per_page=min(max_jobs, 20))
-        all_jobs.extend(adzuna_jobs)
-        
-        # # Fetch from JSearch if needed
-        # if len(all_jobs) < max_jobs and self.jsearch_api_key:
-        #     jsearch_jobs = self.fetch_jsearch_jobs(query, location=location)
-        #     all_jobs.extend(jsearch_jobs[:max_jobs - len(all_jobs)])
-        
-        return all_jobs
\ No newline at end of file
+    ) -> Dict:
+        """
+        Fetch one query from all configured sources and store the jobs
+        through the ingestion pipeline. Calls are planned and charged
+        against the monthly quotas like the scheduled runs. Returns the
+        run report.
+        """
+        from .job_ingestion import JobIngestionPipeline
+        from .job_sources import pages_needed
+        from .quota_planner import QueryPlanner
+
+        pipeline = JobIngestionPipeline(self, planner=QueryPlanner())
+        return pipeline.run_sync(db, [query], location, max_jobs, call_budget=pages_needed(max_jobs))
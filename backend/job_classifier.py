@@ -0,0 +1,92 @@
+"""
+Keyword classifiers for job postings: experience level, remote type and
+required skills.
+"""
+from typing import List, NamedTuple, Sequence
+
+SENIOR_KEYWORDS = [
+    'senior', 'sr.', 'lead', 'principal', 'staff', 'architect',
+    'head of', 'director', 'manager', 'expert', 'specialist',
+    '5+ years', '5-', '6+ years', '7+ years', '8+ years',
+    'experienced', 'advanced'
+]
+
+JUNIOR_KEYWORDS = [
+    'junior', 'jr.', 'entry', 'graduate', 'intern',
+    'associate', 'trainee', '0-2 years', '1-2 years',
+    'early career', 'beginner', 'starter'
+]
+
+REMOTE_KEYWORDS = ["fully remote", "100% remote", "remote work", "work from home"]
+HYBRID_KEYWORDS = ["hybrid", "flexible working", "remote option"]
+
+TECH_SKILLS = [
+    'python', 'java', 'javascript', 'typescript', 'react', 'angular',
+    'vue', 'node.js', 'django', 'flask', 'fastapi', 'spring', 'sql',
+    'mongodb', 'postgresql', 'mysql', 'aws', 'azure', 'gcp', 'docker',
+    'kubernetes', 'git', 'ci/cd', 'agile', 'scrum', 'rest api', 'graphql'
+]
+
+
+class JobClassification(NamedTuple):
+    experience_level: str
+    remote_type: str
+    skills: List[str]
+
+
+class JobTextClassifier:
+    """Frozen keyword tables for the three posting labels"""
+
+    def __init__(
+        self,
+        senior_keywords: Sequence[str] = SENIOR_KEYWORDS,
+        junior_keywords: Sequence[str] = JUNIOR_KEYWORDS,
+        remote_keywords: Sequence[str] = REMOTE_KEYWORDS,
+        hybrid_keywords: Sequence[str] = HYBRID_KEYWORDS,
+        skills: Sequence[str] = TECH_SKILLS
+    ):
+        self._senior = tuple(senior_keywords)
+        self._junior = tuple(junior_keywords)
+        self._remote = tuple(remote_keywords)
+        self._hybrid = tuple(hybrid_keywords)
+        self._skills = tuple(dict.fromkeys(skills))
+
+    def experience_level(self, text: str) -> str:
+        """'Senior', 'Junior' or 'Mid' for lowercased title + description"""
+        for keyword in self._senior:
+            if keyword in text:
+                return 'Senior'
+        for keyword in self._junior:
+            if keyword in text:
+                return 'Junior'
+        return 'Mid'
+
+    def remote_type(self, text: str) -> str:
+        """'remote', 'hybrid' or 'onsite' for a lowercased description"""
+        for keyword in self._remote:
+            if keyword in text:
+                return "remote"
+        for keyword in self._hybrid:
+            if keyword in text:
+                return "hybrid"
+        return "onsite"
+
+    def skills(self, text: str) -> List[str]:
+        """Skills mentioned in a lowercased description, in skill list order"""
+        return [skill for skill in self._skills if skill in text]
+
+    def classify(self, title: str, description: str) -> JobClassification:
+        """All three labels for one posting"""
+        description = (description or "").lower()
+        return JobClassification(
+            experience_level=self.experience_level((title or "").lower() + " " + description),
+            remote_type=self.remote_type(description),
+            skills=self.skills(description),
+        )
+
+
+default_classifier = JobTextClassifier()
+
+
+def classify_job(title: str, description: str = "") -> JobClassification:
+    return default_classifier.classify(title, description)
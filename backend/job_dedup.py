@@ -0,0 +1,165 @@
+"""
+Near-duplicate detection for job postings.
+
+The same vacancy is often posted several times under different
+external_ids (agencies, reposts). Each posting gets a MinHash signature
+over word shingles of title + company + description; signatures are cut
+into LSH bands and every band is stored as a bucket key in
+job_dedup_buckets. Canonical postings sharing a bucket are candidates, and a
+candidate whose estimated Jaccard similarity passes the threshold makes
+the new posting a duplicate of the candidate's canonical posting
+(JobPosting.duplicate_of_id). Lookups only touch the matching buckets,
+never the whole catalog.
+"""
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from .database import JobDedupBucket, JobPosting
+import hashlib
+import random
+import re
+import struct
+
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.8
+# Candidates compared per posting, best bucket overlap first
+MAX_CANDIDATES = 20
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: signatures are stored, so the permutations must never change
+_rng = random.Random(1337)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def shingles(title: str, company: str, description: str) -> Set[str]:
+    """Word n-grams of the posting text, lowercased and stripped of punctuation"""
+    words = _WORD_RE.findall(f"{title} {company} {description}".lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(features: Iterable[str]) -> List[int]:
+    """MinHash signature of a shingle set"""
+    hashes = [
+        struct.unpack("<I", hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest())[0]
+        for feature in features
+    ]
+    if not hashes:
+        return [_MAX_HASH] * NUM_PERMUTATIONS
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def similarity(signature_a: List[int], signature_b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / NUM_PERMUTATIONS
+
+
+def band_keys(signature: List[int]) -> List[str]:
+    """One bucket key per LSH band"""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f"<{ROWS_PER_BAND}I", *rows), digest_size=8).hexdigest()
+        keys.append(f"{band}:{digest}")
+    return keys
+
+
+def job_signature(job: JobPosting) -> List[int]:
+    return minhash(shingles(job.title or "", job.company_name or "", job.description or ""))
+
+
+def write_buckets(db: Session, job_id: int, keys: List[str]):
+    """Index a canonical posting under its band keys"""
+    db.execute(insert(JobDedupBucket.__table__), [{"bucket": key, "job_id": job_id} for key in keys])
+
+
+class NearDuplicateDetector:
+    """Assigns canonical postings to newly written jobs using the stored LSH buckets"""
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD, max_candidates: int = MAX_CANDIDATES):
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+
+    def _candidates(self, db: Session, keys: List[str], before_id: int) -> List[int]:
+        """Older canonical postings sharing a bucket, most shared bands first"""
+        shared = func.count(JobDedupBucket.id)
+        return [
+            job_id for job_id, _ in
+            db.query(JobDedupBucket.job_id, shared)
+            .filter(JobDedupBucket.bucket.in_(keys), JobDedupBucket.job_id < before_id)
+            .group_by(JobDedupBucket.job_id)
+            .order_by(shared.desc(), JobDedupBucket.job_id)
+            .limit(self.max_candidates)
+        ]
+
+    def process(self, db: Session, jobs: List[JobPosting],
+                signatures: Optional[Dict[str, List[int]]] = None) -> Dict:
+        """
+        Index `jobs` and link each one to the canonical posting it
+        duplicates, if any. The oldest posting of a cluster stays canonical.
+        `signatures` may hold precomputed MinHash signatures by external_id
+        (e.g. from import worker processes). Returns counts for the
+        ingestion report.
+
+        Only canonical postings are kept in the buckets, so bucket sizes
+        track the number of distinct vacancies rather than reposts.
+        """
+        signatures_by_external_id = signatures or {}
+        counts = {"checked": 0, "duplicates": 0}
+        if not jobs:
+            return counts
+
+        job_ids = [job.id for job in jobs]
+        # Content changed: drop the old buckets and re-index
+        db.query(JobDedupBucket).filter(JobDedupBucket.job_id.in_(job_ids)).delete(synchronize_session=False)
+
+        batch_signatures: Dict[int, List[int]] = {}
+        for job in sorted(jobs, key=lambda j: j.id):
+            signature = signatures_by_external_id.get(job.external_id) or job_signature(job)
+            job.minhash = signature
+            batch_signatures[job.id] = signature
+            keys = band_keys(signature)
+            counts["checked"] += 1
+
+            canonical_id = None
+            candidate_ids = self._candidates(db, keys, job.id)
+            if candidate_ids:
+                candidates = {
+                    candidate.id: candidate
+                    for candidate in db.query(JobPosting.id, JobPosting.minhash, JobPosting.duplicate_of_id)
+                    .filter(JobPosting.id.in_(candidate_ids))
+                }
+                for candidate_id in candidate_ids:
+                    candidate = candidates[candidate_id]
+                    candidate_signature = batch_signatures.get(candidate_id) or candidate.minhash
+                    if candidate_signature and similarity(signature, candidate_signature) >= self.threshold:
+                        canonical_id = candidate.duplicate_of_id or candidate_id
+                        break
+
+            job.duplicate_of_id = canonical_id
+            if canonical_id:
+                counts["duplicates"] += 1
+            else:
+                write_buckets(db, job.id, keys)
+
+        db.commit()
+        return counts
+
+
+def canonical_only(job_query):
+    """Restrict a JobPosting query to canonical postings"""
+    return job_query.filter(JobPosting.duplicate_of_id.is_(None))
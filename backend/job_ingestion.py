@@ -0,0 +1,468 @@
+from typing import Callable, List, Dict, Optional, Tuple
+from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from .database import ArchivedJobPosting, JobPosting
+from .job_api_service import JobAPIService
+from .job_matching import JobMatchingEngine
+from .job_alerts import queue_alert_candidates, send_pending_alerts
+from .job_dedup import NearDuplicateDetector
+from .job_classifier import classify_job, default_classifier
+from .job_normalization import NORMALIZED_COLUMNS, normalize_job
+from .job_sources import AsyncJobSourceClient, parse_payload
+from .fetch_watermarks import WatermarkStore
+from .response_archive import ResponseArchive
+from .quota_planner import QueryPlanner
+import asyncio
+import hashlib
+import json
+import time
+
+# Queries fetched by the scheduled runs
+SCHEDULED_QUERIES = [
+    "software developer",
+    "frontend developer",
+    "backend developer",
+    "full stack developer",
+    "python developer",
+    "junior developer",
+    "senior developer",
+    "data analyst",
+    "junior data analyst",
+    "senior data analyst",
+    "business analyst",
+    "data scientist",
+    "machine learning engineer",
+    "AI engineer",
+    "data engineer",
+]
+
+# Initial population also pulls lead roles
+INITIAL_QUERIES = SCHEDULED_QUERIES + ["lead developer"]
+
+# Columns written from the source data on insert and on update. Internal
+# tracking columns (view_count, is_featured, created_at, ...) are never touched.
+SOURCE_COLUMNS = [
+    "title", "company_name", "company_logo_url", "location", "remote_type",
+    "description", "requirements", "salary_min", "salary_max", "salary_currency",
+    "salary_period", "employment_type", "source", "apply_url", "posted_date",
+]
+ENRICHED_COLUMNS = ["experience_level", "required_skills"] + NORMALIZED_COLUMNS
+UPSERT_COLUMNS = SOURCE_COLUMNS + ENRICHED_COLUMNS + ["is_active", "content_hash"]
+
+# progress(event, data) callback of run(); see ingestion_runs.IngestionRun.update
+ProgressCallback = Callable[[str, Dict], None]
+
+# Part of every content hash. Bump it when skill / experience extraction
+# changes so the next run (or a replay) rewrites the enriched columns.
+ENRICHMENT_VERSION = 2
+
+
+def extract_experience_level(title: str, description: str = "") -> str:
+    """
+    Extract experience level from job title and description
+    Returns: 'Junior', 'Mid', or 'Senior'
+    """
+    return default_classifier.experience_level((title + " " + description).lower())
+
+
+def content_hash(row: Dict) -> str:
+    """sha256 over the normalized source fields of a job row"""
+    payload = [ENRICHMENT_VERSION] + [row.get(column) for column in SOURCE_COLUMNS]
+    return hashlib.sha256(json.dumps(payload, default=str).encode("utf-8")).hexdigest()
+
+
+def _upsert_statement(db: Session):
+    """INSERT ... ON CONFLICT (external_id) DO UPDATE for the session's dialect"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Bulk upsert is not supported on {dialect}")
+
+    stmt = insert(JobPosting.__table__)
+    update_columns = {column: stmt.excluded[column] for column in UPSERT_COLUMNS}
+    update_columns["updated_at"] = stmt.excluded["updated_at"]
+    return stmt.on_conflict_do_update(index_elements=["external_id"], set_=update_columns)
+
+
+class JobIngestionPipeline:
+    """
+    Single ingestion path shared by every entry point:
+    fetch -> normalize -> diff -> enrich -> bulk upsert -> near-duplicate
+    linking (-> alert percolation)
+    """
+
+    def __init__(
+        self,
+        api_service: JobAPIService,
+        matching_engine: Optional[JobMatchingEngine] = None,
+        batch_size: int = 500,
+        transport=None,
+        planner: Optional[QueryPlanner] = None,
+        archive: Optional[ResponseArchive] = None,
+        detector: Optional[NearDuplicateDetector] = None,
+        watermarks: Optional[WatermarkStore] = None
+    ):
+        self.api_service = api_service
+        self.detector = detector or NearDuplicateDetector()
+        self.matching_engine = matching_engine
+        self.planner = planner
+        # With watermarks, each (source, query) only pages until it reaches known postings
+        self.watermarks = watermarks
+        # Raw responses of every fetch are kept here for replay
+        self.archive = archive
+        self.batch_size = batch_size
+        # Optional httpx transport, e.g. to point the fetch stage at a stand-in server
+        self.transport = transport
+
+    async def fetch(
+        self,
+        db: Session,
+        queries: List[str],
+        location: str,
+        max_jobs: int,
+        call_budget: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Tuple[List[Dict], List, Dict[str, int]]:
+        """
+        Fetch raw parsed jobs concurrently over pooled connections.
+        With a planner, only the pages it picks within the quota budget are
+        requested. With watermarks, those pages are an upper bound: each
+        (source, query) asks only for postings newer than its watermark and
+        stops paging once it reaches them. Returns the jobs, the per-page
+        results and the HTTP calls sent per source (retries and hedges
+        included). `progress` gets a "plan" event with the page requests and a
+        "page" event as each page completes.
+        """
+        on_page = None
+        if progress:
+            def on_page(request, result):
+                failed = isinstance(result, Exception)
+                progress("page", {
+                    "source": request.source,
+                    "query": request.query,
+                    "page": request.page,
+                    "jobs": 0 if failed else len(result),
+                    "error": repr(result) if failed else None,
+                })
+
+        async with AsyncJobSourceClient(self.api_service, transport=self.transport, archive=self.archive,
+                                        on_page=on_page) as client:
+            sources = client.configured_sources()
+            if self.planner:
+                requests = self.planner.plan(db, sources, queries, call_budget)
+            else:
+                requests = client.build_requests(queries, max_jobs, sources)
+            if progress:
+                progress("plan", {"requests": [request._asdict() for request in requests]})
+
+            if self.watermarks:
+                marks = self.watermarks.load(db, sources, queries)
+                page_results = await client.fetch_incremental(requests, marks, location)
+            else:
+                page_results = await client.fetch_pages(requests, location)
+            calls_sent = client.calls_sent
+
+        jobs = []
+        per_query = {}
+        for request, result in page_results:
+            if isinstance(result, Exception):
+                continue
+            per_query[request.query] = per_query.get(request.query, 0) + len(result)
+            jobs.extend(result)
+        for query, count in per_query.items():
+            print(f"  ✅ {query}: {count} jobs")
+        return jobs, page_results, calls_sent
+
+    def normalize(self, jobs: List[Dict]) -> List[Dict]:
+        """Map source dicts onto JobPosting columns, dropping duplicates and unusable rows"""
+        rows = {}
+        for job_data in jobs:
+            external_id = job_data.get('external_id')
+            if not external_id or not job_data.get('title'):
+                continue
+
+            requirements = job_data.get('requirements') or ''
+            if isinstance(requirements, list):
+                requirements = "\n".join(str(item) for item in requirements)
+
+            posted_date = job_data.get('posted_date')
+            if posted_date and posted_date.tzinfo:
+                posted_date = posted_date.astimezone(timezone.utc).replace(tzinfo=None)
+
+            row = {
+                "external_id": str(external_id),
+                "title": job_data['title'],
+                "company_name": job_data.get('company_name') or 'Unknown',
+                "company_logo_url": job_data.get('company_logo_url'),
+                "location": job_data.get('location') or '',
+                "remote_type": job_data.get('remote_type') or 'onsite',
+                "description": job_data.get('description') or '',
+                "requirements": requirements,
+                "salary_min": int(job_data['salary_min']) if job_data.get('salary_min') else None,
+                "salary_max": int(job_data['salary_max']) if job_data.get('salary_max') else None,
+                "salary_currency": job_data.get('salary_currency') or 'GBP',
+                "salary_period": job_data.get('salary_period'),
+                "employment_type": job_data.get('employment_type') or 'full-time',
+                "source": job_data.get('source'),
+                "apply_url": job_data.get('apply_url'),
+                "posted_date": posted_date,
+                "is_active": True,
+            }
+            row["content_hash"] = content_hash(row)
+            rows[row["external_id"]] = row
+        return list(rows.values())
+
+    def enrich(self, rows: List[Dict]) -> List[Dict]:
+        """Add derived columns: required skills, experience level, normalized salary and company"""
+        for row in rows:
+            labels = classify_job(row["title"], row["description"])
+            row["required_skills"] = labels.skills
+            row["experience_level"] = labels.experience_level
+            normalize_job(row)
+        return rows
+
+    def diff(self, db: Session, rows: List[Dict], force: bool = False,
+             replaying: bool = False) -> Tuple[List[Dict], Dict]:
+        """
+        Split normalized rows into the ones that need writing and the ones
+        whose stored content hash already matches. Only external_id,
+        is_active, content_hash and posted_date are loaded, one query per
+        batch. Returns the rows to write and the counts.
+
+        When `replaying` archived responses, a response says nothing about
+        whether the posting is still live: rows keep their stored is_active
+        and postings already moved to job_postings_archive are skipped.
+        """
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "archived": 0}
+        new_external_ids = []
+        to_write = []
+        now = datetime.utcnow()
+        table = JobPosting.__table__
+
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            existing = {
+                row.external_id: row
+                for row in db.execute(
+                    select(table.c.external_id, table.c.is_active, table.c.content_hash, table.c.posted_date)
+                    .where(table.c.external_id.in_([r["external_id"] for r in batch]))
+                )
+            }
+            archived = set()
+            if replaying:
+                archived = {
+                    external_id for external_id, in db.execute(
+                        select(ArchivedJobPosting.external_id)
+                        .where(ArchivedJobPosting.external_id.in_([r["external_id"] for r in batch]))
+                    )
+                }
+
+            for row in batch:
+                current = existing.get(row["external_id"])
+                if current is None:
+                    if row["external_id"] in archived:
+                        counts["archived"] += 1
+                        continue
+                    row["posted_date"] = row["posted_date"] or now
+                    new_external_ids.append(row["external_id"])
+                    counts["added"] += 1
+                else:
+                    if replaying:
+                        row["is_active"] = current.is_active
+                    if not force and (current.is_active or replaying) and current.content_hash == row["content_hash"]:
+                        counts["unchanged"] += 1
+                        continue
+                    # Keep the stored date when the source does not send one
+                    row["posted_date"] = row["posted_date"] or current.posted_date
+                    counts["updated"] += 1
+                to_write.append(row)
+
+        counts["new_external_ids"] = new_external_ids
+        return to_write, counts
+
+    def upsert(self, db: Session, rows: List[Dict]):
+        """Write rows in batches with INSERT ... ON CONFLICT (external_id)"""
+        now = datetime.utcnow()
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            for row in batch:
+                row["created_at"] = now
+                row["updated_at"] = now
+            db.execute(_upsert_statement(db), batch)
+            db.commit()
+
+    def process(self, db: Session, raw_jobs: List[Dict], timings: Dict[str, float], force: bool = False,
+                replaying: bool = False) -> Dict:
+        """
+        normalize -> diff -> enrich -> upsert for already fetched jobs; adds
+        stage timings (to any already in `timings`). Jobs whose content hash
+        is unchanged are neither enriched nor written. `force` rewrites them
+        anyway.
+        """
+        def timed(stage: str, started: float):
+            timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+
+        started = time.perf_counter()
+        rows = self.normalize(raw_jobs)
+        timed("normalize", started)
+
+        started = time.perf_counter()
+        rows, counts = self.diff(db, rows, force, replaying)
+        timed("diff", started)
+
+        started = time.perf_counter()
+        rows = self.enrich(rows)
+        timed("enrich", started)
+
+        started = time.perf_counter()
+        self.upsert(db, rows)
+        timed("upsert", started)
+
+        started = time.perf_counter()
+        counts["duplicates"] = self.link_duplicates(db, [row["external_id"] for row in rows])
+        timed("dedup", started)
+        return counts
+
+    def link_duplicates(self, db: Session, external_ids: List[str],
+                        signatures: Optional[Dict[str, List[int]]] = None) -> int:
+        """Run near-duplicate detection over the jobs just written"""
+        duplicates = 0
+        for start in range(0, len(external_ids), self.batch_size):
+            jobs = db.query(JobPosting).filter(
+                JobPosting.external_id.in_(external_ids[start:start + self.batch_size])
+            ).all()
+            duplicates += self.detector.process(db, jobs, signatures)["duplicates"]
+        return duplicates
+
+    def _report(self, jobs_fetched: int, counts: Dict, timings: Dict[str, float], **extra) -> Dict:
+        report = {
+            "status": "success",
+            **extra,
+            "jobs_fetched": jobs_fetched,
+            "jobs_added": counts["added"],
+            "jobs_updated": counts["updated"],
+            "jobs_unchanged": counts["unchanged"],
+            "writes_avoided": counts["unchanged"],
+            "duplicates_linked": counts["duplicates"],
+            "timings": {stage: round(seconds, 3) for stage, seconds in timings.items()},
+        }
+        print(
+            f"Ingestion: fetched {report['jobs_fetched']}, added {report['jobs_added']}, "
+            f"updated {report['jobs_updated']}, skipped {report['writes_avoided']} unchanged "
+            f"timings={report['timings']}"
+        )
+        return report
+
+    async def run(
+        self,
+        db: Session,
+        queries: List[str],
+        location: str = "United Kingdom",
+        max_jobs: int = 20,
+        call_budget: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """
+        Run every stage and report counts and per-stage timings (seconds).
+        call_budget caps API calls per source when a planner is set; by
+        default the planner spreads the remaining monthly quota. `progress`
+        is called with ("stage", {"stage": ...}) when a stage starts, plus
+        the fetch events (see fetch()).
+        """
+        timings = {}
+        progress = progress or (lambda event, data: None)
+
+        progress("stage", {"stage": "fetch"})
+        started = time.perf_counter()
+        raw_jobs, page_results, calls_sent = await self.fetch(
+            db, queries, location, max_jobs, call_budget, progress
+        )
+        timings["fetch"] = time.perf_counter() - started
+
+        progress("stage", {"stage": "process", "jobs_fetched": len(raw_jobs)})
+        counts = self.process(db, raw_jobs, timings)
+
+        if self.planner:
+            self.planner.record_results(db, page_results, set(counts["new_external_ids"]), calls_sent=calls_sent)
+
+        watermarks_advanced = 0
+        if self.watermarks:
+            watermarks_advanced = self.watermarks.update(db, page_results)
+
+        alerts_queued = 0
+        if self.matching_engine and counts["new_external_ids"]:
+            progress("stage", {"stage": "alerts"})
+            started = time.perf_counter()
+            new_jobs = db.query(JobPosting).filter(
+                JobPosting.external_id.in_(counts["new_external_ids"]),
+                JobPosting.duplicate_of_id.is_(None)
+            ).all()
+            alerts_queued = queue_alert_candidates(db, new_jobs, self.matching_engine)
+            await send_pending_alerts(db, "instant")
+            timings["alerts"] = time.perf_counter() - started
+
+        # A run whose pages all failed must not look like a quiet day
+        pages_failed = sum(1 for _, result in page_results if isinstance(result, Exception))
+        status = "success"
+        if pages_failed:
+            status = "failed" if pages_failed == len(page_results) else "partial"
+
+        return self._report(len(raw_jobs), counts, timings, status=status, api_calls=len(page_results),
+                            http_calls=sum(calls_sent.values()), pages_failed=pages_failed,
+                            watermarks_advanced=watermarks_advanced, alerts_queued=alerts_queued)
+
+    def run_sync(self, db: Session, queries: List[str], location: str = "United Kingdom",
+                 max_jobs: int = 20, call_budget: Optional[int] = None,
+                 progress: Optional[ProgressCallback] = None) -> Dict:
+        """Blocking wrapper for the scheduler, scripts and background runs"""
+        return asyncio.run(self.run(db, queries, location, max_jobs, call_budget, progress))
+
+    def replay(
+        self,
+        db: Session,
+        archive: ResponseArchive,
+        source: Optional[str] = None,
+        query: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        force: bool = False
+    ) -> Dict:
+        """
+        Re-run normalize -> enrich -> upsert over archived raw responses,
+        e.g. after changing skill or experience extraction (bump
+        ENRICHMENT_VERSION or pass force=True). No API calls are made and
+        no alerts are sent. Replayed rows keep their stored is_active, and
+        postings retention has archived are not brought back.
+        """
+        timings = {"read_archive": 0.0}
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "archived": 0, "duplicates": 0}
+        jobs_fetched = pages = 0
+        chunk: List[Dict] = []
+
+        def flush():
+            for key, value in self.process(db, chunk, timings, force, replaying=True).items():
+                if key in counts:
+                    counts[key] += value
+            chunk.clear()
+
+        # Archived pages are processed a batch at a time, never all held at once
+        started = time.perf_counter()
+        for record in archive.records(source=source, since=since, until=until, query=query):
+            jobs = parse_payload(self.api_service, record["source"], record["payload"])
+            chunk.extend(jobs)
+            jobs_fetched += len(jobs)
+            pages += 1
+            if len(chunk) >= self.batch_size:
+                timings["read_archive"] += time.perf_counter() - started
+                flush()
+                started = time.perf_counter()
+        timings["read_archive"] += time.perf_counter() - started
+        if chunk:
+            flush()
+
+        return self._report(jobs_fetched, counts, timings, archived_pages=pages,
+                            jobs_skipped_archived=counts["archived"])
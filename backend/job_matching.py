@@ -1,6 +1,7 @@
 from typing import List, Dict, Tuple
 from sqlalchemy.orm import Session
 from .database import User, JobPosting, JobMatch, UserJobPreferences, UserProfile
+from .job_normalization import company_key, company_keys
 import json
 
 class JobMatchingEngine:
@@ -155,7 +156,8 @@ class JobMatchingEngine:
             return 50.0  # No salary info available
         
         user_min = user_preferences.minimum_salary
-        job_max = job.salary_max or job.salary_min
+        # Annual GBP when normalized at ingestion, raw values for older rows
+        job_max = job.salary_annual_max or job.salary_annual_min or job.salary_max or job.salary_min
         
         if not job_max:
             return 50.0
@@ -180,12 +182,9 @@ class JobMatchingEngine:
         
         # Check preferred companies
         if user_preferences.preferred_companies:
-            try:
-                preferred_companies = json.loads(user_preferences.preferred_companies)
-                if any(comp.lower() in job.company_name.lower() for comp in preferred_companies):
-                    score += 30.0
-            except:
-                pass
+            job_company = job.company_key or company_key(job.company_name) or ""
+            if any(key in job_company for key in company_keys(user_preferences.preferred_companies)):
+                score += 30.0
         
         # Check company size preference
         if user_preferences.company_sizes and job.company_size:
@@ -217,7 +216,11 @@ class JobMatchingEngine:
         
         
         # Get active jobs
-        jobs = db.query(JobPosting).filter(JobPosting.is_active == True).all()
+        # Near-duplicates of a posting are not scored again
+        jobs = db.query(JobPosting).filter(
+            JobPosting.is_active == True,
+            JobPosting.duplicate_of_id.is_(None)
+        ).all()
         
         # Score each job
         job_scores = []
@@ -0,0 +1,209 @@
+"""
+Normalized salary (annual amount in BASE_CURRENCY and a band) and company
+key columns for job postings.
+
+Rows ingested before these columns existed are filled in with:
+    python -m backend.job_normalization --backfill
+"""
+from typing import Dict, Optional, Tuple
+from functools import lru_cache
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+from .database import JobPosting
+import argparse
+import json
+import re
+
+BASE_CURRENCY = "GBP"
+
+# Units of BASE_CURRENCY per unit of each currency. Update these by hand;
+# salary bands are coarse enough that drift of a few percent does not matter.
+EXCHANGE_RATES = {
+    "GBP": 1.0,
+    "EUR": 0.85,
+    "USD": 0.79,
+    "CAD": 0.58,
+    "AUD": 0.52,
+    "NZD": 0.48,
+    "CHF": 0.89,
+    "SEK": 0.074,
+    "NOK": 0.073,
+    "DKK": 0.114,
+    "PLN": 0.196,
+    "INR": 0.0095,
+    "SGD": 0.59,
+    "ZAR": 0.043,
+}
+
+# Periods per year
+PERIODS_PER_YEAR = {
+    "year": 1,
+    "month": 12,
+    "week": 52,
+    "day": 230,  # working days
+    "hour": 1950,  # 37.5 hours x 52 weeks
+}
+
+PERIOD_ALIASES = {
+    "yearly": "year", "annual": "year", "annum": "year",
+    "monthly": "month", "weekly": "week", "daily": "day", "hourly": "hour",
+}
+
+# (lower bound of annual base-currency salary, band code)
+SALARY_BANDS = [
+    (0, "under_25k"),
+    (25000, "25k_35k"),
+    (35000, "35k_50k"),
+    (50000, "50k_70k"),
+    (70000, "70k_100k"),
+    (100000, "100k_plus"),
+]
+
+LEGAL_SUFFIXES = {
+    "ltd", "limited", "plc", "llp", "llc", "inc", "incorporated", "corp", "corporation",
+    "co", "company", "gmbh", "ag", "sa", "bv", "pty", "uk",
+}
+
+# Columns written by normalize_job()
+NORMALIZED_COLUMNS = ["salary_annual_min", "salary_annual_max", "salary_band", "company_key"]
+
+
+def normalize_period(period: Optional[str]) -> Optional[str]:
+    if not period:
+        return None
+    period = period.strip().lower()
+    period = PERIOD_ALIASES.get(period, period)
+    return period if period in PERIODS_PER_YEAR else None
+
+
+def guess_period(amount: float) -> str:
+    """Period of a salary the source did not label, from its size"""
+    if amount < 150:
+        return "hour"
+    if amount < 1500:
+        return "day"
+    if amount < 10000:
+        return "month"
+    return "year"
+
+
+def annual_salary(amount: Optional[float], currency: Optional[str] = None,
+                  period: Optional[str] = None) -> Optional[int]:
+    """Annual amount in BASE_CURRENCY, or None if it cannot be converted"""
+    if not amount or amount <= 0:
+        return None
+    rate = EXCHANGE_RATES.get((currency or BASE_CURRENCY).upper())
+    if rate is None:
+        return None
+    period = normalize_period(period) or guess_period(amount)
+    return int(round(amount * PERIODS_PER_YEAR[period] * rate))
+
+
+def salary_band(annual: Optional[int]) -> Optional[str]:
+    if annual is None:
+        return None
+    band = None
+    for lower_bound, code in SALARY_BANDS:
+        if annual >= lower_bound:
+            band = code
+    return band
+
+
+def company_key(name: Optional[str]) -> Optional[str]:
+    """'Acme Software Ltd.' -> 'acme software'"""
+    if not name:
+        return None
+    words = re.sub(r"[^\w\s]", " ", name.lower().replace("&", " and ")).split()
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words) or None
+
+
+def company_keys(names) -> Tuple[str, ...]:
+    """Keys of a list of company names, or of a JSON string holding one (both occur in preferences)"""
+    if isinstance(names, str):
+        return _company_keys_json(names)
+    if not isinstance(names, (list, tuple)):
+        return ()
+    return tuple(key for key in (company_key(str(name)) for name in names) if key)
+
+
+@lru_cache(maxsize=1024)
+def _company_keys_json(names_json: str) -> Tuple[str, ...]:
+    try:
+        names = json.loads(names_json)
+    except ValueError:
+        return ()
+    return company_keys(names) if isinstance(names, list) else ()
+
+
+def normalize_job(row: Dict) -> Dict:
+    """Add the normalized salary and company columns to a job row"""
+    currency, salary_min, salary_max = row.get("salary_currency"), row.get("salary_min"), row.get("salary_max")
+    # Both ends of a range share one period; guessed per end, 100-200 became hourly-daily
+    period = normalize_period(row.get("salary_period"))
+    if period is None and (salary_max or salary_min):
+        period = guess_period(salary_max or salary_min)
+    annual_min = annual_salary(salary_min, currency, period)
+    annual_max = annual_salary(salary_max, currency, period)
+    row["salary_annual_min"] = annual_min
+    row["salary_annual_max"] = annual_max
+    # Band by the top of the range, which is what the salary filter compares against
+    row["salary_band"] = salary_band(annual_max or annual_min)
+    row["company_key"] = company_key(row.get("company_name"))
+    return row
+
+
+def backfill(db: Session, chunk_size: int = 1000, only_missing: bool = True) -> int:
+    """Compute the normalized columns for stored postings, one chunk per transaction"""
+    table = JobPosting.__table__
+    statement = update(table).where(table.c.id == bindparam("job_id")).values(
+        {column: bindparam(column) for column in NORMALIZED_COLUMNS}
+    )
+    source_columns = [table.c.id, table.c.company_name, table.c.salary_min, table.c.salary_max,
+                      table.c.salary_currency, table.c.salary_period]
+
+    updated = 0
+    last_id = 0
+    while True:
+        query = table.select().with_only_columns(*source_columns).where(table.c.id > last_id)
+        if only_missing:
+            query = query.where(table.c.company_key.is_(None))
+        rows = db.execute(query.order_by(table.c.id).limit(chunk_size)).all()
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            values = normalize_job(dict(row._mapping))
+            params.append(dict({column: values[column] for column in NORMALIZED_COLUMNS}, job_id=row.id))
+        db.execute(statement, params)
+        db.commit()
+        updated += len(rows)
+        last_id = rows[-1].id
+        print(f"  Normalized {updated} jobs")
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill normalized salary and company columns")
+    parser.add_argument("--backfill", action="store_true", help="Normalize stored jobs")
+    parser.add_argument("--all", action="store_true", help="Recompute every job, not only unnormalized ones")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if not args.backfill:
+        parser.print_help()
+        return
+
+    from backend.database import SessionLocal, create_tables
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        print(f"Normalized {backfill(db, args.chunk_size, only_missing=not args.all)} jobs")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
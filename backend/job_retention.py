@@ -0,0 +1,183 @@
+"""
+Retention for expired job postings: unreferenced ones are archived in
+chunks, referenced ones are only deactivated.
+
+Usage (from the repository root):
+    python -m backend.job_retention --dry-run
+    python -m backend.job_retention --days 90 --chunk-size 500
+"""
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from .database import (
+    ArchivedJobPosting, JobAlertCandidate, JobApplication, JobDedupBucket, JobMatch, JobPosting, SavedJob,
+)
+from .job_dedup import band_keys, job_signature, write_buckets
+import argparse
+import json
+import time
+
+RETENTION_DAYS = 90
+DEFAULT_CHUNK_SIZE = 500
+
+# Rows that keep an expired posting in job_postings
+KEEPING_MODELS = (JobApplication, SavedJob)
+# Rows that only make sense while the posting is live
+DERIVED_MODELS = (JobMatch, JobAlertCandidate, JobDedupBucket)
+
+# Not worth keeping in the archive
+ARCHIVE_EXCLUDED_COLUMNS = {"id", "external_id", "source", "posted_date", "minhash"}
+
+
+def retention_cutoff(days: int = RETENTION_DAYS, now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.utcnow()) - timedelta(days=days)
+
+
+def _is_referenced(db: Session):
+    return db.query(JobApplication).filter(JobApplication.job_id == JobPosting.id).exists() | \
+        db.query(SavedJob).filter(SavedJob.job_id == JobPosting.id).exists()
+
+
+def _archive_row(row) -> Dict:
+    data = {}
+    for column, value in row._mapping.items():
+        if column in ARCHIVE_EXCLUDED_COLUMNS:
+            continue
+        data[column] = value.isoformat() if isinstance(value, datetime) else value
+    return {
+        "job_id": row.id,
+        "external_id": row.external_id,
+        "source": row.source,
+        "posted_date": row.posted_date,
+        "data": data,
+        "archived_at": datetime.utcnow(),
+    }
+
+
+def _promote_duplicates(db: Session, retired_ids: List[int]):
+    """
+    Postings that pointed at a retired (archived or deactivated) canonical
+    get the oldest live one of them as their new canonical, which is
+    indexed in the dedup buckets so later reposts link to it
+    """
+    orphans = db.query(JobPosting.id, JobPosting.duplicate_of_id).filter(
+        JobPosting.duplicate_of_id.in_(retired_ids),
+        ~JobPosting.id.in_(retired_ids)
+    ).order_by(JobPosting.is_active.desc(), JobPosting.id).all()
+
+    groups: Dict[int, List[int]] = {}
+    for job_id, canonical_id in orphans:
+        groups.setdefault(canonical_id, []).append(job_id)
+    for new_canonical, *rest in groups.values():
+        db.query(JobPosting).filter(JobPosting.id == new_canonical).update(
+            {"duplicate_of_id": None}, synchronize_session=False
+        )
+        if rest:
+            db.query(JobPosting).filter(JobPosting.id.in_(rest)).update(
+                {"duplicate_of_id": new_canonical}, synchronize_session=False
+            )
+
+    promoted = [new_canonical for new_canonical, *_ in groups.values()]
+    for job in db.query(JobPosting).filter(JobPosting.id.in_(promoted)):
+        write_buckets(db, job.id, band_keys(job.minhash or job_signature(job)))
+
+
+def archive_chunk(db: Session, ids: List[int]) -> int:
+    """Move one chunk of postings into the archive in a single transaction"""
+    rows = db.execute(JobPosting.__table__.select().where(JobPosting.id.in_(ids))).all()
+    if rows:
+        db.execute(insert(ArchivedJobPosting.__table__), [_archive_row(row) for row in rows])
+    for model in DERIVED_MODELS:
+        db.query(model).filter(model.job_id.in_(ids)).delete(synchronize_session=False)
+    _promote_duplicates(db, ids)
+    db.query(JobPosting).filter(JobPosting.id.in_(ids)).delete(synchronize_session=False)
+    db.commit()
+    return len(rows)
+
+
+def apply_retention(
+    db: Session,
+    days: int = RETENTION_DAYS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    pause: float = 0.0,
+    dry_run: bool = False,
+    now: Optional[datetime] = None
+) -> Dict:
+    """
+    Archive expired, unreferenced postings and deactivate expired ones
+    that applications or saved jobs still point at. `pause` seconds are
+    slept between chunks to leave room for other writers.
+    """
+    started = time.perf_counter()
+    cutoff = retention_cutoff(days, now)
+    expired = db.query(JobPosting.id).filter(JobPosting.posted_date < cutoff)
+    report = {"cutoff": cutoff.isoformat(), "archived": 0, "deactivated": 0, "chunks": 0}
+
+    if dry_run:
+        report["to_archive"] = expired.filter(~_is_referenced(db)).count()
+        report["to_deactivate"] = expired.filter(_is_referenced(db), JobPosting.is_active == True).count()
+        return report
+
+    # Keyset pagination: every chunk is a fresh, index-driven query
+    last_id = 0
+    while True:
+        ids = [job_id for job_id, in expired.filter(
+            JobPosting.id > last_id, ~_is_referenced(db)
+        ).order_by(JobPosting.id).limit(chunk_size)]
+        if not ids:
+            break
+        report["archived"] += archive_chunk(db, ids)
+        report["chunks"] += 1
+        last_id = ids[-1]
+        print(f"  🗄️  Archived {report['archived']} expired jobs (up to id {last_id})")
+        if pause:
+            time.sleep(pause)
+
+    last_id = 0
+    while True:
+        ids = [job_id for job_id, in expired.filter(
+            JobPosting.id > last_id, JobPosting.is_active == True
+        ).order_by(JobPosting.id).limit(chunk_size)]
+        if not ids:
+            break
+        report["deactivated"] += db.query(JobPosting).filter(JobPosting.id.in_(ids)).update(
+            {"is_active": False}, synchronize_session=False
+        )
+        # Inactive postings stop being canonicals: their reposts stay visible
+        db.query(JobDedupBucket).filter(JobDedupBucket.job_id.in_(ids)).delete(synchronize_session=False)
+        _promote_duplicates(db, ids)
+        db.commit()
+        report["chunks"] += 1
+        last_id = ids[-1]
+        print(f"  💤 Deactivated {report['deactivated']} expired jobs still referenced by users")
+        if pause:
+            time.sleep(pause)
+
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive expired job postings in small chunks")
+    parser.add_argument("--days", type=int, default=RETENTION_DAYS, help="Age in days after which a posting expires")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Postings per transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between chunks")
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived")
+    args = parser.parse_args()
+
+    from backend.database import SessionLocal, create_tables
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        report = apply_retention(
+            db, days=args.days, chunk_size=args.chunk_size, pause=args.pause, dry_run=args.dry_run
+        )
+        print(json.dumps(report, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+from typing import Callable, Dict
+from sqlalchemy import or_
+from sqlalchemy.orm import Query
+from .database import JobPosting
+import os
+
+
+def ilike_text_filter(job_query: Query, query: str) -> Query:
+    """Original substring search over title, company and description"""
+    return job_query.filter(
+        or_(
+            JobPosting.title.ilike(f"%{query}%"),
+            JobPosting.company_name.ilike(f"%{query}%"),
+            JobPosting.description.ilike(f"%{query}%")
+        )
+    )
+
+
+# Text search implementations, selectable by name so they can be compared
+# side by side (see benchmarks/search_benchmark.py)
+SEARCH_BACKENDS: Dict[str, Callable[[Query, str], Query]] = {
+    "ilike": ilike_text_filter,
+}
+
+DEFAULT_SEARCH_BACKEND = os.getenv("JOB_SEARCH_BACKEND", "ilike")
+
+
+def apply_text_search(job_query: Query, query: str, backend: str = None) -> Query:
+    """Apply the free text part of a job search using the configured backend"""
+    backend = backend or DEFAULT_SEARCH_BACKEND
+    if backend not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown search backend: {backend}")
+    return SEARCH_BACKENDS[backend](job_query, query)
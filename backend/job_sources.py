@@ -0,0 +1,518 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, List, Dict, Optional, NamedTuple, Tuple, Union
+from datetime import datetime
+from .job_api_service import JobAPIService
+from .fetch_watermarks import is_seen, max_days_old
+from .source_resilience import (
+    CircuitBreaker, CircuitOpenError, RetryPolicy, SourceMetrics, get_breaker, get_metrics, is_source_failure,
+)
+import asyncio
+import math
+import os
+import time
+import httpx
+
+RESULTS_PER_PAGE = 20
+
+
+def pages_needed(max_jobs: int) -> int:
+    """Pages of RESULTS_PER_PAGE results that cover max_jobs"""
+    return max(1, math.ceil(max_jobs / RESULTS_PER_PAGE))
+
+
+class JobSource(ABC):
+    """
+    A job board plugin: how to request one page of results, how to read
+    the items out of the response and how to map an item onto our job
+    dict. Pooling, concurrency limits and archiving are handled by
+    AsyncJobSourceClient. Register new boards with register_source().
+    """
+    name = ""
+    default_base_url = ""
+    base_url_env = ""
+
+    # Rate limits and quota
+    concurrency = 2  # maximum in-flight requests
+    timeout = 10.0
+    monthly_quota = 0
+    # Send a second, identical request if the first has not answered after
+    # this many seconds (None: never). Costs quota, so off by default.
+    hedge_after: Optional[float] = None
+
+    # Results come newest first when a max_days_old window is requested, so
+    # incremental paging may stop at the first page with seen postings
+    sorted_by_date = False
+
+    # Payload key holding the result items
+    items_key = "results"
+
+    def __init__(self, base_url: Optional[str] = None):
+        # Overridable so a run can be pointed at a local stand-in server
+        self.base_url = (base_url or os.getenv(self.base_url_env) or self.default_base_url).rstrip("/")
+
+    @abstractmethod
+    def is_configured(self, api_service: JobAPIService) -> bool:
+        """True if the credentials this source needs are set"""
+
+    @abstractmethod
+    def page_request(self, api_service: JobAPIService, query: str, page: int, location: str,
+                     max_days_old: Optional[int] = None) -> Tuple[str, Dict, Dict]:
+        """URL, query params and headers for one page"""
+
+    @abstractmethod
+    def match_request(self, url: httpx.URL) -> Optional[Tuple[str, int]]:
+        """(query, page) if `url` is a page request for this source, else None"""
+
+    @abstractmethod
+    def parse_item(self, api_service: JobAPIService, item: Dict) -> Dict:
+        """One raw result item mapped onto our job dict"""
+
+    def items(self, data: Dict) -> List[Dict]:
+        return data.get(self.items_key) or []
+
+    def payload(self, items: List[Dict]) -> Dict:
+        """Wrap raw items the way the real API does"""
+        return {self.items_key: items}
+
+    def parse_payload(self, api_service: JobAPIService, data: Dict) -> List[Dict]:
+        return [self.parse_item(api_service, item) for item in self.items(data)]
+
+
+class AdzunaSource(JobSource):
+    """Adzuna search API. Free tier: 250 calls/month"""
+    name = "adzuna"
+    default_base_url = "https://api.adzuna.com/v1/api/jobs"
+    base_url_env = "ADZUNA_BASE_URL"
+    concurrency = 4
+    timeout = 15.0
+    monthly_quota = int(os.getenv("ADZUNA_MONTHLY_QUOTA", "250"))
+    items_key = "results"
+    country = "gb"
+    sorted_by_date = True  # sort_by=date is sent with every freshness window
+
+    def is_configured(self, api_service: JobAPIService) -> bool:
+        return bool(api_service.adzuna_app_id and api_service.adzuna_api_key)
+
+    def page_request(self, api_service, query, page, location, max_days_old=None):
+        params = {
+            "app_id": api_service.adzuna_app_id,
+            "app_key": api_service.adzuna_api_key,
+            "results_per_page": RESULTS_PER_PAGE,
+            "what": query
+        }
+        if max_days_old:
+            params["max_days_old"] = max_days_old
+            params["sort_by"] = "date"
+        return f"{self.base_url}/{self.country}/search/{page}", params, {}
+
+    def match_request(self, url):
+        if not str(url).startswith(self.base_url):
+            return None
+        parts = url.path.rstrip("/").split("/")
+        if len(parts) < 2 or parts[-2] != "search" or not parts[-1].isdigit():
+            return None
+        return url.params.get("what", ""), int(parts[-1])
+
+    def parse_item(self, api_service, item):
+        return api_service.parse_adzuna_job(item)
+
+
+class JSearchSource(JobSource):
+    """JSearch on RapidAPI. Free tier: 100 calls/month"""
+    name = "jsearch"
+    default_base_url = "https://jsearch.p.rapidapi.com"
+    base_url_env = "JSEARCH_BASE_URL"
+    concurrency = 2
+    timeout = 10.0
+    monthly_quota = int(os.getenv("JSEARCH_MONTHLY_QUOTA", "100"))
+    items_key = "data"
+    # Ranked by relevance even within a freshness window
+    sorted_by_date = False
+
+    # JSearch only accepts fixed freshness windows
+    date_posted_windows = [(1, "today"), (3, "3days"), (7, "week"), (31, "month")]
+
+    def is_configured(self, api_service: JobAPIService) -> bool:
+        return bool(api_service.jsearch_api_key)
+
+    def page_request(self, api_service, query, page, location, max_days_old=None):
+        headers = {
+            "X-RapidAPI-Key": api_service.jsearch_api_key,
+            "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
+        }
+        params = {"query": f"{query} in {location}", "page": str(page), "num_pages": "1"}
+        if max_days_old:
+            params["date_posted"] = next(
+                (window for days, window in self.date_posted_windows if max_days_old <= days), "all"
+            )
+        return f"{self.base_url}/search", params, headers
+
+    def match_request(self, url):
+        if not str(url).startswith(self.base_url) or not url.path.rstrip("/").endswith("/search"):
+            return None
+        return url.params.get("query", "").split(" in ")[0], int(url.params.get("page", "1"))
+
+    def parse_item(self, api_service, item):
+        return api_service.parse_jsearch_job(item)
+
+
+# Registered job boards by name
+JOB_SOURCES: Dict[str, JobSource] = {}
+
+
+def register_source(source: JobSource) -> JobSource:
+    JOB_SOURCES[source.name] = source
+    return source
+
+
+def get_source(name: str) -> JobSource:
+    if name not in JOB_SOURCES:
+        raise ValueError(f"Unknown job source: {name}")
+    return JOB_SOURCES[name]
+
+
+register_source(AdzunaSource())
+register_source(JSearchSource())
+
+
+def parse_payload(api_service: JobAPIService, source: str, data: Dict) -> List[Dict]:
+    """Turn one raw response page into our job dicts"""
+    return get_source(source).parse_payload(api_service, data)
+
+
+class PageRequest(NamedTuple):
+    """One call to a job board: a single page of results for a query"""
+    source: str
+    query: str
+    page: int
+
+
+class AsyncJobSourceClient:
+    """
+    Async job board client.
+
+    One pooled httpx.AsyncClient is shared by every request of a run, so
+    connections (and TLS sessions) are reused, and each source gets its own
+    semaphore so fanning out all queries and pages never exceeds what the
+    source tolerates. Sources are the plugins in JOB_SOURCES (all of them
+    by default); the ones without credentials are skipped.
+
+    Every request goes through the source's circuit breaker, is retried
+    with backoff on timeouts, 5xx and 429, can be hedged (see
+    JobSource.hedge_after) and is recorded in the source's metrics. The
+    breakers and metrics are process-wide unless passed in.
+
+    Usage:
+        async with AsyncJobSourceClient(api_service) as client:
+            jobs_by_query = await client.fetch_all(queries)
+
+            async for request, result in client.stream(requests):
+                ...
+    """
+
+    def __init__(
+        self,
+        api_service: JobAPIService,
+        sources: Optional[tuple] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        max_connections: int = 20,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        archive=None,
+        on_page: Optional[Callable[[PageRequest, Union[List[Dict], Exception]], None]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedge_after: Optional[Dict[str, Optional[float]]] = None,
+        breakers: Optional[Dict[str, CircuitBreaker]] = None,
+        metrics: Optional[Dict[str, SourceMetrics]] = None
+    ):
+        self.api_service = api_service
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._breakers = breakers
+        self._metrics = metrics
+        # HTTP requests actually sent per source, retries and hedges included
+        self.calls_sent: Dict[str, int] = {}
+        # Optional ResponseArchive that keeps every raw response page
+        self.archive = archive
+        # Called with (request, jobs or exception) as each page completes, e.g. for progress reporting
+        self.on_page = on_page
+        self.sources = tuple(sources or JOB_SOURCES)
+        self.concurrency = dict(
+            {name: get_source(name).concurrency for name in self.sources},
+            **(concurrency or {})
+        )
+        self.hedge_after = dict(
+            {name: get_source(name).hedge_after for name in self.sources},
+            **(hedge_after or {})
+        )
+        self.max_connections = max_connections
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "AsyncJobSourceClient":
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            ),
+            timeout=httpx.Timeout(max(get_source(name).timeout for name in self.sources)),
+            transport=self.transport
+        )
+        self._semaphores = {
+            source: asyncio.Semaphore(limit) for source, limit in self.concurrency.items()
+        }
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    def is_configured(self, source: str) -> bool:
+        return source in JOB_SOURCES and JOB_SOURCES[source].is_configured(self.api_service)
+
+    def breaker(self, source: str) -> CircuitBreaker:
+        if self._breakers is None:
+            return get_breaker(source)
+        return self._breakers.setdefault(source, CircuitBreaker(source))
+
+    def metrics(self, source: str) -> SourceMetrics:
+        if self._metrics is None:
+            return get_metrics(source)
+        return self._metrics.setdefault(source, SourceMetrics())
+
+    async def _get(self, source: JobSource, url: str, **kwargs) -> Dict:
+        """GET through the circuit breaker, retrying source failures with backoff"""
+        breaker = self.breaker(source.name)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                breaker.before_call()
+            except CircuitOpenError:
+                self.metrics(source.name).count("rejected")
+                raise
+            healthy = None
+            try:
+                data = await self._hedged_get(source, url, **kwargs)
+                healthy = True
+            except Exception as e:
+                # A 4xx or an unreadable body is our request's fault, not the source's
+                healthy = not is_source_failure(e)
+                if not self.retry_policy.should_retry(e, attempt):
+                    raise
+                error = e
+            finally:
+                # Every call settles the breaker, so a half open probe is always released
+                if healthy is None:
+                    breaker.release_probe()
+                elif healthy:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+            if healthy:
+                return data
+            self.metrics(source.name).count("retries")
+            await asyncio.sleep(self.retry_policy.delay(error, attempt))
+
+    async def _hedged_get(self, source: JobSource, url: str, **kwargs) -> Dict:
+        """
+        One logical request. With hedging, a second copy is sent if the
+        first is still pending after hedge_after seconds; the first copy to
+        succeed wins and the other is cancelled.
+        """
+        hedge_after = self.hedge_after.get(source.name)
+        if not hedge_after:
+            return await self._send(source, url, **kwargs)
+
+        first = asyncio.ensure_future(self._send(source, url, **kwargs))
+        done, _ = await asyncio.wait({first}, timeout=hedge_after)
+        if done:
+            return first.result()
+
+        metrics = self.metrics(source.name)
+        metrics.count("hedges")
+        hedge = asyncio.ensure_future(self._send(source, url, **kwargs))
+        pending = {first, hedge}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if task is hedge:
+                        metrics.count("hedge_wins")
+                    return task.result()
+                error = error or task.exception()
+        raise error
+
+    async def _send(self, source: JobSource, url: str, **kwargs) -> Dict:
+        """A single HTTP request under the source's concurrency limit"""
+        async with self._semaphores[source.name]:
+            self.calls_sent[source.name] = self.calls_sent.get(source.name, 0) + 1
+            started = time.perf_counter()
+            try:
+                response = await self._client.get(url, timeout=source.timeout, **kwargs)
+                response.raise_for_status()
+                data = response.json()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.metrics(source.name).record(time.perf_counter() - started, ok=False)
+                raise
+            self.metrics(source.name).record(time.perf_counter() - started, ok=True)
+            return data
+
+    def _archive(self, source: str, query: str, page: int, data: Dict):
+        if self.archive is None:
+            return
+        try:
+            self.archive.append(source, query, page, data)
+        except Exception as e:
+            # Archiving must never cost us the fetched jobs
+            print(f"Could not archive {source} response for '{query}' page {page}: {e}")
+
+    def _completed(self, request: PageRequest, result: Union[List[Dict], Exception]):
+        if self.on_page is None:
+            return
+        try:
+            self.on_page(request, result)
+        except Exception as e:
+            print(f"Page callback failed for {request.source} '{request.query}' page {request.page}: {e}")
+
+    def build_requests(self, queries: List[str], max_jobs: int = RESULTS_PER_PAGE,
+                       sources: Optional[List[str]] = None) -> List[PageRequest]:
+        """Every page of every configured source needed to cover max_jobs per query"""
+        pages = pages_needed(max_jobs)
+        sources = self.configured_sources() if sources is None else sources
+        return [
+            PageRequest(source, query, page)
+            for query in queries
+            for source in sources
+            for page in range(1, pages + 1)
+        ]
+
+    def configured_sources(self) -> List[str]:
+        sources = []
+        for source in self.sources:
+            if self.is_configured(source):
+                sources.append(source)
+            else:
+                print(f"{source} API credentials not configured")
+        return sources
+
+    async def fetch_page(self, request: PageRequest, location: str = "United Kingdom",
+                         max_days_old: Optional[int] = None) -> List[Dict]:
+        source = get_source(request.source)
+        url, params, headers = source.page_request(
+            self.api_service, request.query, request.page, location, max_days_old
+        )
+        data = await self._get(source, url, params=params, headers=headers)
+        self._archive(source.name, request.query, request.page, data)
+        return source.parse_payload(self.api_service, data)
+
+    async def _fetch_or_error(self, request: PageRequest, location: str
+                              ) -> Tuple[PageRequest, Union[List[Dict], Exception]]:
+        try:
+            result = await self.fetch_page(request, location)
+        except Exception as e:
+            print(f"Error fetching {request.source} jobs for '{request.query}' page {request.page}: {e!r}")
+            result = e
+        self._completed(request, result)
+        return request, result
+
+    async def stream(
+        self,
+        requests: List[PageRequest],
+        location: str = "United Kingdom"
+    ) -> AsyncIterator[Tuple[PageRequest, Union[List[Dict], Exception]]]:
+        """
+        Run page requests of all sources concurrently and yield each
+        (request, jobs or exception) as soon as it completes, so a slow
+        source never holds back the others.
+        """
+        for next_done in asyncio.as_completed([self._fetch_or_error(r, location) for r in requests]):
+            yield await next_done
+
+    async def fetch_pages(
+        self,
+        requests: List[PageRequest],
+        location: str = "United Kingdom"
+    ) -> List[Tuple[PageRequest, Union[List[Dict], Exception]]]:
+        """Run all page requests concurrently; failures are returned, not raised. Keeps request order."""
+        return list(await asyncio.gather(*(self._fetch_or_error(r, location) for r in requests)))
+
+    async def fetch_until_seen(
+        self,
+        source: str,
+        query: str,
+        watermark: Optional[datetime],
+        max_pages: int,
+        location: str = "United Kingdom"
+    ) -> List[Tuple[PageRequest, Union[List[Dict], Exception]]]:
+        """
+        Page through one (source, query) until a page comes back short or
+        max_pages is hit; for sources sorted by date, also stop at the first
+        page that reaches postings older than the watermark. Already seen
+        postings are dropped from the results.
+        """
+        newest_first = get_source(source).sorted_by_date
+        window = max_days_old(watermark)
+        page_results = []
+        for page in range(1, max_pages + 1):
+            request = PageRequest(source, query, page)
+            try:
+                jobs = await self.fetch_page(request, location, window)
+            except Exception as e:
+                print(f"Error fetching {source} jobs for '{query}' page {page}: {e!r}")
+                page_results.append((request, e))
+                self._completed(request, e)
+                break
+
+            fresh = [job for job in jobs if not is_seen(job, watermark)]
+            page_results.append((request, fresh))
+            self._completed(request, fresh)
+            if len(jobs) < RESULTS_PER_PAGE or (newest_first and len(fresh) < len(jobs)):
+                break
+        return page_results
+
+    async def fetch_incremental(
+        self,
+        requests: List[PageRequest],
+        watermarks: Dict[Tuple[str, str], datetime],
+        location: str = "United Kingdom"
+    ) -> List[Tuple[PageRequest, Union[List[Dict], Exception]]]:
+        """
+        Like fetch_pages, but each (source, query) is paged sequentially and
+        stops at its watermark; the number of requested pages is the cap.
+        Different queries still run concurrently.
+        """
+        page_caps: Dict[Tuple[str, str], int] = {}
+        for request in requests:
+            key = (request.source, request.query)
+            page_caps[key] = page_caps.get(key, 0) + 1
+
+        results = await asyncio.gather(*(
+            self.fetch_until_seen(source, query, watermarks.get((source, query)), pages, location)
+            for (source, query), pages in page_caps.items()
+        ))
+        return [page_result for pages in results for page_result in pages]
+
+    async def fetch_query(self, query: str, location: str = "United Kingdom", max_jobs: int = RESULTS_PER_PAGE) -> List[Dict]:
+        """Fetch every page of every source for one query concurrently"""
+        jobs = []
+        for _, result in await self.fetch_pages(self.build_requests([query], max_jobs), location):
+            if not isinstance(result, Exception):
+                jobs.extend(result)
+        return jobs[:max_jobs]
+
+    async def fetch_all(self, queries: List[str], location: str = "United Kingdom",
+                        max_jobs: int = RESULTS_PER_PAGE) -> Dict[str, List[Dict]]:
+        """Fan out all queries at once; total time tracks the slowest call, not the sum"""
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self.fetch_query(q, location, max_jobs) for q in queries))
+        jobs_by_query = dict(zip(queries, results))
+        print(
+            f"Fetched {sum(len(jobs) for jobs in results)} jobs for {len(queries)} queries "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return jobs_by_query
@@ -1,7 +1,7 @@
 import traceback
 from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Depends, APIRouter, status, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr
 from openai import OpenAI
@@ -11,10 +11,15 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import shutil
 import json
 import uuid
+import zipfile
 from pathlib import Path
 from passlib.context import CryptContext
 from dotenv import load_dotenv
 from backend.enhanced_resume_parser import EnhancedResumeParser
+from backend.bulk_resume_parsing import MAX_BATCH_UPLOAD_BYTES, parse_batch, zip_documents
+from backend.resume_cache import ResumeParseCache, content_hash
+from backend.resume_parsing import MAX_UPLOAD_BYTES, ResumeParseError, ResumeParserPool
+from backend.upload_limits import UploadSizeLimitMiddleware, read_upload
 from backend.database import Resume, create_tables, get_db, ChatSession, ChatMessage, ResumeAnalysis, User, UserProfile, UserActivity, JobPosting, UserJobPreferences, JobApplication, SavedJob, JobMatch,get_db,Base, User, UserProfile, JobPosting, JobApplication, SavedJob, UserJobPreferences,JobMatch,Resume,JobAlert
 from sqlalchemy.orm import Session
 from docx import Document
@@ -30,8 +35,19 @@ from backend.job_api_service import JobAPIService
 from backend.job_matching import JobMatchingEngine
 from typing import List, Optional
 from datetime import datetime, timedelta
-from sqlalchemy import desc, and_, or_
+from sqlalchemy import desc, and_, or_, func
 from backend.email_service import send_job_alert_email
+from backend.job_alerts import send_pending_alerts
+from backend.job_search import apply_text_search
+from backend.job_ingestion import JobIngestionPipeline, INITIAL_QUERIES, SCHEDULED_QUERIES, extract_experience_level
+from backend.job_sources import pages_needed
+from backend.job_dedup import canonical_only
+from backend.quota_planner import QueryPlanner
+from backend.response_archive import ResponseArchive
+from backend.fetch_watermarks import WatermarkStore
+from backend.job_retention import apply_retention
+from backend.ingestion_runs import IngestionRunRegistry, RunInProgress
+from backend.source_resilience import health_status
 from apscheduler.schedulers.background import BackgroundScheduler
 import atexit
 import jwt
@@ -47,6 +63,13 @@ job_api_service = JobAPIService()
 matching_engine = JobMatchingEngine()
 scheduler = BackgroundScheduler()
 job_api_service = JobAPIService()
+query_planner = QueryPlanner()
+response_archive = ResponseArchive()
+ingestion_pipeline = JobIngestionPipeline(
+    job_api_service, matching_engine, planner=query_planner, archive=response_archive,
+    watermarks=WatermarkStore()
+)
+ingestion_runs = IngestionRunRegistry()
 
 
 
@@ -76,6 +99,13 @@ app.include_router(password_reset_router)
 #Creating database table
 create_tables()
 
+# Resume uploads are cut off at the size limit while they stream in
+app.add_middleware(UploadSizeLimitMiddleware, limits={
+    "/api/upload-resume": MAX_UPLOAD_BYTES,
+    "/api/upload-resume/stream": MAX_UPLOAD_BYTES,
+    "/api/upload-resumes/bulk": MAX_BATCH_UPLOAD_BYTES,
+})
+
 #Enabling CORS for frontend connection
 app.add_middleware(
     CORSMiddleware,
@@ -95,6 +125,9 @@ client = OpenAI(api_key= os.getenv("OPENAI_API_KEY"))
 
 # Initializing resume parser
 resume_parser = EnhancedResumeParser()
+resume_cache = ResumeParseCache(resume_parser)
+resume_parser_pool = ResumeParserPool()
+atexit.register(resume_parser_pool.close)
 
 #Creating Uploads directory
 UPLOAD_DIR = Path("uploads")
@@ -211,42 +244,6 @@ class ProfileResponse(BaseModel):
         from_attributes = True
 
 
-#Helper fuctiion for my experience level problem
-def extract_experience_level(title: str, description: str = "") -> str:
-    """
-    Extract experience level from job title and description
-    Returns: 'Junior', 'Mid', or 'Senior'
-    """
-    text = (title + " " + description).lower()
-    
-    # Senior level keywords
-    senior_keywords = [
-        'senior', 'sr.', 'lead', 'principal', 'staff', 'architect',
-        'head of', 'director', 'manager', 'expert', 'specialist',
-        '5+ years', '5-', '6+ years', '7+ years', '8+ years',
-        'experienced', 'advanced'
-    ]
-    
-    # Junior level keywords
-    junior_keywords = [
-        'junior', 'jr.', 'entry', 'graduate', 'intern',
-        'associate', 'trainee', '0-2 years', '1-2 years',
-        'early career', 'beginner', 'starter'
-    ]
-    
-    # Check for senior
-    for keyword in senior_keywords:
-        if keyword in text:
-            return 'Senior'
-    
-    # Check for junior
-    for keyword in junior_keywords:
-        if keyword in text:
-            return 'Junior'
-    
-    # Default to Mid if no specific level found
-    return 'Mid'
-
 #Admin route
 @app.get("/api/admin/check-config")
 async def check_api_configuration():
@@ -259,92 +256,73 @@ async def check_api_configuration():
         "jsearch_key_length": len(job_api_service.jsearch_api_key) if job_api_service.jsearch_api_key else 0
     }
 
-@app.post("/api/admin/populate-jobs")
-async def populate_initial_jobs(db: Session = Depends(get_db)):
-    """Populate database with initial jobs - NO AUTH REQUIRED FOR TESTING"""
-    
-    queries = [
-        "software developer",
-        "frontend developer", 
-        "backend developer",
-        "full stack developer",
-        "python developer",
-        "junior developer",
-        "senior developer",
-        "lead developer",
-        "data analyst",
-        "junior data analyst",
-        "senior data analyst",
-        "business analyst",
-        "data scientist",
-        "machine learning engineer",
-        "AI engineer",
-        "data engineer",
-         # I would add more soont:
-    ]
-    
-    total_added = 0
-    total_updated = 0
-    
-    for query in queries:
-        print(f"Fetching jobs for: {query}")
-        jobs_data = job_api_service.fetch_and_store_jobs(query, "United Kingdom", 20)
-        
-        for job_data in jobs_data:
-            existing = db.query(JobPosting).filter(
-                JobPosting.external_id == job_data['external_id']
-            ).first()
-            
-            if not existing:
-                skills = job_api_service.extract_skills_from_description(
-                    job_data.get('description', '')
-                )
+# Manual and scheduled ingestion share one run name, so they never overlap
+INGESTION_RUN = "populate-jobs"
 
-                #Extracting Experience level
-                experience_level = extract_experience_level(
-                    job_data['title'],
-                    job_data.get('description', '')
-                )
-                
-                job = JobPosting(
-                    title=job_data['title'],
-                    company_name=job_data['company_name'],
-                    company_logo_url=job_data.get('company_logo_url'),
-                    location=job_data['location'],
-                    remote_type=job_data['remote_type'],
-                    description=job_data['description'],
-                    requirements=job_data.get('requirements', ''),
-                    salary_min=job_data.get('salary_min'),
-                    salary_max=job_data.get('salary_max'),
-                    salary_currency='GBP',
-                    experience_level=experience_level,
-                    employment_type=job_data['employment_type'],
-                    required_skills=skills,
-                    external_id=job_data['external_id'],
-                    source=job_data['source'],
-                    apply_url=job_data.get('apply_url'),
-                    posted_date=job_data.get('posted_date') or datetime.utcnow(),
-                    is_active=True
-                )
-                db.add(job)
-                total_added += 1
-            else:
-                experience_level = extract_experience_level(
-                    job_data['title'],
-                    job_data.get('description', '')
-                )
-                existing.experience_level = experience_level
-                total_updated += 1
-        
-        db.commit()
-        print(f"  Added: {total_added}, Updated: {total_updated}")
-    
+def populate_jobs_run(run):
+    """Initial population, executed in the background by ingestion_runs"""
+    from backend.database import SessionLocal
+    db = SessionLocal()
+    try:
+        # One page per query, still capped by what is left of the monthly quota
+        report = ingestion_pipeline.run_sync(
+            db, INITIAL_QUERIES, "United Kingdom", 20,
+            call_budget=len(INITIAL_QUERIES), progress=run.update
+        )
+        report["total"] = report["jobs_added"] + report["jobs_updated"] + report["jobs_unchanged"]
+        return report
+    finally:
+        db.close()
+
+def scheduled_jobs_run(run):
+    """Scheduled fetch, executed by ingestion_runs in the scheduler's thread"""
+    from backend.database import SessionLocal
+    db = SessionLocal()
+    try:
+        return ingestion_pipeline.run_sync(db, SCHEDULED_QUERIES, "United Kingdom", 20, progress=run.update)
+    finally:
+        db.close()
+
+@app.post("/api/admin/populate-jobs", status_code=202)
+async def populate_initial_jobs():
+    """Start populating the database with initial jobs - NO AUTH REQUIRED FOR TESTING"""
+    try:
+        run = ingestion_runs.start(INGESTION_RUN, INITIAL_QUERIES, populate_jobs_run)
+    except RunInProgress as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "A job population run is already in progress", "run_id": e.run.id}
+        )
     return {
-        "status": "success",
-        "jobs_added": total_added,
-        "jobs_updated": total_updated,
-        "total": total_added + total_updated
-    }    
+        "run_id": run.id,
+        "status": run.status,
+        "status_url": f"/api/admin/ingestion-runs/{run.id}",
+        "events_url": f"/api/admin/ingestion-runs/{run.id}/events",
+    }
+
+@app.get("/api/admin/ingestion-runs")
+async def list_ingestion_runs():
+    """Active and recently finished background ingestion runs"""
+    return [run.snapshot() for run in ingestion_runs.recent()]
+
+@app.get("/api/admin/ingestion-runs/{run_id}")
+async def get_ingestion_run(run_id: str):
+    """Progress of a background ingestion run (for polling)"""
+    run = ingestion_runs.get(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Ingestion run not found")
+    return run.snapshot()
+
+@app.get("/api/admin/ingestion-runs/{run_id}/events")
+async def stream_ingestion_run(run_id: str):
+    """Progress of a background ingestion run as server-sent events"""
+    if not ingestion_runs.get(run_id):
+        raise HTTPException(status_code=404, detail="Ingestion run not found")
+    return StreamingResponse(
+        ingestion_runs.events(run_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/")
 async def root():
@@ -544,45 +522,121 @@ async def delete_chat_session(
     
    
 @app.post("/api/upload-resume")
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user_id: Optional[int] = Depends(get_current_user_optional)
+):
     """Uploading and parsing resume file"""
     try:
         # Validating file type
         if not file.filename.lower().endswith(('.pdf', '.docx')):
             raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
+
+        # Same bytes, same parser version: answer from the parse cache
+        content = await read_upload(file, MAX_UPLOAD_BYTES)
+        digest = content_hash(content)
+        parsed_data = resume_cache.get(db, digest)
+        if parsed_data is not None:
+            return {
+                "status": "success",
+                "filename": file.filename,
+                "data": parsed_data,
+                "cached": True
+            }
         
-        # Create uploads directory if it doesn't exist
-        upload_dir = Path("uploads")
-        upload_dir.mkdir(exist_ok=True)
-        
-        # Saving uploaded file
-        file_path = upload_dir / file.filename
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Parsing resume
+        # Parsing the uploaded bytes in the parser pool, off the event loop
         file_type = file.filename.split('.')[-1].lower()
-        parsed_data = resume_parser.parse_resume(str(file_path), file_type)
-        
-        # Cleaning up uploaded file
-        os.remove(file_path)
+        try:
+            parsed_data = await resume_parser_pool.parse_async(content, file_type)
+        except ResumeParseError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
         
         if "error" in parsed_data:
             raise HTTPException(status_code=500, detail=parsed_data["error"])
+
+        resume_cache.put(db, digest, file.filename, parsed_data, user_id=current_user_id)
         
         return {
             "status": "success",
             "filename": file.filename,
-            "data": parsed_data
+            "data": parsed_data,
+            "cached": False
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        # Cleaning up file if it exists
+        raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+
+@app.post("/api/upload-resume/stream")
+async def upload_resume_stream(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user_id: Optional[int] = Depends(get_current_user_optional)
+):
+    """Parsing a resume, streaming NDJSON previews after every PDF page and then the full result"""
+    if not file.filename.lower().endswith(('.pdf', '.docx')):
+        raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
+
+    content = await read_upload(file, MAX_UPLOAD_BYTES)
+    digest = content_hash(content)
+    parsed_data = resume_cache.get(db, digest)
+    if parsed_data is not None:
+        line = {"status": "success", "filename": file.filename, "data": parsed_data, "cached": True}
+        return StreamingResponse(iter([json.dumps(line) + "\n"]), media_type="application/x-ndjson")
+
+    # Admission and the page limit are settled before the first item, so they still get a status code
+    file_type = file.filename.split('.')[-1].lower()
+    stream = resume_parser_pool.parse_stream_async(content, file_type)
+    try:
+        first = await stream.__anext__()
+    except ResumeParseError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    async def records():
+        item = first
         try:
-            if 'file_path' in locals() and Path(file_path).exists():
-                os.remove(file_path)
-        except:
+            while True:
+                if item.get("partial"):
+                    yield json.dumps(item) + "\n"
+                elif "error" in item:
+                    yield json.dumps({"status": "error", "status_code": 500, "detail": item["error"]}) + "\n"
+                else:
+                    resume_cache.put(db, digest, file.filename, item, user_id=current_user_id)
+                    yield json.dumps({"status": "success", "filename": file.filename,
+                                      "data": item, "cached": False}) + "\n"
+                item = await stream.__anext__()
+        except StopAsyncIteration:
             pass
-        raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+        except ResumeParseError as e:
+            yield json.dumps({"status": "error", "status_code": e.status_code, "detail": str(e)}) + "\n"
+
+    return StreamingResponse(records(), media_type="application/x-ndjson")
+
+@app.post("/api/upload-resumes/bulk")
+async def upload_resumes_bulk(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user_id: Optional[int] = Depends(get_current_user_optional)
+):
+    """Parsing a zip of resumes, streaming one NDJSON record per document as it finishes"""
+    if not file.filename.lower().endswith('.zip'):
+        raise HTTPException(status_code=400, detail="Upload a .zip of PDF and DOCX resumes")
+    try:
+        # Members are read straight from the spooled upload, one at a time
+        package = zipfile.ZipFile(file.file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="File is not a valid zip archive")
+
+    def records():
+        try:
+            for record in parse_batch(resume_parser_pool, zip_documents(package),
+                                      cache=resume_cache, db=db, user_id=current_user_id):
+                yield json.dumps(record) + "\n"
+        finally:
+            package.close()
+
+    return StreamingResponse(records(), media_type="application/x-ndjson")
     
 @app.post("/api/analyze-resume")
 async def analyze_resume(
@@ -1468,7 +1522,7 @@ async def patch_auth_user_profile(
     return await update_user_profile(profile_data, current_user_id, db)
     
 @app.post("/api/jobs/fetch")
-async def fetch_jobs_from_apis(
+def fetch_jobs_from_apis(
     query: str,
     location: str = "United Kingdom",
     max_jobs: int = 50,
@@ -1476,63 +1530,11 @@ async def fetch_jobs_from_apis(
     db: Session = Depends(get_db)
 ):
     """Fetch jobs from external APIs and store in database"""
-    
-    # Fetch jobs from all sources
-    jobs_data = job_api_service.fetch_and_store_jobs(query, location, max_jobs)
-    
-    added_count = 0
-    updated_count = 0
-    
-    for job_data in jobs_data:
-        # Check if job already exists
-        existing = db.query(JobPosting).filter(
-            JobPosting.external_id == job_data['external_id']
-        ).first()
-        
-        if existing:
-            # Update existing job
-            for key, value in job_data.items():
-                setattr(existing, key, value)
-            existing.updated_at = datetime.utcnow()
-            updated_count += 1
-        else:
-            # Create new job posting
-            # Extract skills from description
-            skills = job_api_service.extract_skills_from_description(
-                job_data.get('description', '')
-            )
-            
-            job = JobPosting(
-                title=job_data['title'],
-                company_name=job_data['company_name'],
-                company_logo_url=job_data.get('company_logo_url'),
-                location=job_data['location'],
-                remote_type=job_data['remote_type'],
-                description=job_data['description'],
-                requirements=job_data.get('requirements', ''),
-                salary_min=job_data.get('salary_min'),
-                salary_max=job_data.get('salary_max'),
-                salary_currency=job_data.get('salary_currency', 'GBP'),
-                experience_level=job_data.get('experience_level', 'Mid'),
-                employment_type=job_data.get('employment_type', 'full-time'),
-                required_skills=skills,
-                external_id=job_data['external_id'],
-                source=job_data['source'],
-                apply_url=job_data.get('apply_url'),
-                posted_date=job_data.get('posted_date') or datetime.utcnow(),
-                is_active=True
-            )
-            db.add(job)
-            added_count += 1
-    
-    db.commit()
-    
-    return {
-        "status": "success",
-        "jobs_added": added_count,
-        "jobs_updated": updated_count,
-        "total_fetched": len(jobs_data)
-    }
+    # Plain def: FastAPI runs it in its threadpool, so the database writes and the
+    # response archive never block the event loop
+    report = ingestion_pipeline.run_sync(db, [query], location, max_jobs, call_budget=pages_needed(max_jobs))
+    report["total_fetched"] = report["jobs_fetched"]
+    return report
 
 
 @app.post("/api/job-preferences")
@@ -1873,23 +1875,18 @@ async def search_jobs(
     location: Optional[str] = None,
     remote_type: Optional[str] = None,
     min_salary: Optional[int] = None,
+    salary_band: Optional[str] = None,
     experience_level: Optional[str] = None,
     skip: int = 0,
     limit: int = 20,
     db: Session = Depends(get_db)
 ):
-    """Search jobs with filters"""
+    """Search jobs with filters (salaries are annual, in GBP)"""
     
-    job_query = db.query(JobPosting).filter(JobPosting.is_active == True)
+    job_query = canonical_only(db.query(JobPosting).filter(JobPosting.is_active == True))
     
     if query:
-        job_query = job_query.filter(
-            or_(
-                JobPosting.title.ilike(f"%{query}%"),
-                JobPosting.company_name.ilike(f"%{query}%"),
-                JobPosting.description.ilike(f"%{query}%")
-            )
-        )
+        job_query = apply_text_search(job_query, query)
     
     if location:
         job_query = job_query.filter(
@@ -1900,7 +1897,11 @@ async def search_jobs(
         job_query = job_query.filter(JobPosting.remote_type == remote_type)
     
     if min_salary:
-        job_query = job_query.filter(JobPosting.salary_max >= min_salary)
+        # Rows not yet backfilled only have the raw column; match scoring falls back the same way
+        job_query = job_query.filter(func.coalesce(JobPosting.salary_annual_max, JobPosting.salary_max) >= min_salary)
+
+    if salary_band:
+        job_query = job_query.filter(JobPosting.salary_band == salary_band)
     
     if experience_level:
         job_query = job_query.filter(
@@ -2212,6 +2213,21 @@ async def delete_job_alert(
     
     return {"message": "Alert deleted"}
 
+@app.get("/api/admin/quota-planner")
+async def get_quota_planner_status(db: Session = Depends(get_db)):
+    """API quota usage this month and the planner's latest decisions"""
+    return query_planner.status(db)
+
+@app.get("/api/admin/source-health")
+async def get_source_health():
+    """Circuit breaker state and request metrics per job source"""
+    return health_status()
+
+@app.get("/api/admin/resume-parsing")
+async def get_resume_parsing_status():
+    """Parser pool queue depth, limits and parse times, and parse cache hit rates"""
+    return {"pool": resume_parser_pool.status(), "cache": resume_cache.stats()}
+
 @app.get("/api/admin/scheduler-status")
 async def get_scheduler_status(db: Session = Depends(get_db)):
     """Check scheduler status and last job fetch"""
@@ -2230,156 +2246,82 @@ async def get_scheduler_status(db: Session = Depends(get_db)):
 
 # Background job scheduler
 def fetch_jobs_and_send_alerts():
-    """Run daily to fetch jobs and send alerts"""
-    from database import SessionLocal
+    """Run daily to fetch jobs, queue alert candidates and send digests"""
+    import asyncio
+    from backend.database import SessionLocal
     db = SessionLocal()
     
     try:
-        # Fetch new jobs
+        # Fetch new jobs; new ones are percolated against stored alerts
         print("Fetching new jobs...")
-        queries = ["software developer", 
-                   "frontend developer", 
-                   "backend developer",
-                   "full stack developer",
-                    "python developer",
-                    "junior developer",
-                    "senior developer",
-                    "data analyst",
-                    "junior data analyst",
-                    "senior data analyst",
-                    "business analyst",
-                    "data scientist",
-                    "machine learning engineer",
-                    "AI engineer",
-                    "data engineer",
-                    ]
-        
-        for query in queries:
-            jobs_data = job_api_service.fetch_and_store_jobs(query, "United Kingdom", 20)
-            
-            for job_data in jobs_data:
-                existing = db.query(JobPosting).filter(
-                    JobPosting.external_id == job_data['external_id']
-                ).first()
-                
-                if not existing:
-                    skills = job_api_service.extract_skills_from_description(
-                        job_data.get('description', '')
-                    )
-                    
-                    job = JobPosting(
-                        title=job_data['title'],
-                        company_name=job_data['company_name'],
-                        location=job_data['location'],
-                        remote_type=job_data['remote_type'],
-                        description=job_data['description'],
-                        salary_min=job_data.get('salary_min'),
-                        salary_max=job_data.get('salary_max'),
-                        salary_currency='GBP',
-                        experience_level='Mid',
-                        employment_type=job_data['employment_type'],
-                        required_skills=skills,
-                        external_id=job_data['external_id'],
-                        source=job_data['source'],
-                        apply_url=job_data.get('apply_url'),
-                        posted_date=job_data.get('posted_date') or datetime.utcnow(),
-                        is_active=True
-                    )
-                    db.add(job)
-            
-            db.commit()
-        
-        # Send alerts to users
+        try:
+            ingestion_runs.run(INGESTION_RUN, SCHEDULED_QUERIES, scheduled_jobs_run)
+        except RunInProgress as e:
+            print(f"  ⏭️ Skipping the fetch, {e}")
+
         print("Sending job alerts...")
-        alerts = db.query(JobAlert).filter(JobAlert.is_active == True).all()
-        
-        for alert in alerts:
-            matches = matching_engine.find_matching_jobs(
-                alert.user_id, db, limit=10, min_score=alert.min_match_score
-            )
-            
-            if matches:
-                jobs_to_send = [
-                    {
-                        'title': job.title,
-                        'company': job.company_name,
-                        'location': job.location,
-                        'match_score': round(scores['overall_score']),
-                        'apply_url': job.apply_url or '#'
-                    }
-                    for job, scores in matches
-                ]
-                
-                import asyncio
-                asyncio.run(send_job_alert_email(alert.email, jobs_to_send))
-                
-                alert.last_sent = datetime.utcnow()
-                db.commit()
+        for frequency in ("instant", "daily", "weekly"):
+            sent = asyncio.run(send_pending_alerts(db, frequency))
+            print(f"  {frequency}: {sent} emails sent")
         
         print("Job fetch and alerts completed")
     
     finally:
         db.close()
+
 def fetch_jobs_task():
-    """Fetch fresh jobs from Adzuna and clean old ones"""
+    """Fetch fresh jobs from Adzuna, store them and clean old ones"""
     print(f"[{datetime.now()}] Starting scheduled job fetch...")
+    from backend.database import SessionLocal
     
-    # ✅ Auto-cleanup: remove jobs older than 90 days
+    # ✅ Auto-cleanup: archive jobs past the retention window, in small chunks
+    db = SessionLocal()
     try:
-        from backend.database import SessionLocal
-        db = SessionLocal()
-        cutoff = datetime.utcnow() - timedelta(days=90)
-        old_count = db.query(JobPosting).filter(JobPosting.posted_date < cutoff).count()
-        db.query(JobPosting).filter(JobPosting.posted_date < cutoff).delete()
-        db.commit()
-        db.close()
-        print(f"  🗑️ Cleaned up {old_count} old jobs")
+        report = apply_retention(db)
+        print(f"  🗑️ Archived {report['archived']} old jobs, deactivated {report['deactivated']}")
     except Exception as e:
+        db.rollback()
         print(f"  ❌ Cleanup error: {e}")
+    finally:
+        db.close()
 
-    queries = [
-        "software developer",
-        "frontend developer", 
-        "backend developer",
-        "full stack developer",
-        "python developer",
-        "junior developer",
-        "senior developer",
-        "data analyst",
-        "junior data analyst",
-        "senior data analyst",
-        "business analyst",
-        "data scientist",
-        "machine learning engineer",
-        "AI engineer",
-        "data engineer",
-    ]
-    
-    total_fetched = 0
-    for query in queries:
-        try:
-            jobs = job_api_service.fetch_and_store_jobs(query, "United Kingdom", 20)
-            total_fetched += len(jobs)
-            print(f"  ✅ {query}: {len(jobs)} jobs")
-        except Exception as e:
-            print(f"  ❌ Error fetching {query}: {e}")
-    
-    print(f"[{datetime.now()}] Completed! Total fetched: {total_fetched}")
+    try:
+        run = ingestion_runs.run(INGESTION_RUN, SCHEDULED_QUERIES, scheduled_jobs_run)
+    except RunInProgress as e:
+        print(f"  ⏭️ Skipping the fetch, {e}")
+        return
+    if run.error:
+        print(f"  ❌ Ingestion error: {run.error}")
+    else:
+        print(f"[{datetime.now()}] Completed! Total fetched: {run.report['jobs_fetched']}")
+
+# Started with the server rather than on import, so scripts, benchmarks and tests can
+# build the app without it; RUN_SCHEDULER=false also turns it off for extra API workers
+RUN_SCHEDULER = os.getenv("RUN_SCHEDULER", "true").lower() in ("1", "true", "yes")
+
+@app.on_event("startup")
+def start_scheduler():
+    if not RUN_SCHEDULER:
+        print("⏸️ Job scheduler disabled (RUN_SCHEDULER=false)")
+        return
 
-# ✅ UPDATED: Run 3 times per day instead of once
-scheduler.add_job(fetch_jobs_task, 'cron', hour=9, minute=0, id='morning_fetch')   # 9 AM
-scheduler.add_job(fetch_jobs_task, 'cron', hour=14, minute=0, id='afternoon_fetch') # 2 PM
-scheduler.add_job(fetch_jobs_task, 'cron', hour=20, minute=0, id='evening_fetch')  # 8 PM
+    # ✅ UPDATED: Run 3 times per day instead of once
+    scheduler.add_job(fetch_jobs_task, 'cron', hour=9, minute=0, id='morning_fetch')   # 9 AM
+    scheduler.add_job(fetch_jobs_task, 'cron', hour=14, minute=0, id='afternoon_fetch') # 2 PM
+    scheduler.add_job(fetch_jobs_task, 'cron', hour=20, minute=0, id='evening_fetch')  # 8 PM
 
-# Alerts - once daily
-scheduler.add_job(fetch_jobs_and_send_alerts, 'cron', hour=21, minute=30, id='daily_alerts')
+    # Alerts - once daily
+    scheduler.add_job(fetch_jobs_and_send_alerts, 'cron', hour=21, minute=30, id='daily_alerts')
 
-scheduler.start()
-print("✅ Job scheduler started - Running at 9 AM, 2 PM, and 8 PM daily")
+    scheduler.start()
+    print("✅ Job scheduler started - Running at 9 AM, 2 PM, and 8 PM daily")
 
 
 # Shutdown scheduler on exit
-atexit.register(lambda: scheduler.shutdown())
+@app.on_event("shutdown")
+def stop_scheduler():
+    if scheduler.running:
+        scheduler.shutdown()
 
 
 
@@ -40,7 +40,10 @@ def migrate_database():
                 ("experience_data", "TEXT"),
                 ("certifications_data", "TEXT"),
                 ("resume_score", "REAL"),
-                ("optimization_suggestions", "TEXT")
+                ("optimization_suggestions", "TEXT"),
+                ("content_hash", "VARCHAR(64)"),
+                ("parser_version", "INTEGER"),
+                ("raw_text", "TEXT")
             ]
             
             for column, data_type in missing_columns:
@@ -53,7 +56,63 @@ def migrate_database():
                     else:
                         print(f"❌ Error adding {column} to resume_analyses: {e}")
             
+            # Parsed uploads are looked up by file hash
+            try:
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_resume_analyses_content_hash ON resume_analyses (content_hash)"
+                ))
+                print("✅ Indexed resume_analyses.content_hash")
+            except Exception as e:
+                print(f"❌ Error indexing resume_analyses.content_hash: {e}")
+
+            # One stored parse per (content_hash, parser_version); keep the newest of any repeats
+            try:
+                conn.execute(text(
+                    "DELETE FROM resume_analyses WHERE content_hash IS NOT NULL AND id NOT IN ("
+                    "SELECT MAX(id) FROM resume_analyses WHERE content_hash IS NOT NULL "
+                    "GROUP BY content_hash, parser_version)"
+                ))
+                conn.execute(text(
+                    "CREATE UNIQUE INDEX IF NOT EXISTS uq_resume_analyses_content_hash_parser_version "
+                    "ON resume_analyses (content_hash, parser_version)"
+                ))
+                print("✅ Made (content_hash, parser_version) unique in resume_analyses")
+            except Exception as e:
+                print(f"❌ Error adding the unique parse key to resume_analyses: {e}")
+
+            # Ingestion bookkeeping columns on job_postings
+            job_posting_columns = [
+                ("content_hash", "VARCHAR(64)"),
+                ("minhash", "JSON"),
+                ("duplicate_of_id", "INTEGER REFERENCES job_postings(id)"),
+                ("salary_period", "VARCHAR"),
+                ("salary_annual_min", "INTEGER"),
+                ("salary_annual_max", "INTEGER"),
+                ("salary_band", "VARCHAR"),
+                ("company_key", "VARCHAR")
+            ]
+
+            for column, data_type in job_posting_columns:
+                try:
+                    conn.execute(text(f"ALTER TABLE job_postings ADD COLUMN {column} {data_type}"))
+                    print(f"✅ Added {column} column to job_postings")
+                except Exception as e:
+                    if "duplicate column name" in str(e) or "already exists" in str(e):
+                        print(f"ℹ️  {column} column already exists in job_postings")
+                    else:
+                        print(f"❌ Error adding {column} to job_postings: {e}")
+
+            # Retention scans by posted_date; search filters on the normalized columns
+            for column in ("posted_date", "salary_annual_max", "salary_band", "company_key"):
+                try:
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_job_postings_{column} ON job_postings ({column})"))
+                    print(f"✅ Indexed job_postings.{column}")
+                except Exception as e:
+                    print(f"❌ Error indexing job_postings.{column}: {e}")
+
             conn.commit()
+
+            print("ℹ️  Run python -m backend.job_normalization --backfill to normalize existing jobs")
             print("\n🎉 Database migration completed!")
             
         except Exception as e:
@@ -0,0 +1,261 @@
+from typing import List, Dict, Optional, Set, Tuple, Union
+from datetime import datetime, timedelta
+from calendar import monthrange
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from .database import ApiQuotaUsage, QueryYieldStat
+from .job_sources import JOB_SOURCES, PageRequest, RESULTS_PER_PAGE
+
+SCHEDULED_RUNS_PER_DAY = 3
+
+# Skip a query page after this many consecutive runs with no new jobs...
+DUPLICATE_STREAK_LIMIT = 2
+# ...but probe it again once it has rested this long
+REPROBE_AFTER = timedelta(days=7)
+
+# Weight of the latest run in the smoothed yield
+YIELD_SMOOTHING = 0.5
+
+# A deeper page is only worth a call if the previous one was mostly new jobs
+DEEPEN_THRESHOLD = RESULTS_PER_PAGE // 2
+
+
+class QuotaLedger:
+    """Persistent per-source call counter for the current billing month"""
+
+    def __init__(self, quotas: Optional[Dict[str, int]] = None):
+        # Free tier allowances (calls per calendar month) come from the source plugins
+        self.quotas = dict(
+            {name: source.monthly_quota for name, source in JOB_SOURCES.items()},
+            **(quotas or {})
+        )
+
+    @staticmethod
+    def period(now: datetime) -> str:
+        return now.strftime("%Y-%m")
+
+    def usage(self, db: Session, source: str, now: Optional[datetime] = None) -> ApiQuotaUsage:
+        now = now or datetime.utcnow()
+        usage = db.query(ApiQuotaUsage).filter(
+            ApiQuotaUsage.source == source,
+            ApiQuotaUsage.period == self.period(now)
+        ).first()
+        if not usage:
+            usage = ApiQuotaUsage(source=source, period=self.period(now), calls_used=0, calls_failed=0)
+            db.add(usage)
+            db.flush()
+        return usage
+
+    def remaining(self, db: Session, source: str, now: Optional[datetime] = None) -> int:
+        return max(0, self.quotas.get(source, 0) - (self.usage(db, source, now).calls_used or 0))
+
+    def record_calls(self, db: Session, source: str, calls: int, failed: int = 0, now: Optional[datetime] = None):
+        usage = self.usage(db, source, now)
+        # Incremented in SQL so concurrent runs cannot overwrite each other's counts
+        db.query(ApiQuotaUsage).filter(ApiQuotaUsage.id == usage.id).update({
+            ApiQuotaUsage.calls_used: func.coalesce(ApiQuotaUsage.calls_used, 0) + calls,
+            ApiQuotaUsage.calls_failed: func.coalesce(ApiQuotaUsage.calls_failed, 0) + failed,
+        }, synchronize_session=False)
+        db.commit()
+
+    def summary(self, db: Session, now: Optional[datetime] = None) -> List[Dict]:
+        now = now or datetime.utcnow()
+        result = []
+        for source, quota in self.quotas.items():
+            usage = self.usage(db, source, now)
+            result.append({
+                "source": source,
+                "period": usage.period,
+                "quota": quota,
+                "calls_used": usage.calls_used or 0,
+                "calls_failed": usage.calls_failed or 0,
+                "remaining": max(0, quota - (usage.calls_used or 0)),
+            })
+        db.commit()
+        return result
+
+
+class QueryPlanner:
+    """
+    Decides which (source, query, page) calls a run should spend quota on.
+
+    Each page keeps a smoothed yield of previously unseen external_ids.
+    Unknown pages get an optimistic score so they are explored once; pages
+    that only returned known jobs for several runs are skipped until they
+    have rested, and a page that was never fetched is only tried when the
+    page before it came back mostly new. The remaining monthly budget is spread over the scheduled
+    runs left in the month and spent on the highest yield pages first.
+    """
+
+    def __init__(self, ledger: Optional[QuotaLedger] = None, max_pages: int = 3,
+                 runs_per_day: int = SCHEDULED_RUNS_PER_DAY):
+        self.ledger = ledger or QuotaLedger()
+        self.max_pages = max_pages
+        self.runs_per_day = runs_per_day
+        self.last_plan: Optional[Dict] = None
+
+    def run_budget(self, db: Session, source: str, now: datetime) -> int:
+        """Even share of the remaining monthly quota for one scheduled run"""
+        remaining = self.ledger.remaining(db, source, now)
+        if not remaining:
+            return 0
+        days_left = monthrange(now.year, now.month)[1] - now.day + 1
+        runs_left = max(1, days_left * self.runs_per_day)
+        return max(1, remaining // runs_left)
+
+    def _score(self, stats: Dict, source: str, query: str, page: int, now: datetime) -> Tuple[Optional[float], str]:
+        """Expected new jobs for one page call, or None with the reason it is skipped"""
+        stat = stats.get((source, query, page))
+
+        if stat is None or not stat.runs:
+            if page == 1:
+                return float(RESULTS_PER_PAGE), "never fetched"
+            previous = stats.get((source, query, page - 1))
+            if not previous or (previous.last_new_results or 0) < DEEPEN_THRESHOLD:
+                return None, "previous page did not yield enough new jobs"
+            return previous.last_new_results * 0.8, "never fetched, previous page mostly new"
+
+        if (stat.duplicate_streak or 0) >= DUPLICATE_STREAK_LIMIT:
+            if stat.last_run_at and now - stat.last_run_at < REPROBE_AFTER:
+                return None, f"only duplicates in last {stat.duplicate_streak} runs"
+            return float(stat.avg_new_results or 0) + 1, "re-probing after rest"
+
+        return float(stat.avg_new_results or 0), "smoothed yield"
+
+    def plan(
+        self,
+        db: Session,
+        sources: List[str],
+        queries: List[str],
+        budget: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> List[PageRequest]:
+        """
+        Pick the calls for this run. `budget` caps calls per source; by
+        default it is the run's even share of the remaining monthly quota.
+        Never plans more calls than a source has left this month.
+        """
+        now = now or datetime.utcnow()
+        stats = {
+            (stat.source, stat.query, stat.page): stat
+            for stat in db.query(QueryYieldStat).filter(
+                QueryYieldStat.source.in_(sources),
+                QueryYieldStat.query.in_(queries)
+            )
+        }
+
+        planned = []
+        decisions = []
+        for source in sources:
+            remaining = self.ledger.remaining(db, source, now)
+            source_budget = self.run_budget(db, source, now) if budget is None else budget
+            source_budget = min(source_budget, remaining)
+
+            candidates = []
+            for query in queries:
+                for page in range(1, self.max_pages + 1):
+                    score, reason = self._score(stats, source, query, page, now)
+                    if score is None:
+                        decisions.append({"source": source, "query": query, "page": page,
+                                          "action": "skip", "score": None, "reason": reason})
+                    else:
+                        candidates.append((score, source, query, page, reason))
+
+            candidates.sort(key=lambda c: (-c[0], c[3]))
+            for rank, (score, _, query, page, reason) in enumerate(candidates):
+                selected = rank < source_budget
+                if selected:
+                    planned.append(PageRequest(source, query, page))
+                decisions.append({
+                    "source": source, "query": query, "page": page,
+                    "action": "fetch" if selected else "skip",
+                    "score": round(score, 2),
+                    "reason": reason if selected else "over budget",
+                })
+
+        db.commit()
+        self.last_plan = {
+            "planned_at": now.isoformat(),
+            "budget": budget,
+            "calls_planned": len(planned),
+            "decisions": decisions,
+        }
+        return planned
+
+    def record_results(
+        self,
+        db: Session,
+        page_results: List[Tuple[PageRequest, Union[List[Dict], Exception]]],
+        new_external_ids: Set[str],
+        now: Optional[datetime] = None,
+        calls_sent: Optional[Dict[str, int]] = None
+    ):
+        """
+        Charge the ledger for every call made and update per-page yields.
+        calls_sent (HTTP requests per source, retries and hedges included)
+        replaces the one-call-per-page count when given.
+        """
+        now = now or datetime.utcnow()
+
+        calls: Dict[str, List[int]] = {}
+        credited = set()
+        for request, result in page_results:
+            counters = calls.setdefault(request.source, [0, 0])
+            counters[0] += 1
+            if isinstance(result, Exception):
+                counters[1] += 1
+                continue
+
+            external_ids = {str(job.get("external_id")) for job in result if job.get("external_id")}
+            new_ids = (external_ids & new_external_ids) - credited
+            credited |= new_ids
+
+            stat = db.query(QueryYieldStat).filter(
+                QueryYieldStat.source == request.source,
+                QueryYieldStat.query == request.query,
+                QueryYieldStat.page == request.page
+            ).first()
+            if not stat:
+                stat = QueryYieldStat(source=request.source, query=request.query, page=request.page,
+                                      runs=0, total_results=0, new_results=0, avg_new_results=0.0,
+                                      duplicate_streak=0)
+                db.add(stat)
+
+            stat.avg_new_results = (
+                len(new_ids) if not stat.runs
+                else YIELD_SMOOTHING * len(new_ids) + (1 - YIELD_SMOOTHING) * (stat.avg_new_results or 0)
+            )
+            stat.runs += 1
+            stat.total_results += len(external_ids)
+            stat.new_results += len(new_ids)
+            stat.last_new_results = len(new_ids)
+            stat.duplicate_streak = 0 if new_ids else (stat.duplicate_streak or 0) + 1
+            stat.last_run_at = now
+
+        if calls_sent is not None:
+            for source in set(calls) | set(calls_sent):
+                calls.setdefault(source, [0, 0])[0] = calls_sent.get(source, 0)
+        for source, (made, failed) in calls.items():
+            self.ledger.record_calls(db, source, made, failed, now)
+        db.commit()
+
+    def status(self, db: Session) -> Dict:
+        """Ledger, last plan and per-page yields for the admin endpoint"""
+        stats = db.query(QueryYieldStat).order_by(QueryYieldStat.avg_new_results.desc()).all()
+        return {
+            "ledger": self.ledger.summary(db),
+            "last_plan": self.last_plan,
+            "query_yields": [
+                {
+                    "source": stat.source,
+                    "query": stat.query,
+                    "page": stat.page,
+                    "runs": stat.runs,
+                    "avg_new_results": round(stat.avg_new_results or 0, 2),
+                    "last_new_results": stat.last_new_results,
+                    "duplicate_streak": stat.duplicate_streak,
+                    "last_run_at": stat.last_run_at.isoformat() if stat.last_run_at else None,
+                }
+                for stat in stats
+            ],
+        }
@@ -0,0 +1,201 @@
+"""
+Append-only archive of raw job board responses.
+
+Every response page is stored as one JSON line
+    {"source", "query", "page", "fetched_at", "payload"}
+in compressed segments under <root>/<source>/<YYYY-MM-DD>.jsonl.zst
+(zstd when the optional `zstandard` package is installed, gzip otherwise).
+Each append writes a self-contained compressed frame, so segments can be
+appended to at any time and read back as one stream.
+
+The archive lets extraction changes be applied to existing jobs without
+spending API quota (replay), and serves archived pages back over HTTP for
+offline tests and benchmarks (as_transport).
+
+Usage (from the repository root):
+    python -m backend.response_archive replay --source adzuna --since 2025-11-01
+    python -m backend.response_archive stats
+"""
+from typing import Dict, Iterator, List, Optional
+from datetime import datetime
+from pathlib import Path
+import gzip
+import io
+import json
+import os
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_ARCHIVE_DIR = os.getenv("JOB_ARCHIVE_DIR", "archive/job_responses")
+
+CODEC_SUFFIXES = {"zstd": ".jsonl.zst", "gzip": ".jsonl.gz"}
+
+
+class ResponseArchive:
+    """Compressed JSONL segments of raw API responses, one per source per day"""
+
+    def __init__(self, root: str = DEFAULT_ARCHIVE_DIR, codec: Optional[str] = None):
+        self.root = Path(root)
+        self.codec = codec or ("zstd" if zstandard else "gzip")
+        if self.codec == "zstd" and not zstandard:
+            raise ValueError("zstd archives need the 'zstandard' package")
+        self._lock = threading.Lock()
+
+    def _segment_path(self, source: str, fetched_at: datetime) -> Path:
+        return self.root / source / f"{fetched_at:%Y-%m-%d}{CODEC_SUFFIXES[self.codec]}"
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data)
+
+    def append(self, source: str, query: str, page: int, payload: Dict, fetched_at: Optional[datetime] = None):
+        """Store one raw response page"""
+        fetched_at = fetched_at or datetime.utcnow()
+        record = {
+            "source": source,
+            "query": query,
+            "page": page,
+            "fetched_at": fetched_at.isoformat(),
+            "payload": payload,
+        }
+        frame = self._compress((json.dumps(record, default=str) + "\n").encode("utf-8"))
+
+        path = self._segment_path(source, fetched_at)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "ab") as segment:
+                segment.write(frame)
+
+    def segments(self, source: Optional[str] = None, since: Optional[datetime] = None,
+                 until: Optional[datetime] = None) -> List[Path]:
+        """Segment files in chronological order, filtered by source and day"""
+        paths = []
+        sources = [self.root / source] if source else sorted(p for p in self.root.glob("*") if p.is_dir())
+        for source_dir in sources:
+            for path in source_dir.glob("*.jsonl.*"):
+                day = datetime.strptime(path.name.split(".")[0], "%Y-%m-%d")
+                if since and day.date() < since.date():
+                    continue
+                if until and day.date() > until.date():
+                    continue
+                paths.append(path)
+        return sorted(paths, key=lambda p: (p.name, p.parent.name))
+
+    def _open_segment(self, path: Path):
+        if path.name.endswith(".zst"):
+            if not zstandard:
+                raise ValueError(f"{path} needs the 'zstandard' package")
+            raw = open(path, "rb")
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+            return io.TextIOWrapper(reader, encoding="utf-8")
+        return gzip.open(path, "rt", encoding="utf-8")
+
+    def records(
+        self,
+        source: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        query: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """Stream archived responses, oldest first"""
+        for path in self.segments(source, since, until):
+            with self._open_segment(path) as segment:
+                for line in segment:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    fetched_at = datetime.fromisoformat(record["fetched_at"])
+                    if since and fetched_at < since:
+                        continue
+                    if until and fetched_at > until:
+                        continue
+                    if query and record["query"] != query:
+                        continue
+                    yield record
+
+    def latest_payloads(self, source: Optional[str] = None) -> Dict[tuple, Dict]:
+        """Most recent payload for every (source, query, page)"""
+        latest = {}
+        for record in self.records(source):
+            latest[(record["source"], record["query"], record["page"])] = record["payload"]
+        return latest
+
+    def stats(self) -> Dict:
+        counts: Dict[str, int] = {}
+        size = 0
+        for path in self.segments():
+            size += path.stat().st_size
+        for record in self.records():
+            counts[record["source"]] = counts.get(record["source"], 0) + 1
+        return {"root": str(self.root), "codec": self.codec, "pages": counts, "bytes_on_disk": size}
+
+    def as_transport(self):
+        """
+        httpx transport that answers job board requests from the archive,
+        so the ingestion pipeline can run offline against real payloads.
+        Unknown pages get an empty result set.
+        """
+        import httpx
+        from .job_sources import JOB_SOURCES
+
+        payloads = self.latest_payloads()
+
+        def handler(request: "httpx.Request") -> "httpx.Response":
+            for source in JOB_SOURCES.values():
+                matched = source.match_request(request.url)
+                if matched:
+                    query, page = matched
+                    return httpx.Response(200, json=payloads.get((source.name, query, page), source.payload([])))
+            return httpx.Response(404, json={"error": "unknown job source"})
+
+        return httpx.MockTransport(handler)
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or replay the raw job response archive")
+    parser.add_argument("command", choices=["replay", "stats"])
+    parser.add_argument("--root", default=DEFAULT_ARCHIVE_DIR, help="Archive directory")
+    parser.add_argument("--source", help="Only this source (adzuna, jsearch)")
+    parser.add_argument("--query", help="Only this search query")
+    parser.add_argument("--since", help="ISO date/time to start from")
+    parser.add_argument("--until", help="ISO date/time to stop at")
+    parser.add_argument("--force", action="store_true", help="Rewrite jobs even if their content hash is unchanged")
+    args = parser.parse_args()
+
+    archive = ResponseArchive(args.root)
+    if args.command == "stats":
+        print(json.dumps(archive.stats(), indent=2))
+        return
+
+    from backend.database import SessionLocal, create_tables
+    from backend.job_api_service import JobAPIService
+    from backend.job_ingestion import JobIngestionPipeline
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        pipeline = JobIngestionPipeline(JobAPIService())
+        report = pipeline.replay(
+            db, archive,
+            source=args.source, query=args.query,
+            since=_parse_date(args.since), until=_parse_date(args.until),
+            force=args.force
+        )
+        print(json.dumps(report, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
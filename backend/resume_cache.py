@@ -0,0 +1,139 @@
+"""
+Cache of parsed resumes keyed by file content.
+
+Users re-upload the same file many times while editing around it, and
+parsing (PDF/DOCX text extraction plus all field extractors) is by far
+the slowest part of an upload. Parse results are stored in
+resume_analyses under the SHA-256 of the uploaded bytes and the
+PARSER_VERSION that produced them, with a small in-process LRU in front,
+so a repeated upload is answered without touching the parser. Bumping
+PARSER_VERSION makes every stored parse a miss.
+"""
+from typing import Dict, Optional
+from collections import OrderedDict
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .database import ResumeAnalysis
+from .enhanced_resume_parser import PARSER_VERSION, EnhancedResumeParser
+import hashlib
+import json
+import threading
+
+DEFAULT_MEMORY_ENTRIES = 256
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def to_row(digest: str, filename: str, parsed: Dict, user_id: Optional[int] = None,
+           parser_version: int = PARSER_VERSION) -> ResumeAnalysis:
+    contact_info = parsed["contact_info"]
+    return ResumeAnalysis(
+        user_id=user_id,
+        filename=filename,
+        content_hash=digest,
+        parser_version=parser_version,
+        raw_text=parsed["raw_text"],
+        email=contact_info.get("email", ""),
+        phone=contact_info.get("phone", ""),
+        linkedin=contact_info.get("linkedin", ""),
+        github=contact_info.get("github", ""),
+        portfolio=contact_info.get("portfolio", ""),
+        skills_data=json.dumps(parsed["skills"]),
+        education_data=json.dumps(parsed["education"]),
+        experience_data=json.dumps(parsed["experience"]),
+        certifications_data=json.dumps(parsed["certifications"]),
+        experience_years=parsed["estimated_experience"],
+        word_count=parsed["word_count"],
+        resume_score=parsed["resume_score"]["score"],
+    )
+
+
+def from_row(row: ResumeAnalysis, parser: EnhancedResumeParser) -> Dict:
+    """The parse_resume() result a stored row was made from"""
+    parsed = {
+        "raw_text": row.raw_text,
+        "contact_info": {
+            "email": row.email or "",
+            "phone": row.phone or "",
+            "linkedin": row.linkedin or "",
+            "github": row.github or "",
+            "portfolio": row.portfolio or "",
+        },
+        "skills": json.loads(row.skills_data),
+        "education": json.loads(row.education_data),
+        "experience": json.loads(row.experience_data),
+        "certifications": json.loads(row.certifications_data),
+        "estimated_experience": row.experience_years,
+        "word_count": row.word_count,
+        "character_count": len(row.raw_text),
+    }
+    # Only the score number is stored; feedback is derived from the fields above
+    parsed["resume_score"] = parser.calculate_resume_score(parsed)
+    return parsed
+
+
+class ResumeParseCache:
+    """In-process LRU of parse results in front of resume_analyses"""
+
+    def __init__(self, parser: EnhancedResumeParser, max_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 parser_version: int = PARSER_VERSION):
+        self.parser = parser
+        self.max_entries = max_entries
+        self.parser_version = parser_version
+        self.hits = {"memory": 0, "database": 0}
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, digest: str, parsed: Dict):
+        with self._lock:
+            self._entries[digest] = parsed
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, db: Session, digest: str) -> Optional[Dict]:
+        """Parse result stored for a file hash, or None"""
+        with self._lock:
+            parsed = self._entries.get(digest)
+            if parsed is not None:
+                self._entries.move_to_end(digest)
+                self.hits["memory"] += 1
+                return parsed
+
+        row = db.query(ResumeAnalysis).filter(
+            ResumeAnalysis.content_hash == digest,
+            ResumeAnalysis.parser_version == self.parser_version,
+            ResumeAnalysis.raw_text.isnot(None)
+        ).order_by(ResumeAnalysis.id.desc()).first()
+        if row is None:
+            self.misses += 1
+            return None
+
+        parsed = from_row(row, self.parser)
+        self._remember(digest, parsed)
+        self.hits["database"] += 1
+        return parsed
+
+    def put(self, db: Session, digest: str, filename: str, parsed: Dict, user_id: Optional[int] = None):
+        """Store a successful parse; results with an "error" are not cached"""
+        if "error" in parsed:
+            return
+        db.add(to_row(digest, filename, parsed, user_id, self.parser_version))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another request or worker stored the same file first
+            db.rollback()
+        self._remember(digest, parsed)
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "parser_version": self.parser_version,
+            "hits": dict(self.hits),
+            "misses": self.misses,
+        }
@@ -0,0 +1,433 @@
+"""
+Resume parsing in a bounded pool of worker processes, with per-document
+time, page and text limits (ParseTimeout, DocumentTooLarge, ParserBusy).
+"""
+from typing import AsyncIterator, Deque, Dict, Iterator, List, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from .enhanced_resume_parser import EnhancedResumeParser, Source, as_binary_file
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+
+DEFAULT_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", "2"))
+DEFAULT_MAX_QUEUE = int(os.getenv("RESUME_PARSE_QUEUE", "16"))
+DEFAULT_TIMEOUT = float(os.getenv("RESUME_PARSE_TIMEOUT", "15"))
+MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+MAX_TEXT_CHARS = int(os.getenv("RESUME_MAX_TEXT_CHARS", "100000"))
+MAX_UPLOAD_BYTES = int(os.getenv("RESUME_MAX_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+# Processes each worker may split a long PDF across (see PARALLEL_PDF_MIN_PAGES)
+PDF_PROCESSES = int(os.getenv("RESUME_PDF_PROCESSES", "1"))
+
+# Seconds a new worker may take to import the parser and report ready
+WORKER_START_TIMEOUT = 60.0
+
+
+class ResumeParseError(Exception):
+    """A document the pool could not parse; status_code is what the API answers with"""
+    status_code = 422
+
+
+class DocumentTooLarge(ResumeParseError):
+    status_code = 413
+
+
+class ParseTimeout(ResumeParseError):
+    status_code = 504
+
+
+class ParserBusy(ResumeParseError):
+    status_code = 503
+
+
+def pdf_page_count(source: Source) -> int:
+    import PyPDF2
+
+    return len(PyPDF2.PdfReader(as_binary_file(source)).pages)
+
+
+def check_pdf_pages(source: Source, max_pages: int):
+    try:
+        pages = pdf_page_count(source)
+    except Exception as e:
+        raise ResumeParseError(f"Could not read PDF: {e}")
+    if pages > max_pages:
+        raise DocumentTooLarge(f"Resume has {pages} pages; at most {max_pages} are supported")
+
+
+def parse_document(parser: EnhancedResumeParser, source: Source, file_type: str,
+                   max_pages: int = MAX_PAGES, max_chars: int = MAX_TEXT_CHARS, processes: int = 1) -> Dict:
+    """parse_resume() with the document limits applied"""
+    if file_type.lower() == 'pdf':
+        check_pdf_pages(source, max_pages)
+
+    text = parser.extract_text(source, file_type, processes)
+    if not text:
+        return {"error": "Could not extract text from file"}
+    if len(text) > max_chars:
+        raise DocumentTooLarge(f"Resume text is {len(text)} characters long; at most {max_chars} are supported")
+    return parser.parse_text(text)
+
+
+def parse_document_stream(parser: EnhancedResumeParser, source: Source, file_type: str,
+                          max_pages: int = MAX_PAGES, max_chars: int = MAX_TEXT_CHARS) -> Iterator[Dict]:
+    """
+    parse_document() that yields a preview after every PDF page (see
+    EnhancedResumeParser.parse_pages), then the full result. The page count
+    is checked before the first page is read and the text length before
+    each page is reported, so no preview covers more than the limits allow.
+    """
+    if file_type.lower() != 'pdf':
+        yield parse_document(parser, source, file_type, max_pages, max_chars)
+        return
+    check_pdf_pages(source, max_pages)
+
+    def within_limit(pages: Iterator[str]) -> Iterator[str]:
+        chars = 0
+        for page in pages:
+            chars += len(page) + 1
+            if chars > max_chars:
+                raise DocumentTooLarge(f"Resume text is over {max_chars} characters long")
+            yield page
+
+    yield from parser.parse_pages(within_limit(parser.iter_pdf_pages(source)))
+
+
+ERRORS = {cls.__name__: cls for cls in (ResumeParseError, DocumentTooLarge)}
+
+
+def _worker_main(conn, max_pages: int, max_chars: int, pdf_processes: int):
+    """
+    Worker process: parse (source, file_type, stream) jobs from the pipe
+    until None or EOF. Streamed jobs send ("partial", preview) messages
+    before the result.
+    """
+    parser = EnhancedResumeParser()
+    conn.send("ready")
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        source, file_type, stream = job
+        try:
+            if stream:
+                for result in parse_document_stream(parser, source, file_type, max_pages, max_chars):
+                    if result.get("partial"):
+                        conn.send(("partial", result))
+            else:
+                result = parse_document(parser, source, file_type, max_pages, max_chars, pdf_processes)
+            conn.send(("ok", result))
+        except ResumeParseError as e:
+            conn.send((type(e).__name__, str(e)))
+        except Exception as e:
+            conn.send(("ResumeParseError", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, context, max_pages: int, max_chars: int, pdf_processes: int = 1):
+        self.conn, child_conn = context.Pipe()
+        # Daemonic processes cannot start the processes of a parallel PDF extraction
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, max_pages, max_chars, pdf_processes),
+            name="resume-parser", daemon=pdf_processes <= 1
+        )
+        self.process.start()
+        child_conn.close()
+        if not self.conn.poll(WORKER_START_TIMEOUT) or self.conn.recv() != "ready":
+            self.kill()
+            raise ResumeParseError("Resume parser worker failed to start")
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+
+
+class ParseMetrics:
+    """Outcome counts and parse time percentiles of the pool"""
+
+    def __init__(self, window: int = 1000):
+        self.completed = 0
+        self.failed = 0
+        self.too_large = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.parse_seconds: Deque[float] = deque(maxlen=window)
+        self.wait_seconds: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record(self, waited: float, parsed: float):
+        with self._lock:
+            self.wait_seconds.append(waited)
+            self.parse_seconds.append(parsed)
+
+    @staticmethod
+    def _percentiles(samples: Deque[float]) -> Dict:
+        ordered = sorted(samples)
+        return {
+            name: round(ordered[min(len(ordered) - 1, int(share * len(ordered)))] * 1000, 1) if ordered else None
+            for name, share in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99))
+        }
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            parse_seconds, wait_seconds = list(self.parse_seconds), list(self.wait_seconds)
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "too_large": self.too_large,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "worker_restarts": self.restarts,
+            "parse_time": self._percentiles(parse_seconds),
+            "queue_wait": self._percentiles(wait_seconds),
+        }
+
+
+class ResumeParserPool:
+    """Bounded pool of parser processes; parse() is thread safe, parse_async() is for request handlers"""
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_pages: int = MAX_PAGES,
+        max_chars: int = MAX_TEXT_CHARS,
+        pdf_processes: int = PDF_PROCESSES,
+        start_method: str = "spawn"
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.pdf_processes = pdf_processes
+        self.metrics = ParseMetrics()
+        self._context = multiprocessing.get_context(start_method)
+        self._idle: List[_Worker] = []
+        self._started = 0  # workers alive or starting
+        self._busy = 0
+        self._waiting = 0
+        self._admitted = 0  # submit() calls between admission and the end of their parse
+        self._handed_off = 0  # admitted calls whose thread has not reached _acquire() yet
+        self._closed = False
+        self._cond = threading.Condition()
+        # Threads that wait on the workers' pipes, so requests never block the event loop
+        self._threads = ThreadPoolExecutor(max_workers=workers + max_queue, thread_name_prefix="resume-parse")
+
+    def _acquire(self) -> _Worker:
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            if self._closed:
+                raise ParserBusy("Resume parser is shutting down")
+            if not self._idle and self._started >= self.workers and self._waiting >= self.max_queue:
+                self.metrics.count("rejected")
+                raise ParserBusy("Too many resumes are being parsed right now, please try again shortly")
+            self._waiting += 1
+            try:
+                while not self._idle and self._started >= self.workers:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.metrics.count("rejected")
+                        raise ParserBusy("Timed out waiting for a free resume parser")
+                    self._cond.wait(remaining)
+                if self._idle:
+                    self._busy += 1
+                    return self._idle.pop()
+                self._started += 1
+                self._busy += 1
+            finally:
+                self._waiting -= 1
+
+        # Start a new worker outside the lock; it takes a moment to import the parser
+        try:
+            return _Worker(self._context, self.max_pages, self.max_chars, self.pdf_processes)
+        except Exception:
+            self._release(None)
+            raise
+
+    def _release(self, worker: Optional[_Worker]):
+        """Return a worker to the pool, or None for one that was killed"""
+        with self._cond:
+            self._busy -= 1
+            if worker is None:
+                self._started -= 1
+            elif self._closed:
+                worker.stop()
+            else:
+                self._idle.append(worker)
+            self._cond.notify()
+
+    def _run(self, source: Source, file_type: str, stream: bool, queued: Optional[float]) -> Iterator[Dict]:
+        """Send one document to a worker; yields its previews (when streamed), then the result"""
+        queued = queued or time.perf_counter()
+        worker = self._acquire()
+        started = time.perf_counter()
+        deadline = started + self.timeout
+        settled = False  # the worker's pipe holds no unread messages
+        try:
+            try:
+                worker.conn.send((source, file_type, stream))
+                while True:
+                    if worker.conn.poll(max(0.0, deadline - time.perf_counter())):
+                        status, payload = worker.conn.recv()
+                    else:
+                        status = "timeout"
+                    if status != "partial":
+                        break
+                    yield payload
+            except (EOFError, OSError):
+                status = "crashed"
+            settled = status not in ("timeout", "crashed")
+        finally:
+            if not settled:
+                # Killing the process is the only way to stop a runaway (or abandoned) parse
+                worker.kill()
+                worker = None
+                self.metrics.count("restarts")
+            self._release(worker)
+
+        if status == "timeout":
+            self.metrics.count("timeouts")
+            raise ParseTimeout(f"Parsing the resume took longer than {self.timeout:.0f}s and was stopped")
+        if status == "crashed":
+            self.metrics.count("failed")
+            raise ResumeParseError("The resume parser crashed on this document")
+
+        self.metrics.record(started - queued, time.perf_counter() - started)
+        if status == "ok":
+            self.metrics.count("completed")
+            yield payload
+            return
+        error = ERRORS.get(status, ResumeParseError)
+        self.metrics.count("too_large" if error is DocumentTooLarge else "failed")
+        raise error(payload)
+
+    def parse(self, source: Source, file_type: str, queued: Optional[float] = None) -> Dict:
+        """parse_resume() result of a document, run in a worker process; `queued` is when it was submitted"""
+        for result in self._run(source, file_type, False, queued):
+            return result
+
+    def parse_stream(self, source: Source, file_type: str, queued: Optional[float] = None) -> Iterator[Dict]:
+        """
+        parse() that yields a {"partial": True, ...} preview after every PDF
+        page, then the result. The worker is held until the last item is read.
+        """
+        return self._run(source, file_type, True, queued)
+
+    def _admit(self):
+        with self._cond:
+            if self._closed:
+                raise ParserBusy("Resume parser is shutting down")
+            if self._admitted >= self.workers + self.max_queue:
+                self.metrics.count("rejected")
+                raise ParserBusy("Too many resumes are being parsed right now, please try again shortly")
+            self._admitted += 1
+            self._handed_off += 1
+
+    def _parse_admitted(self, source: Source, file_type: str, queued: float) -> Dict:
+        with self._cond:
+            self._handed_off -= 1
+        return self.parse(source, file_type, queued)
+
+    def _finish_admitted(self, future):
+        with self._cond:
+            self._admitted -= 1
+            if future is None or future.cancelled():
+                self._handed_off -= 1
+
+    def submit(self, source: Source, file_type: str) -> Future:
+        """parse() on one of the pool's threads; raises ParserBusy right away when the pool and its queue are full"""
+        self._admit()
+        queued = time.perf_counter()
+        try:
+            future = self._threads.submit(self._parse_admitted, source, file_type, queued)
+        except RuntimeError:
+            # Executor already shut down
+            self._finish_admitted(None)
+            raise ParserBusy("Resume parser is shutting down")
+        # Released when the parse ends, even if the request that awaited it is cancelled
+        future.add_done_callback(self._finish_admitted)
+        return future
+
+    async def parse_async(self, source: Source, file_type: str) -> Dict:
+        """parse() for request handlers: rejected right away when the pool and its queue are full"""
+        return await asyncio.wrap_future(self.submit(source, file_type))
+
+    async def parse_stream_async(self, source: Source, file_type: str) -> AsyncIterator[Dict]:
+        """parse_stream() for request handlers, admitted like parse_async()"""
+        self._admit()
+        loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+
+        def produce(queued: float):
+            with self._cond:
+                self._handed_off -= 1
+            try:
+                for item in self.parse_stream(source, file_type, queued):
+                    loop.call_soon_threadsafe(items.put_nowait, (item, None))
+            except Exception as e:
+                loop.call_soon_threadsafe(items.put_nowait, (None, e))
+            else:
+                loop.call_soon_threadsafe(items.put_nowait, (None, None))
+
+        try:
+            future = self._threads.submit(produce, time.perf_counter())
+        except RuntimeError:
+            self._finish_admitted(None)
+            raise ParserBusy("Resume parser is shutting down")
+        future.add_done_callback(self._finish_admitted)
+        while True:
+            item, error = await items.get()
+            if error is not None:
+                raise error
+            if item is None:
+                return
+            yield item
+
+    def status(self) -> Dict:
+        with self._cond:
+            state = {
+                "workers": self.workers,
+                "started": self._started,
+                "busy": self._busy,
+                "idle": len(self._idle),
+                "queue_depth": self._waiting + self._handed_off,
+                "max_queue": self.max_queue,
+                "timeout_seconds": self.timeout,
+                "max_pages": self.max_pages,
+                "max_text_chars": self.max_chars,
+                "pdf_processes": self.pdf_processes,
+            }
+        state.update(self.metrics.snapshot())
+        return state
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._started -= len(idle)
+            self._cond.notify_all()
+        for worker in idle:
+            worker.stop()
+        self._threads.shutdown(wait=False)
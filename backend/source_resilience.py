@@ -0,0 +1,190 @@
+"""
+Failure handling for job board requests: retries with exponential backoff
+and full jitter, a per-source circuit breaker and per-source metrics.
+
+Breakers and metrics are shared by every AsyncJobSourceClient of the
+process (scheduled runs, admin runs, scripts), so a source that keeps
+failing is skipped by the next run too until its reset timeout passes.
+"""
+from typing import Callable, Deque, Dict, Optional
+from collections import deque
+import random
+import threading
+import time
+import httpx
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose breaker is open"""
+
+    def __init__(self, source: str, retry_in: float):
+        super().__init__(f"{source} circuit is open, retrying in {retry_in:.0f}s")
+        self.source = source
+        self.retry_in = retry_in
+
+
+def is_source_failure(error: Exception) -> bool:
+    """Errors that say the source is unhealthy: timeouts, connection errors, 5xx and 429"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+class RetryPolicy:
+    """How often and how long to wait before retrying a failed request"""
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 max_retry_after: float = 30.0, rng: Optional[random.Random] = None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.rng = rng or random.Random()
+
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        """attempt is 1 for the first try"""
+        return attempt < self.attempts and is_source_failure(error)
+
+    def delay(self, error: Exception, attempt: int) -> float:
+        """Retry-After of a 429 if the source sent one, else full jitter exponential backoff"""
+        if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+            retry_after = error.response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_retry_after)
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures. While
+    open, calls fail fast with CircuitOpenError. After `reset_timeout`
+    seconds one probe call is let through (half open); its success closes
+    the circuit, its failure opens it again. Errors that are not source
+    failures (4xx, bad bodies) count as successes.
+    """
+
+    def __init__(self, source: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.source = source
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == "closed":
+                return
+            waited = self.clock() - self.opened_at
+            if self.state == "open" and waited >= self.reset_timeout:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenError(self.source, max(0.0, self.reset_timeout - waited))
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def release_probe(self):
+        """A call that ended without an answer (cancelled); let the next call probe instead"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"⚡ {self.source} circuit opened after {self.failures} failures")
+                self.state = "open"
+                self.opened_at = self.clock()
+                self._probing = False
+
+    def status(self) -> Dict:
+        return {"state": self.state, "consecutive_failures": self.failures}
+
+
+class SourceMetrics:
+    """Request counts and latency percentiles of one source"""
+
+    def __init__(self, window: int = 1000):
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.rejected = 0  # calls refused by an open circuit
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool):
+        with self._lock:
+            self.requests += 1
+            if ok:
+                self.successes += 1
+            else:
+                self.failures += 1
+            self.latencies.append(seconds)
+
+    def count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def percentile(self, share: float) -> Optional[float]:
+        with self._lock:
+            ordered = sorted(self.latencies)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+    def snapshot(self) -> Dict:
+        latency = {
+            name: round(value * 1000, 1) if value is not None else None
+            for name, value in (("p50_ms", self.percentile(0.5)), ("p95_ms", self.percentile(0.95)),
+                                ("p99_ms", self.percentile(0.99)))
+        }
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "error_rate": round(self.failures / self.requests, 3) if self.requests else 0.0,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "rejected": self.rejected,
+            "latency": latency,
+        }
+
+
+# Process-wide state per source name
+source_breakers: Dict[str, CircuitBreaker] = {}
+source_metrics: Dict[str, SourceMetrics] = {}
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    return source_breakers.setdefault(source, CircuitBreaker(source))
+
+
+def get_metrics(source: str) -> SourceMetrics:
+    return source_metrics.setdefault(source, SourceMetrics())
+
+
+def health_status() -> Dict:
+    return {
+        source: {
+            "circuit": get_breaker(source).status(),
+            "metrics": get_metrics(source).snapshot(),
+        }
+        for source in sorted(set(source_breakers) | set(source_metrics))
+    }
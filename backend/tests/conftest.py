@@ -0,0 +1,29 @@
+"""
+Shared fixtures for the backend tests
+"""
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# backend.main connects and creates its tables on import, so point it at a throwaway
+# SQLite file (never the configured database) before anything imports backend.database
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='backend-tests-'), 'app.db')}"
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ["RUN_SCHEDULER"] = "false"
+
+from backend.database import Base
+
+
+@pytest.fixture
+def db():
+    """Session on a fresh in-memory SQLite database with every table created"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
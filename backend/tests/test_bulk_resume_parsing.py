@@ -0,0 +1,111 @@
+"""
+Tests for batch parsing of zips of resumes
+"""
+import asyncio
+import io
+import json
+import zipfile
+
+import httpx
+
+from backend.benchmarks.synthetic_resumes import render_docx, render_pdf, synthetic_resumes
+from backend.bulk_resume_parsing import parse_batch, zip_documents
+from backend.enhanced_resume_parser import EnhancedResumeParser
+from backend.resume_cache import ResumeParseCache
+from backend.resume_parsing import ResumeParserPool
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as package:
+        for name, content in members.items():
+            package.writestr(name, content)
+    return zipfile.ZipFile(buffer)
+
+
+def test_batch_is_deduplicated_cached_and_reports_every_document(db):
+    first, second = synthetic_resumes(2)
+    package = make_zip({
+        "cvs/first.pdf": render_pdf(first),
+        "cvs/second.docx": render_docx(second),
+        "cvs/first_again.pdf": render_pdf(first),
+        "cvs/broken.pdf": b"not a pdf",
+        "cvs/huge.pdf": b"%PDF" + b" " * 200000,
+        "cvs/notes.txt": b"not a resume",
+        "__MACOSX/cvs/._first.pdf": b"resource fork",
+    })
+    cache = ResumeParseCache(EnhancedResumeParser())
+    pool = ResumeParserPool(workers=1)
+    try:
+        records = list(parse_batch(pool, zip_documents(package, max_bytes=100000), cache=cache, db=db))
+        again = list(parse_batch(pool, zip_documents(package, max_bytes=100000), cache=cache, db=db))
+    finally:
+        pool.close()
+
+    summary = records.pop()["summary"]
+    assert (summary["documents"], summary["parsed"], summary["duplicates"], summary["failed"]) == (5, 2, 1, 2)
+    by_name = {record["filename"]: record for record in records}
+    assert by_name.keys() == {"cvs/first.pdf", "cvs/second.docx", "cvs/first_again.pdf", "cvs/broken.pdf", "cvs/huge.pdf"}
+    assert by_name["cvs/first_again.pdf"]["duplicate_of"] == "cvs/first.pdf"
+    assert by_name["cvs/broken.pdf"]["status_code"] == 422
+    assert by_name["cvs/huge.pdf"]["status_code"] == 413
+    assert by_name["cvs/second.docx"]["data"]["contact_info"]["email"]
+
+    # Parsed documents were stored, so the same batch again needs no parser
+    assert again.pop()["summary"]["cached"] == 2
+    assert {record["filename"] for record in again if record["status"] == "cached"} == {"cvs/first.pdf", "cvs/second.docx"}
+
+
+def test_bulk_endpoint_streams_records_and_leaves_a_worker_for_single_uploads(monkeypatch):
+    from backend import main
+
+    pool = ResumeParserPool(workers=2, max_queue=0)
+    submitted, peak = [], []
+
+    def submit(content, file_type):
+        in_flight = sum(not future.done() for future in submitted)
+        submitted.append(ResumeParserPool.submit(pool, content, file_type))
+        peak.append(in_flight + 1)
+        return submitted[-1]
+
+    monkeypatch.setattr(pool, "submit", submit)
+    monkeypatch.setattr(main, "resume_parser_pool", pool)
+
+    first, second, third = synthetic_resumes(3)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as package:
+        for name, content in {
+            "first.pdf": render_pdf(first),
+            "second.docx": render_docx(second),
+            "third.pdf": render_pdf(third),
+            "first_again.pdf": render_pdf(first),
+            "broken.pdf": b"not a pdf",
+        }.items():
+            package.writestr(name, content)
+
+    async def send():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+            return await client.post("/api/upload-resumes/bulk",
+                                     files={"file": ("applications.zip", buffer.getvalue())})
+    try:
+        response = asyncio.run(send())
+    finally:
+        pool.close()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    summary = records.pop()["summary"]
+    assert (summary["documents"], summary["duplicates"], summary["failed"]) == (5, 1, 1)
+    assert summary["parsed"] + summary["cached"] == 3
+    by_name = {record["filename"]: record for record in records}
+    assert by_name["first_again.pdf"] == {
+        "filename": "first_again.pdf", "content_hash": by_name["first.pdf"]["content_hash"],
+        "status": "duplicate", "duplicate_of": "first.pdf",
+    }
+    assert by_name["broken.pdf"]["status_code"] == 422
+    assert by_name["second.docx"]["data"]["contact_info"]["email"]
+
+    # The batch kept one of the two workers free for /api/upload-resume
+    assert peak and max(peak) == 1
@@ -0,0 +1,90 @@
+"""
+Tests for incremental fetching against per-(source, query) watermarks
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+
+from backend.fetch_watermarks import WATERMARK_OVERLAP, is_seen, max_days_old
+from backend.job_api_service import JobAPIService
+from backend.job_sources import RESULTS_PER_PAGE, AsyncJobSourceClient
+
+WATERMARK = datetime(2025, 6, 10, 12, 0)
+
+
+def test_freshness_window_covers_the_overlap():
+    assert max_days_old(None) is None
+    assert max_days_old(WATERMARK, now=WATERMARK + timedelta(hours=2)) == 2
+    assert max_days_old(WATERMARK, now=WATERMARK + timedelta(days=3)) == 4
+
+
+def test_postings_inside_the_overlap_are_not_seen():
+    def job(offset):
+        return {"posted_date": WATERMARK + offset}
+
+    assert not is_seen(job(timedelta(hours=1)), WATERMARK)
+    # Indexed late by the source: older than the watermark, but inside the overlap
+    assert not is_seen(job(-timedelta(hours=6)), WATERMARK)
+    assert is_seen(job(-WATERMARK_OVERLAP - timedelta(minutes=1)), WATERMARK)
+    assert not is_seen({"posted_date": None}, WATERMARK)
+    assert not is_seen(job(-timedelta(days=30)), None)
+
+
+def test_paging_stops_at_the_first_page_past_the_overlap():
+    # Newest first: page 1 is new, page 2 is inside the overlap, page 3 reaches older postings
+    ages = {
+        1: [-timedelta(hours=1)] * RESULTS_PER_PAGE,
+        2: [timedelta(hours=6)] * RESULTS_PER_PAGE,
+        3: [timedelta(hours=20)] * 5 + [timedelta(days=3)] * (RESULTS_PER_PAGE - 5),
+        4: [timedelta(days=4)] * RESULTS_PER_PAGE,
+    }
+    requested = []
+
+    def respond(request):
+        page = int(request.url.path.rstrip("/").rsplit("/", 1)[-1])
+        requested.append(page)
+        created = [(WATERMARK - age).strftime("%Y-%m-%dT%H:%M:%SZ") for age in ages[page]]
+        return httpx.Response(200, json={"results": [
+            {"id": f"{page}-{i}", "title": "Python Developer", "created": value} for i, value in enumerate(created)
+        ]})
+
+    service = JobAPIService()
+    service.adzuna_app_id, service.adzuna_api_key = "test-id", "test-key"
+
+    async def run():
+        async with AsyncJobSourceClient(service, sources=("adzuna",), transport=httpx.MockTransport(respond),
+                                        breakers={}, metrics={}) as client:
+            return await client.fetch_until_seen("adzuna", "python", WATERMARK, max_pages=4)
+
+    page_results = asyncio.run(run())
+
+    assert requested == [1, 2, 3]
+    assert [len(jobs) for _, jobs in page_results] == [RESULTS_PER_PAGE, RESULTS_PER_PAGE, 5]
+
+
+def test_relevance_ordered_sources_fetch_every_planned_page():
+    # JSearch ranks by relevance, so a seen posting on page 1 says nothing about page 2
+    ages = [timedelta(hours=1), timedelta(days=3)] * (RESULTS_PER_PAGE // 2)
+    requested = []
+
+    def respond(request):
+        page = int(request.url.params["page"])
+        requested.append(page)
+        return httpx.Response(200, json={"data": [
+            {"job_id": f"{page}-{i}", "job_title": "Python Developer",
+             "job_posted_at_timestamp": (WATERMARK - age).timestamp()} for i, age in enumerate(ages)
+        ]})
+
+    service = JobAPIService()
+    service.jsearch_api_key = "test-key"
+
+    async def run():
+        async with AsyncJobSourceClient(service, sources=("jsearch",), transport=httpx.MockTransport(respond),
+                                        breakers={}, metrics={}) as client:
+            return await client.fetch_until_seen("jsearch", "python", WATERMARK, max_pages=3)
+
+    page_results = asyncio.run(run())
+
+    assert requested == [1, 2, 3]
+    assert [len(jobs) for _, jobs in page_results] == [RESULTS_PER_PAGE // 2] * 3
@@ -0,0 +1,112 @@
+"""
+Tests for bulk job imports from JSONL and CSV files
+"""
+import json
+from concurrent.futures import Future
+from datetime import datetime, timezone
+
+import pytest
+
+from backend import import_jobs
+from backend.database import JobPosting
+from backend.import_jobs import ImportCheckpoint, _coerce, _ordered, import_file, read_records
+from backend.job_ingestion import JobIngestionPipeline
+
+
+def job(i):
+    return {
+        "external_id": f"feed-{i}",
+        "title": "Data Analyst",
+        "company_name": "Acme",
+        "description": f"Posting {i}: SQL, Excel and dashboards",
+    }
+
+
+def test_text_values_are_coerced():
+    record = _coerce({
+        "posted_date": "2025-06-01T09:30:00Z",
+        "salary_min": "30000",
+        "salary_max": "negotiable",
+        "requirements": '["SQL", "Excel"]',
+    }, "partner")
+
+    assert record["posted_date"] == datetime(2025, 6, 1, 9, 30, tzinfo=timezone.utc)
+    assert (record["salary_min"], record["salary_max"]) == (30000.0, None)
+    assert record["requirements"] == ["SQL", "Excel"]
+    assert record["source"] == "partner"
+    assert _coerce({"posted_date": "last week", "source": "adzuna"}, "partner") == \
+        {"posted_date": None, "source": "adzuna"}
+
+
+def test_jsonl_and_csv_records(tmp_path):
+    jsonl = tmp_path / "feed.jsonl"
+    jsonl.write_text(json.dumps(job(1)) + "\n\n" + json.dumps(job(2)) + "\n", encoding="utf-8")
+    csv_file = tmp_path / "feed.csv"
+    csv_file.write_text("external_id,title,salary_min\nfeed-1,Data Analyst,\nfeed-2,\"Analyst, BI\",30000\n",
+                        encoding="utf-8")
+
+    assert list(read_records(str(jsonl))) == [job(1), job(2)]
+    assert list(read_records(str(csv_file))) == [
+        {"external_id": "feed-1", "title": "Data Analyst"},
+        {"external_id": "feed-2", "title": "Analyst, BI", "salary_min": "30000"},
+    ]
+
+
+def test_at_most_ahead_chunks_are_in_flight():
+    class Pool:
+        in_flight = peak = 0
+
+        def submit(self, fn, records):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            future = Future()
+            future.set_result(records)
+            return future
+
+    pool = Pool()
+    results = []
+    for result, size, tag in _ordered(pool, (([i], i) for i in range(10)), ahead=3):
+        pool.in_flight -= 1
+        results.append(tag)
+
+    assert results == list(range(10))
+    assert pool.peak == 3
+
+
+def test_interrupted_import_resumes_after_the_last_chunk(tmp_path, monkeypatch, db):
+    path = tmp_path / "feed.jsonl"
+    path.write_text("".join(json.dumps(job(i)) + "\n" for i in range(10)), encoding="utf-8")
+
+    upsert = JobIngestionPipeline.upsert
+    calls = []
+
+    def interrupted_upsert(self, db, rows):
+        calls.append(len(rows))
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        upsert(self, db, rows)
+
+    monkeypatch.setattr(JobIngestionPipeline, "upsert", interrupted_upsert)
+    with pytest.raises(KeyboardInterrupt):
+        import_file(db, str(path), default_source="partner", workers=1, chunk_size=3)
+
+    totals, offset = ImportCheckpoint(str(path)).load()
+    assert totals["records"] == totals["added"] == 6
+    assert offset == len("".join(json.dumps(job(i)) + "\n" for i in range(6)).encode("utf-8"))
+
+    # The resumed run must start at the offset rather than re-read the committed records
+    read_from = []
+    read_jsonl = import_jobs.read_jsonl
+
+    def recorded_read_jsonl(path, offset=0):
+        read_from.append(offset)
+        return read_jsonl(path, offset)
+
+    monkeypatch.setattr(import_jobs, "read_jsonl", recorded_read_jsonl)
+    monkeypatch.setattr(JobIngestionPipeline, "upsert", upsert)
+    report = import_file(db, str(path), default_source="partner", workers=1, chunk_size=3)
+
+    assert read_from == [offset]
+    assert (report["records"], report["added"], report["updated"]) == (10, 10, 0)
+    assert db.query(JobPosting).count() == 10
+    assert ImportCheckpoint(str(path)).load() == ({}, None)
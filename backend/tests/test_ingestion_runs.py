@@ -0,0 +1,61 @@
+"""
+Tests for background ingestion runs
+"""
+import threading
+
+import pytest
+
+from backend.ingestion_runs import IngestionRunRegistry, RunInProgress
+
+
+def test_duplicate_runs_are_refused_and_progress_is_tracked():
+    registry = IngestionRunRegistry()
+    release = threading.Event()
+
+    def target(run):
+        run.update("plan", {"requests": [
+            {"source": "adzuna", "query": "data analyst", "page": 1},
+            {"source": "adzuna", "query": "data analyst", "page": 2},
+        ]})
+        run.update("page", {"source": "adzuna", "query": "data analyst", "page": 1, "jobs": 20, "error": None})
+        release.wait(5)
+        return {"jobs_added": 20}
+
+    run = registry.start("populate-jobs", ["data analyst"], target)
+    with pytest.raises(RunInProgress) as refused:
+        registry.start("populate-jobs", ["data analyst"], target)
+    assert refused.value.run is run
+
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == f"ingestion-{run.id}":
+            thread.join(5)
+
+    snapshot = registry.get(run.id).snapshot()
+    assert snapshot["status"] == "succeeded"
+    assert snapshot["report"] == {"jobs_added": 20}
+    assert snapshot["queries"][0]["pages_planned"] == 2
+    assert snapshot["queries"][0]["jobs"] == 20
+    assert registry.active("populate-jobs") is None
+
+
+def test_scheduled_runs_share_the_name_and_run_in_the_calling_thread():
+    registry = IngestionRunRegistry()
+    release = threading.Event()
+    manual = registry.start("populate-jobs", ["data analyst"], lambda run: release.wait(5) and {})
+
+    with pytest.raises(RunInProgress) as refused:
+        registry.run("populate-jobs", ["python developer"], lambda run: {"jobs_added": 1})
+    assert refused.value.run is manual
+
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == f"ingestion-{manual.id}":
+            thread.join(5)
+
+    threads = []
+    scheduled = registry.run("populate-jobs", ["python developer"],
+                             lambda run: threads.append(threading.current_thread()) or {"jobs_added": 1})
+    assert threads == [threading.current_thread()]
+    assert [run.snapshot()["trigger"] for run in registry.recent()] == ["scheduled", "manual"]
+    assert scheduled.snapshot()["report"] == {"jobs_added": 1}
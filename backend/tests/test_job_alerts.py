@@ -0,0 +1,40 @@
+"""
+Tests for the alert percolator
+"""
+from backend.database import JobAlert, JobPosting, UserJobPreferences
+from backend.job_alerts import AlertCriteria, AlertPercolator
+
+
+def make_percolator():
+    percolator = AlertPercolator()
+    rows = [
+        (1, UserJobPreferences(must_have_skills=["python"], preferred_titles=["data analyst"],
+                               preferred_locations='["london"]', notification_frequency="instant")),
+        (2, None),
+        (3, UserJobPreferences(must_have_skills=["java"], notification_frequency="weekly")),
+    ]
+    for alert_id, preferences in rows:
+        alert = JobAlert(id=alert_id, user_id=alert_id * 10, min_match_score=50)
+        percolator.add(AlertCriteria(alert, preferences))
+    return percolator
+
+
+def test_all_fields_must_hit():
+    percolator = make_percolator()
+    job = JobPosting(title="Senior Data Analyst", location="London, UK", required_skills=["python", "sql"])
+    assert sorted(c.alert_id for c in percolator.match(job)) == [1, 2]
+
+    job = JobPosting(title="Senior Data Analyst", location="Leeds", required_skills=["python"])
+    assert [c.alert_id for c in percolator.match(job)] == [2]
+
+
+def test_percolate_groups_by_user():
+    percolator = make_percolator()
+    jobs = [
+        JobPosting(title="Java Developer", location="Leeds", required_skills=["java"]),
+        JobPosting(title="Analyst", location="Leeds", required_skills=[]),
+    ]
+    candidates = percolator.percolate(jobs)
+    assert set(candidates) == {20, 30}
+    assert len(candidates[20]) == 2
+    assert candidates[30][0][0].frequency == "weekly"
@@ -0,0 +1,30 @@
+"""
+Tests for the posting classifiers
+"""
+import pytest
+
+from backend.job_classifier import classify_job
+
+
+@pytest.mark.parametrize("title, description, expected", [
+    ("Junior Python Developer", "Work from home. Django, REST API and PostgreSQL.",
+     ("Junior", "remote", ["django", "sql", "postgresql", "rest api"])),
+    ("Data Analyst", "Hybrid role, 2 days in the office. Excel and SQL dashboards.",
+     ("Mid", "hybrid", ["sql"])),
+    ("Frontend Engineer", "Fully remote. JavaScript, TypeScript and React; GitHub Actions for CI/CD.",
+     ("Mid", "remote", ["java", "javascript", "typescript", "react", "git", "ci/cd"])),
+    ("Backend Developer", "5-7 years with Java, Spring and Kubernetes on AWS. Flexible working.",
+     ("Senior", "hybrid", ["java", "spring", "aws", "kubernetes"])),
+    ("Graduate Software Engineer", "Training in Python and Git, office based in Leeds.",
+     ("Junior", "onsite", ["python", "git"])),
+    ("Engineering Manager", "Lead a team of 8. Agile and Scrum, remote option available.",
+     ("Senior", "hybrid", ["agile", "scrum"])),
+    ("Operations Coordinator", "", ("Mid", "onsite", [])),
+])
+def test_labels(title, description, expected):
+    assert tuple(classify_job(title, description)) == expected
+
+
+def test_title_only_counts_for_experience_level():
+    labels = classify_job("Senior Remote Work Lead", "Python in the office")
+    assert labels == ("Senior", "onsite", ["python"])
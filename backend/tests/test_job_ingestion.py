@@ -0,0 +1,112 @@
+"""
+Tests for the ingestion pipeline's write path
+"""
+import httpx
+
+from backend.database import JobPosting
+from backend.job_api_service import JobAPIService
+from backend.job_ingestion import JobIngestionPipeline
+from backend.job_retention import archive_chunk
+from backend.response_archive import ResponseArchive
+
+
+def raw_job(external_id, description="Python and SQL, remote friendly"):
+    return {
+        "external_id": external_id,
+        "title": "Junior Data Analyst",
+        "company_name": "Acme",
+        "location": "London",
+        "description": description,
+        "source": "adzuna",
+    }
+
+
+def test_unchanged_jobs_are_not_rewritten(db):
+    pipeline = JobIngestionPipeline(JobAPIService())
+
+    counts = pipeline.process(db, [raw_job("a1"), raw_job("a2")], {})
+    assert (counts["added"], counts["updated"], counts["unchanged"]) == (2, 0, 0)
+    first_write = db.query(JobPosting).filter_by(external_id="a1").one().updated_at
+
+    counts = pipeline.process(db, [raw_job("a1"), raw_job("a2", "Now with Tableau")], {})
+    assert (counts["added"], counts["updated"], counts["unchanged"]) == (0, 1, 1)
+    db.expire_all()
+    assert db.query(JobPosting).filter_by(external_id="a1").one().updated_at == first_write
+    assert db.query(JobPosting).filter_by(external_id="a2").one().description == "Now with Tableau"
+
+    counts = pipeline.process(db, [raw_job("a1")], {}, force=True)
+    assert counts["updated"] == 1
+
+
+def test_reposts_are_linked_to_the_first_posting(db):
+    pipeline = JobIngestionPipeline(JobAPIService())
+    description = (
+        "We are looking for a backend developer with AWS and DevOps experience to build "
+        "and run our payment services. You will work with Python, Docker and Terraform "
+        "in a small team and own features from design to production."
+    )
+    jobs = [
+        dict(raw_job("agency-1", description), title="Backend Developer (AWS / DevOps)"),
+        dict(raw_job("agency-2", description + " Apply today!"), title="Backend Developer (AWS / DevOps)"),
+        dict(raw_job("other", "Analyse sales data in Excel and build weekly dashboards for the finance team.")),
+    ]
+
+    counts = pipeline.process(db, jobs, {})
+    assert counts["duplicates"] == 1
+
+    by_id = {job.external_id: job for job in db.query(JobPosting)}
+    assert by_id["agency-1"].duplicate_of_id is None
+    assert by_id["agency-2"].duplicate_of_id == by_id["agency-1"].id
+    assert by_id["other"].duplicate_of_id is None
+
+
+def test_salary_and_company_are_normalized(db):
+    pipeline = JobIngestionPipeline(JobAPIService())
+    jobs = [
+        dict(raw_job("gbp"), company_name="Acme Software Ltd.", salary_min=40000, salary_max=52000),
+        dict(raw_job("usd"), salary_min=40, salary_max=60, salary_currency="USD", salary_period="HOUR"),
+        dict(raw_job("none")),
+        # No period given: the range is guessed as one (daily, monthly), never a mix
+        dict(raw_job("usd_range"), salary_min=100, salary_max=200, salary_currency="USD"),
+        dict(raw_job("gbp_range"), salary_min=9000, salary_max=12000),
+    ]
+    pipeline.process(db, jobs, {})
+
+    stored = {job.external_id: job for job in db.query(JobPosting)}
+    assert (stored["gbp"].salary_annual_max, stored["gbp"].salary_band) == (52000, "50k_70k")
+    assert stored["gbp"].company_key == "acme software"
+    assert stored["usd"].salary_annual_max == round(60 * 1950 * 0.79)
+    assert stored["none"].salary_annual_max is None and stored["none"].salary_band is None
+    assert (stored["usd_range"].salary_annual_min, stored["usd_range"].salary_annual_max) == (
+        round(100 * 230 * 0.79), round(200 * 230 * 0.79)
+    )
+    assert (stored["gbp_range"].salary_annual_min, stored["gbp_range"].salary_annual_max) == (9000, 12000)
+    assert stored["gbp_range"].salary_band == "under_25k"
+
+
+def test_replay_keeps_retention_decisions(tmp_path, db):
+    service = JobAPIService()
+    service.adzuna_app_id, service.adzuna_api_key = "test-id", "test-key"
+
+    def respond(request):
+        return httpx.Response(200, json={"results": [
+            {"id": f"job-{i}", "title": "Python Developer", "description": "Python and SQL",
+             "company": {"display_name": "Acme"}, "created": "2025-06-01T09:00:00Z"}
+            for i in range(5)
+        ]})
+
+    archive = ResponseArchive(str(tmp_path))
+    recorder = JobIngestionPipeline(service, transport=httpx.MockTransport(respond), archive=archive)
+    recorder.run_sync(db, ["python"], max_jobs=5, call_budget=1)
+    assert archive.stats()["pages"] == {"adzuna": 1}
+
+    # Retention deactivates one posting and moves another to job_postings_archive
+    db.query(JobPosting).filter_by(external_id="job-0").update({"is_active": False})
+    archive_chunk(db, [db.query(JobPosting).filter_by(external_id="job-1").one().id])
+
+    report = JobIngestionPipeline(service, batch_size=2).replay(db, archive, force=True)
+
+    assert report["jobs_fetched"] == 5
+    assert (report["jobs_updated"], report["jobs_skipped_archived"]) == (4, 1)
+    active = {job.external_id: job.is_active for job in db.query(JobPosting)}
+    assert active == {"job-0": False, "job-2": True, "job-3": True, "job-4": True}
@@ -0,0 +1,68 @@
+"""
+Tests for chunked retention of expired job postings
+"""
+from datetime import datetime, timedelta
+
+from backend.database import ArchivedJobPosting, JobApplication, JobMatch, JobPosting
+from backend.job_api_service import JobAPIService
+from backend.job_dedup import canonical_only
+from backend.job_ingestion import JobIngestionPipeline
+from backend.job_retention import apply_retention
+
+
+def test_expired_jobs_are_archived_unless_referenced(db):
+    now = datetime(2025, 6, 1)
+    old, fresh = now - timedelta(days=120), now - timedelta(days=3)
+    jobs = {
+        name: JobPosting(external_id=name, title=name, source="adzuna", posted_date=posted, is_active=True)
+        for name, posted in [("applied", old), ("expired", old), ("repost", fresh), ("fresh", fresh)]
+    }
+    db.add_all(jobs.values())
+    db.flush()
+    jobs["repost"].duplicate_of_id = jobs["expired"].id
+    db.add(JobApplication(user_id=1, job_id=jobs["applied"].id))
+    db.add(JobMatch(user_id=1, job_id=jobs["expired"].id, overall_score=80))
+    db.commit()
+
+    report = apply_retention(db, chunk_size=1, now=now)
+
+    assert (report["archived"], report["deactivated"]) == (1, 1)
+    db.expire_all()
+    remaining = {job.external_id: job for job in db.query(JobPosting)}
+    assert set(remaining) == {"applied", "repost", "fresh"}
+    assert remaining["applied"].is_active is False
+    assert remaining["repost"].duplicate_of_id is None
+    assert db.query(JobMatch).count() == 0
+    archived = db.query(ArchivedJobPosting).one()
+    assert archived.external_id == "expired" and archived.data["title"] == "expired"
+
+    assert apply_retention(db, now=now)["archived"] == 0
+
+
+def test_reposts_of_a_referenced_canonical_stay_visible(db):
+    now = datetime(2025, 6, 1)
+    pipeline = JobIngestionPipeline(JobAPIService())
+    description = (
+        "We are looking for a backend developer with AWS and DevOps experience to build "
+        "and run our payment services. You will work with Python, Docker and Terraform "
+        "in a small team and own features from design to production."
+    )
+
+    def repost(external_id, suffix=""):
+        return {"external_id": external_id, "title": "Backend Developer (AWS / DevOps)", "company_name": "Acme",
+                "description": description + suffix, "source": "adzuna"}
+
+    pipeline.process(db, [repost("original"), repost("repost", " Apply today!")], {})
+    original = db.query(JobPosting).filter_by(external_id="original").one()
+    original.posted_date = now - timedelta(days=120)
+    db.add(JobApplication(user_id=1, job_id=original.id))
+    db.commit()
+
+    assert apply_retention(db, now=now)["deactivated"] == 1
+
+    visible = canonical_only(db.query(JobPosting).filter(JobPosting.is_active == True))
+    assert [job.external_id for job in visible] == ["repost"]
+    # The promoted canonical is indexed, so the next repost links to it
+    pipeline.process(db, [repost("third", " Apply now!")], {})
+    promoted = db.query(JobPosting).filter_by(external_id="repost").one()
+    assert db.query(JobPosting).filter_by(external_id="third").one().duplicate_of_id == promoted.id
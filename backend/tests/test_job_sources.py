@@ -0,0 +1,119 @@
+"""
+Tests for the resilient job source client, against the local fake job boards
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from backend.benchmarks.fake_job_boards import FakeJobBoard, use_base_urls
+from backend.job_api_service import JobAPIService
+from backend.job_sources import AdzunaSource, AsyncJobSourceClient, JSearchSource, PageRequest, register_source
+from backend.source_resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+@pytest.fixture
+def api_service():
+    use_base_urls(FakeJobBoard.base_urls())
+    service = JobAPIService()
+    service.adzuna_app_id, service.adzuna_api_key = "test-id", "test-key"
+    yield service
+    register_source(AdzunaSource())
+    register_source(JSearchSource())
+
+
+def fetch(api_service, transport, requests, **client_options):
+    async def run():
+        async with AsyncJobSourceClient(api_service, sources=("adzuna",), transport=transport,
+                                        breakers={}, metrics={}, **client_options) as client:
+            return await client.fetch_pages(requests), client
+    return asyncio.run(run())
+
+
+def test_failed_pages_are_retried_until_they_succeed(api_service):
+    board = FakeJobBoard(pages=3, error_rate=0.3, rate_limit_rate=0.1, seed=7)
+    requests = [PageRequest("adzuna", query, page) for query in ("python", "sql") for page in (1, 2, 3)]
+
+    results, client = fetch(api_service, board.transport(), requests,
+                            retry_policy=RetryPolicy(attempts=6, base_delay=0, max_retry_after=0))
+
+    assert all(len(jobs) == 20 for _, jobs in results)
+    metrics = client.metrics("adzuna").snapshot()
+    assert metrics["retries"] > 0 and metrics["failures"] == metrics["retries"]
+    assert client.calls_sent["adzuna"] == board.stats["adzuna"]["requests"] == len(requests) + metrics["retries"]
+
+
+def test_open_circuit_fails_fast(api_service):
+    board = FakeJobBoard(pages=1, error_rate=1.0)
+    requests = [PageRequest("adzuna", f"query {i}", 1) for i in range(10)]
+
+    async def run():
+        breakers = {"adzuna": CircuitBreaker("adzuna", failure_threshold=3, reset_timeout=60)}
+        async with AsyncJobSourceClient(api_service, sources=("adzuna",), transport=board.transport(),
+                                        concurrency={"adzuna": 1}, breakers=breakers, metrics={},
+                                        retry_policy=RetryPolicy(attempts=2, base_delay=0)) as client:
+            return await client.fetch_pages(requests), client
+
+    results, client = asyncio.run(run())
+
+    assert all(isinstance(result, Exception) for _, result in results)
+    assert sum(isinstance(result, CircuitOpenError) for _, result in results) >= 7
+    assert board.stats["adzuna"]["requests"] == 3
+    assert client.breaker("adzuna").state == "open"
+
+
+def test_hedged_request_wins_over_a_stalled_one(api_service):
+    board = FakeJobBoard(pages=1)
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={"results": [FakeJobBoard.adzuna_item(p) for p in board.feed("adzuna", "python", 1)]})
+
+    results, client = fetch(api_service, httpx.MockTransport(handler), [PageRequest("adzuna", "python", 1)],
+                            hedge_after={"adzuna": 0.05})
+
+    assert len(results[0][1]) == 20
+    assert len(calls) == 2
+    assert client.metrics("adzuna").snapshot()["hedge_wins"] == 1
+
+
+def test_half_open_probe_with_a_client_error_closes_the_circuit(api_service):
+    statuses = iter([500, 401, 200, 200])
+    now = [0.0]
+
+    def respond(request):
+        return httpx.Response(next(statuses), json={"results": []})
+
+    async def run():
+        breaker = CircuitBreaker("adzuna", failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+        async with AsyncJobSourceClient(api_service, sources=("adzuna",), transport=httpx.MockTransport(respond),
+                                        breakers={"adzuna": breaker}, metrics={},
+                                        retry_policy=RetryPolicy(attempts=1)) as client:
+            outcomes = []
+            for at in (0, 20, 21, 22):
+                now[0] = at
+                outcomes.append((await client.fetch_pages([PageRequest("adzuna", "python", 1)]))[0][1])
+            return outcomes, breaker
+
+    outcomes, breaker = asyncio.run(run())
+
+    assert isinstance(outcomes[0], httpx.HTTPStatusError)
+    # The 401 probe answered, so the source is up: the circuit closes instead of staying half open
+    assert isinstance(outcomes[1], httpx.HTTPStatusError) and outcomes[1].response.status_code == 401
+    assert outcomes[2:] == [[], []]
+    assert breaker.state == "closed"
+
+
+def test_cancelled_probe_lets_the_next_call_probe():
+    breaker = CircuitBreaker("adzuna", failure_threshold=1, reset_timeout=10, clock=lambda: 20.0)
+    breaker.record_failure()
+    breaker.opened_at = 0.0
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.release_probe()
+    breaker.before_call()
+    assert breaker.state == "half_open"
@@ -0,0 +1,33 @@
+"""
+Tests for the per-source API quota ledger
+"""
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.quota_planner import QuotaLedger
+
+NOW = datetime(2025, 6, 10, 9, 0)
+
+
+def test_concurrent_runs_do_not_lose_calls(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'quota.db'}")
+    Base.metadata.create_all(bind=engine)
+    scheduled, manual = sessionmaker(bind=engine)(), sessionmaker(bind=engine)()
+    ledger = QuotaLedger({"jsearch": 100})
+    ledger.usage(scheduled, "jsearch", NOW)
+    scheduled.commit()
+
+    # The scheduled run has read the month's usage when a manual run records its calls
+    usage = ledger.usage(scheduled, "jsearch", NOW)
+    assert usage.calls_used == 0
+    ledger.record_calls(manual, "jsearch", 3, failed=1, now=NOW)
+    ledger.record_calls(scheduled, "jsearch", 2, now=NOW)
+
+    usage = ledger.usage(scheduled, "jsearch", NOW)
+    assert (usage.calls_used, usage.calls_failed) == (5, 1)
+    assert ledger.remaining(scheduled, "jsearch", NOW) == 95
+    scheduled.close()
+    manual.close()
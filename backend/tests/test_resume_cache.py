@@ -0,0 +1,43 @@
+"""
+Tests for the content-hash cache of parsed resumes
+"""
+from backend.benchmarks.synthetic_resumes import synthetic_resumes
+from backend.database import ResumeAnalysis
+from backend.enhanced_resume_parser import EnhancedResumeParser
+from backend.resume_cache import ResumeParseCache, content_hash
+
+
+def test_stored_parse_is_returned_for_the_same_bytes(db):
+    parser = EnhancedResumeParser()
+    text = next(synthetic_resumes(1))
+    parsed = parser.parse_text(text)
+    digest = content_hash(text.encode())
+
+    cache = ResumeParseCache(parser, max_entries=1)
+    assert cache.get(db, digest) is None
+    cache.put(db, digest, "resume.pdf", parsed, user_id=7)
+    assert cache.get(db, digest) is parsed
+
+    # A fresh process only has the database row, which rebuilds the same result
+    restarted = ResumeParseCache(EnhancedResumeParser())
+    assert restarted.get(db, digest) == parsed
+    assert restarted.stats()["hits"] == {"memory": 0, "database": 1}
+    assert db.query(ResumeAnalysis).one().user_id == 7
+
+    # Parses of another parser version are ignored
+    assert ResumeParseCache(parser, parser_version=0).get(db, digest) is None
+
+    # A second worker that missed at the same time stores nothing new
+    ResumeParseCache(parser).put(db, digest, "copy.pdf", parsed)
+    assert db.query(ResumeAnalysis).count() == 1
+    assert restarted.get(db, digest) == parsed
+
+
+def test_errors_are_not_cached_and_lru_evicts_oldest(db):
+    cache = ResumeParseCache(EnhancedResumeParser(), max_entries=2)
+    cache.put(db, "bad", "bad.pdf", {"error": "Could not extract text from file"})
+    assert db.query(ResumeAnalysis).count() == 0
+
+    for digest in ("a", "b", "c"):
+        cache._remember(digest, {"digest": digest})
+    assert list(cache._entries) == ["b", "c"]
@@ -0,0 +1,100 @@
+"""
+Regression tests for the resume text extractors
+"""
+from backend.benchmarks.resume_parser_benchmark import (
+    legacy_extract_education, legacy_extract_experience, legacy_extract_skills, regression_corpus,
+    without_repeated_last_job,
+)
+from backend.enhanced_resume_parser import EnhancedResumeParser
+
+
+def test_skills_match_the_original_pattern_loop():
+    parser = EnhancedResumeParser()
+    for text in regression_corpus(resumes=500):
+        assert parser.extract_skills(text) == legacy_extract_skills(parser.tech_skills, text), text[:80]
+
+
+def test_skill_forms():
+    skills = EnhancedResumeParser().extract_skills("Vue.js, GitLab CI and docker certified; not Javascripting")
+    assert skills["frameworks_libraries"] == ["Vue"]
+    assert skills["cloud_devops"] == ["Docker", "Gitlab Ci"]
+    assert skills["tools_platforms"] == ["Gitlab"]
+    # "docker certified" also reads as "r certified", as it always has
+    assert skills["programming_languages"] == ["R"]
+
+
+def test_sections_match_the_original_line_walks():
+    parser = EnhancedResumeParser()
+    for text in regression_corpus(resumes=500):
+        layout = parser.segment(text)
+        assert parser.extract_education(text, layout) == legacy_extract_education(text), text[:80]
+        # The legacy walk listed the last job twice when the next heading closed the section
+        assert parser.extract_experience(text, layout) == \
+            without_repeated_last_job(legacy_extract_experience(parser.experience_keywords, text)), text[:80]
+
+
+def test_last_job_before_the_next_section_is_listed_once():
+    text = "Experience\nData Analyst at Acme 2021 - 2023\n- Built dashboards\nEducation\nBSc Maths"
+    experience = EnhancedResumeParser().extract_experience(text)
+    assert [job["title"] for job in experience] == ["Data Analyst at Acme 2021 - 2023"]
+
+
+def test_pdf_pages_in_parallel_and_streamed(monkeypatch):
+    from backend import enhanced_resume_parser
+    from backend.benchmarks.document_extraction_benchmark import legacy_extract_text_from_pdf
+    from backend.benchmarks.synthetic_resumes import render_pdf, synthetic_resumes
+
+    monkeypatch.setattr(enhanced_resume_parser, "PARALLEL_PDF_MIN_PAGES", 2)
+    monkeypatch.setattr(enhanced_resume_parser, "PDF_PAGES_PER_CHUNK", 2)
+    resume = "\n".join(synthetic_resumes(3))
+    data = render_pdf(resume, lines_per_page=20)
+    parser = EnhancedResumeParser()
+
+    text = legacy_extract_text_from_pdf(data)
+    assert parser.extract_text_from_pdf(data) == text
+    assert parser.extract_text_from_pdf(data, processes=2) == text
+
+    *previews, final = parser.parse_resume_stream(data, "pdf")
+    assert [preview["pages"] for preview in previews] == list(range(1, (len(resume.split("\n")) + 19) // 20 + 1))
+    assert previews[0]["contact_info"]["email"] == final["contact_info"]["email"]
+    assert previews[-1]["skills"].keys() == final["skills"].keys()
+    assert final == parser.parse_resume(data, "pdf")
+
+
+def test_docx_text_is_streamed_from_every_part():
+    import io
+    import zipfile
+    from backend.benchmarks.document_extraction_benchmark import legacy_extract_text_from_docx
+    from backend.benchmarks.synthetic_resumes import render_docx
+
+    parser = EnhancedResumeParser()
+    for text in regression_corpus(resumes=5):
+        data = render_docx(text)
+        assert parser.extract_text_from_docx(data) == legacy_extract_text_from_docx(data), text[:80]
+
+    # Contact lines in the page header and everything else in a table
+    text = "Jane Doe\njane@example.com\ngithub.com/jane\nEXPERIENCE\nEngineer at Monzo"
+    assert parser.extract_text_from_docx(render_docx(text, header_lines=3, table_columns=2)) == text + "\n"
+
+    w = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    mc = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+    box = '<w:txbxContent><w:p><w:r><w:t>{}</w:t></w:r></w:p></w:txbxContent>'
+    parts = {
+        "word/footer1.xml": f'<w:ftr {w}><w:p><w:r><w:t>Page footer</w:t></w:r></w:p></w:ftr>',
+        "word/document.xml": (
+            f'<w:document {w} {mc}><w:body>'
+            '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+            '<w:r><w:t>Python</w:t><w:tab/><w:t>SQL</w:t><w:br/><w:t>AWS</w:t></w:r>'
+            '<w:del><w:r><w:delText>removed</w:delText></w:r></w:del></w:p>'
+            '<w:p><w:r><mc:AlternateContent>'
+            f'<mc:Choice>{box.format("Docker")}</mc:Choice><mc:Fallback>{box.format("Docker")}</mc:Fallback>'
+            '</mc:AlternateContent><w:t>Anchor</w:t></w:r></w:p>'
+            '</w:body></w:document>'
+        ),
+        "word/header1.xml": f'<w:hdr {w}><w:p><w:r><w:t xml:space="preserve">Jane Doe </w:t></w:r></w:p></w:hdr>',
+    }
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as package:
+        for name, xml in parts.items():
+            package.writestr(name, xml)
+    assert parser.extract_text_from_docx(buffer.getvalue()) == "Jane Doe \nPython\tSQL\nAWS\nDocker\nAnchor\nPage footer\n"
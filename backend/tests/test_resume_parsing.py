@@ -0,0 +1,112 @@
+"""
+Tests for the resume parser process pool and its document limits
+"""
+import pytest
+
+from backend.benchmarks.synthetic_resumes import render_docx, render_pdf, synthetic_resumes
+from backend.enhanced_resume_parser import EnhancedResumeParser
+from backend.resume_parsing import DocumentTooLarge, ParseTimeout, ResumeParserPool, parse_document
+
+
+def test_documents_over_the_limits_are_rejected(tmp_path):
+    text = next(synthetic_resumes(1))
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(render_pdf(text, lines_per_page=10))
+    parser = EnhancedResumeParser()
+
+    with pytest.raises(DocumentTooLarge, match="pages"):
+        parse_document(parser, str(path), "pdf", max_pages=2)
+    with pytest.raises(DocumentTooLarge, match="characters"):
+        parse_document(parser, str(path), "pdf", max_chars=100)
+    assert parse_document(parser, str(path), "pdf")["contact_info"]["email"]
+
+
+def test_in_memory_documents_parse_like_files(tmp_path):
+    parser = EnhancedResumeParser()
+    for file_type, render in (("pdf", render_pdf), ("docx", render_docx)):
+        content = render(next(synthetic_resumes(1)))
+        path = tmp_path / f"resume.{file_type}"
+        path.write_bytes(content)
+
+        from_file = parser.parse_resume(str(path), file_type)
+        assert parser.parse_resume(content, file_type) == from_file
+        assert parser.parse_resume(memoryview(content), file_type) == from_file
+
+
+def test_runaway_parse_is_killed_and_the_worker_replaced():
+    # Long enough that no parse can finish within the timeout
+    content = render_docx("\n".join(synthetic_resumes(40)))
+    pool = ResumeParserPool(workers=1, max_queue=1, timeout=0.001)
+    try:
+        with pytest.raises(ParseTimeout):
+            pool.parse(content, "docx")
+        pool.timeout = 30
+        assert pool.parse(content, "docx")["skills"]
+
+        status = pool.status()
+        assert (status["timeouts"], status["worker_restarts"], status["completed"]) == (1, 1, 1)
+        assert status["queue_depth"] == 0 and status["busy"] == 0
+    finally:
+        pool.close()
+
+
+def test_requests_beyond_the_queue_are_turned_away_at_once():
+    import asyncio
+    from backend.resume_parsing import ParserBusy
+
+    content = render_docx(next(synthetic_resumes(1)))
+    pool = ResumeParserPool(workers=1, max_queue=1)
+
+    async def oversubscribe():
+        return await asyncio.gather(*(pool.parse_async(content, "docx") for _ in range(6)), return_exceptions=True)
+
+    try:
+        results = asyncio.run(oversubscribe())
+        status = pool.status()
+    finally:
+        pool.close()
+
+    assert sum(isinstance(result, ParserBusy) for result in results) == 4
+    assert sum(isinstance(result, dict) for result in results) == 2
+    assert status["rejected"] == 4 and status["completed"] == 2
+    assert status["queue_depth"] == 0 and status["busy"] == 0
+
+
+def test_page_previews_arrive_before_the_document_is_parsed():
+    parser = EnhancedResumeParser()
+    texts = ["jane@example.com\nPython and SQL", "Docker and AWS", "Experience\nData Analyst at Acme 2021 - 2023"]
+    read = []
+
+    def pages():
+        for page in texts:
+            read.append(page)
+            yield page
+
+    previews = parser.parse_pages(pages())
+    first = next(previews)
+    assert (first["pages"], len(read)) == (1, 1)
+    assert first["contact_info"]["email"] == "jane@example.com"
+
+    content = render_pdf("\n".join(synthetic_resumes(2)), lines_per_page=20)
+    pool = ResumeParserPool(workers=1, max_queue=1)
+    try:
+        stream = pool.parse_stream(content, "pdf")
+        first = next(stream)
+        # The worker is still on the document while its first page is reported
+        assert first["partial"] and first["pages"] == 1
+        assert pool.status()["busy"] == 1
+        *previews, final = list(stream)
+        assert [preview["pages"] for preview in previews] == list(range(2, len(previews) + 2))
+        assert final == pool.parse(content, "pdf")
+    finally:
+        pool.close()
+
+    # Limits hold before anything is reported
+    for limits, match in (({"max_pages": 2}, "pages"), ({"max_chars": 100}, "characters")):
+        limited = ResumeParserPool(workers=1, max_queue=1, **limits)
+        try:
+            with pytest.raises(DocumentTooLarge, match=match):
+                next(limited.parse_stream(content, "pdf"))
+            assert limited.status()["worker_restarts"] == 0
+        finally:
+            limited.close()
@@ -0,0 +1,21 @@
+"""
+Smoke test for the /api/jobs/search benchmark runner
+"""
+import argparse
+import asyncio
+
+from backend.benchmarks.search_benchmark import FILTERS, PAGE_DEPTHS, QUERIES, run_benchmark
+
+
+def test_every_case_runs_against_the_app_without_the_scheduler():
+    args = argparse.Namespace(jobs=200, reload=True, backends=["ilike"], requests=2, concurrency=2, show_plans=True)
+    results = asyncio.run(run_benchmark(args))
+
+    assert len(results) == len(FILTERS) * len(QUERIES) * len(PAGE_DEPTHS)
+    unfiltered = next(r for r in results if (r["filters"], r["query"], r["skip"]) == ("none", "no_query", 0))
+    assert 0 < unfiltered["matched"] <= 200
+    assert all(r["matched"] <= unfiltered["matched"] for r in results)
+    assert all(r["plan"] and r["p99_ms"] >= r["p50_ms"] for r in results)
+
+    from backend.main import scheduler
+    assert not scheduler.running
@@ -0,0 +1,57 @@
+"""
+Tests for the upload size limits
+"""
+import asyncio
+
+import httpx
+from fastapi import FastAPI, File, UploadFile
+
+from backend.upload_limits import UploadSizeLimitMiddleware, read_upload
+
+LIMIT = 100 * 1024
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, limits={"/upload": LIMIT})
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await read_upload(file, LIMIT))}
+
+    @app.post("/other")
+    async def other(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return app
+
+
+def post(app, path, **kwargs):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, **kwargs)
+    return asyncio.run(send())
+
+
+def post_file(app, path, content):
+    return post(app, path, files={"file": ("resume.pdf", content)})
+
+
+def test_uploads_over_the_limit_are_rejected_while_streaming():
+    app = make_app()
+    assert post_file(app, "/upload", b"x" * 1000).json() == {"size": 1000}
+    assert post_file(app, "/upload", b"x" * (LIMIT + 1)).status_code == 413
+    # Routes without a limit are left alone
+    assert post_file(app, "/other", b"x" * (LIMIT + 1)).json() == {"size": LIMIT + 1}
+
+    # Without a Content-Length the body is counted as it arrives
+    async def chunked_body():
+        yield b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"r.pdf\"\r\n\r\n"
+        for _ in range(LIMIT // 1024 + 1):
+            yield b"x" * 1024
+        yield b"\r\n--b--\r\n"
+
+    response = post(app, "/upload", content=chunked_body(),
+                    headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
@@ -0,0 +1,67 @@
+"""
+Size limits for uploaded files, enforced while the request streams in.
+
+UploadSizeLimitMiddleware sits in front of the routes that take uploads.
+It turns away a request whose Content-Length is already over the limit
+before reading any of it, and counts body bytes as they arrive for
+requests without one (chunked uploads), failing with 413 as soon as the
+count passes the limit instead of after the whole body has been spooled.
+read_upload() applies the same limit when an endpoint reads the spooled
+file into memory.
+"""
+from typing import Dict
+from fastapi import HTTPException, UploadFile
+from starlette.responses import JSONResponse
+
+READ_CHUNK_BYTES = 64 * 1024
+
+
+def too_large(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File is too large; the limit is {limit // 1024} KB")
+
+
+class UploadSizeLimitMiddleware:
+    """Pure ASGI middleware: request body limits in bytes per path"""
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": too_large(limit).detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside the form parser; the exception handlers turn it into the response
+                    raise too_large(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def read_upload(file: UploadFile, limit: int) -> bytes:
+    """Contents of an upload, read in chunks and given up on as soon as it passes `limit` bytes"""
+    buffer = bytearray()
+    while True:
+        chunk = await file.read(READ_CHUNK_BYTES)
+        if not chunk:
+            return bytes(buffer)
+        buffer += chunk
+        if len(buffer) > limit:
+            raise too_large(limit)
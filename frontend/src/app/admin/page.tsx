@@ -38,12 +38,27 @@ export default function AdminPage() {
         method: 'POST'
       })
 
+      if (response.status === 409) {
+        throw new Error('A job population run is already in progress')
+      }
       if (!response.ok) {
         throw new Error(`Failed: ${response.status}`)
       }
 
-      const data = await response.json()
-      setResult(data)
+      // The run continues in the background; poll its progress until it finishes
+      const { status_url } = await response.json()
+      while (true) {
+        const progress = await (await fetch(`${API_URL}${status_url}`)).json()
+        setResult(progress)
+        if (progress.status === 'failed') {
+          throw new Error(progress.error || 'Job population failed')
+        }
+        if (progress.status !== 'running') {
+          setResult(progress.report)
+          break
+        }
+        await new Promise((resolve) => setTimeout(resolve, 1000))
+      }
     } catch (err: any) {
       setError(err.message)
     } finally {